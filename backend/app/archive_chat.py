@@ -0,0 +1,30 @@
+import argparse
+from app.config import get_settings
+from app.database import SessionLocal
+from app.services.chat_archive_service import ChatArchiveService, retention_cutoff
+
+settings = get_settings()
+
+def archive_chat(retention_days: int = settings.CHAT_RETENTION_DAYS, user_id: int = None):
+    """
+    Move chat messages older than retention_days into compressed archive blobs
+    Safe to run from cron while the app is serving - each blob is its own commit
+    """
+    db = SessionLocal()
+    try:
+        archived = ChatArchiveService.archive(db, retention_cutoff(retention_days), user_id=user_id)
+    finally:
+        db.close()
+
+    for uid, count in sorted(archived.items()):
+        print(f"user {uid}: archived {count} message(s)")
+    print(f"----- Archived {sum(archived.values())} chat message(s) older than {retention_days} days -----")
+    return archived
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive old chat messages into compressed per-user blobs")
+    parser.add_argument("--days", type=int, default=settings.CHAT_RETENTION_DAYS, help="Keep this many days in chat_messages")
+    parser.add_argument("--user-id", type=int, default=None, help="Only archive one user")
+    args = parser.parse_args()
+
+    archive_chat(args.days, args.user_id)
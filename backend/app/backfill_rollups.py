@@ -0,0 +1,23 @@
+import argparse
+from app.database import SessionLocal
+from app.services.rollup_service import RollupService
+
+def backfill_rollups(user_id: int = None):
+    """
+    Build the month/quarter/year rollups from existing transactions
+    Safe to re-run - the rollups of the selected users are rewritten from scratch
+    """
+    db = SessionLocal()
+    try:
+        written = RollupService.backfill(db, user_id=user_id)
+    finally:
+        db.close()
+    print(f"----- Backfilled {written} rollup row(s) -----")
+    return written
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the analytics rollups from the transactions table")
+    parser.add_argument("--user-id", type=int, default=None, help="Only rebuild one user")
+    args = parser.parse_args()
+
+    backfill_rollups(args.user_id)
@@ -1,15 +1,81 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 
 class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    # "sync" runs routes on the threadpool with SessionLocal, "async" uses AsyncSession routes
+    DB_MODE: str = "sync"
+    # Async driver URL, derived from DATABASE_URL when not set (pymysql -> aiomysql, sqlite -> aiosqlite)
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # Optional read replica for read-only routes; writes always go to DATABASE_URL
+    READ_REPLICA_URL: Optional[str] = None
+    # Connection pool, per engine (in-memory SQLite excepted, its one connection is the database)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+    # Log every SQL statement (development only - it is slow)
+    SQL_ECHO: bool = False
+
+    # Instrumentation - per-route latency and SQL counts at GET /metrics
+    METRICS_ENABLED: bool = True
+    # Statements slower than this are logged with their route; 0 turns the log off
+    SLOW_QUERY_MS: float = 200
     
     # Security
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+
+    # Password hashing - bcrypt cost and the bounded pool it runs on
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_SIZE: int = 16
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+
+    # Memory cap of the chatbot reply cache
+    CHAT_RESPONSE_CACHE_MAX_BYTES: int = 16 * 1024 * 1024
+    # Users' data versions kept in memory for reply cache lookups - writes made
+    # by another process are seen once the entry expires
+    DATA_VERSION_CACHE_SIZE: int = 10000
+    DATA_VERSION_TTL_SECONDS: int = 30
+
+    # Write-behind chat log - replies return before their chat_messages row is committed
+    CHAT_WRITE_BEHIND: bool = False
+    CHAT_WRITE_BEHIND_QUEUE_SIZE: int = 10000
+    CHAT_WRITE_BEHIND_BATCH_SIZE: int = 500
+    CHAT_WRITE_BEHIND_FLUSH_SECONDS: float = 0.5
+
+    # Chat retention - messages older than this move into compressed archive blobs
+    CHAT_RETENTION_DAYS: int = 90
+    CHAT_ARCHIVE_BATCH_SIZE: int = 1000
+    # How often the in-process archiver runs; 0 leaves it to app/archive_chat.py (cron)
+    CHAT_ARCHIVE_INTERVAL_MINUTES: int = 0
+    # Upper bound on the history endpoints' limit
+    CHAT_HISTORY_MAX_LIMIT: int = 100
+
+    # WebSocket chat (/chat/ws)
+    CHAT_WS_MAX_CONNECTIONS_PER_USER: int = 5
+    CHAT_WS_IDLE_TIMEOUT_SECONDS: float = 300
+    # Messages read ahead of the one being answered - past this the socket isn't read
+    CHAT_WS_MAX_PENDING: int = 16
+
+    # Auth caches - skip the JWT decode and the users SELECT on repeat requests
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    TOKEN_CACHE_SIZE: int = 10000
+
+    # Bulk import - rows validated, inserted and committed together
+    BULK_INSERT_CHUNK_SIZE: int = 1000
+
+    # Users whose transactions are kept as NumPy columns for /analytics/trends
+    ANALYTICS_CACHE_USERS: int = 256
+
+    # Users with categories of their own whose compiled chat keyword matcher is kept
+    CATEGORY_MATCHER_CACHE_USERS: int = 256
     
     class Config:
         env_file = ".env"
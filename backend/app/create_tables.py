@@ -1,5 +1,7 @@
-from app.database import engine, Base
-from app.models import User, Transaction, ChatMessage  # Import all models here
+from app.database import engine, Base, SessionLocal
+from app.services.category_service import CategoryService
+from app.services.search_service import SearchService
+from app.models import User, Transaction, Category, CategoryAlias, ChatMessage, ChatArchive, UserBalance, UserCategoryBalance, TransactionRollup  # Import all models here
 
 def create_tables():
     """
@@ -7,6 +9,19 @@ def create_tables():
     """
     print("Creating tables...")
     Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist - add any indexes they are missing
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    # Full-text search index - engine-specific DDL that metadata doesn't describe
+    SearchService.create_index(engine)
+    # Default categories and their aliases ("groceries" -> Food) - adds only what's missing
+    db = SessionLocal()
+    try:
+        CategoryService.seed_defaults(db)
+        db.commit()
+    finally:
+        db.close()
     print("----- Tables created successfully! -----")
 
 if __name__ == "__main__":
@@ -1,19 +1,54 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.config import get_settings
 
 settings = get_settings()
 
+def pool_options(url: str) -> dict:
+    """
+    Pool sizing from the settings, for every engine that pools its connections -
+    server databases and SQLite files alike
+    In-memory SQLite keeps its single shared connection, which is the database
+    """
+    parsed = make_url(url)
+    options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+    }
+    if parsed.get_backend_name() == "sqlite":
+        if parsed.database in (None, "", ":memory:") or parsed.query.get("mode") == "memory":
+            return {}
+        if parsed.get_driver_name() == "aiosqlite":
+            # aiosqlite opens a new connection per checkout by default - pool them like pysqlite does
+            options["poolclass"] = AsyncAdaptedQueuePool
+    return options
+
 # Create database engine
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,  # Verify connections before using them
-    echo=True  # Set to False in production (prints all SQL queries)
+    echo=settings.SQL_ECHO,  # Prints all SQL queries - keep off in production
+    **pool_options(settings.DATABASE_URL)
 )
 
+# Read-only traffic goes to the replica when one is configured, with its own pool
+read_engine = engine
+if settings.READ_REPLICA_URL:
+    read_engine = create_engine(
+        settings.READ_REPLICA_URL,
+        pool_pre_ping=True,
+        echo=settings.SQL_ECHO,
+        **pool_options(settings.READ_REPLICA_URL)
+    )
+
 # Session factory - each request gets its own session
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 # Base class for all models
 Base = declarative_base()
@@ -28,4 +63,70 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def get_read_db():
+    """
+    get_db for read-only routes - uses the read replica when one is configured
+    Replicas lag behind, so anything that must see the caller's own writes uses get_db
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def async_database_url(url: str) -> str:
+    """Swap the sync driver in a database URL for its async counterpart"""
+    drivers = {
+        "mysql+pymysql://": "mysql+aiomysql://",
+        "mysql://": "mysql+aiomysql://",
+        "sqlite://": "sqlite+aiosqlite://",
+    }
+    for sync_prefix, async_prefix in drivers.items():
+        if url.startswith(sync_prefix):
+            return async_prefix + url[len(sync_prefix):]
+    return url
+
+# Async engine - only created in async mode so the async drivers stay optional
+async_engine = None
+async_read_engine = None
+AsyncSessionLocal = None
+AsyncReadSessionLocal = None
+
+if settings.DB_MODE == "async":
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    async_url = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+    async_engine = create_async_engine(
+        async_url,
+        pool_pre_ping=True,
+        echo=settings.SQL_ECHO,
+        **pool_options(async_url)
+    )
+    async_read_engine = async_engine
+    if settings.READ_REPLICA_URL:
+        async_read_url = async_database_url(settings.READ_REPLICA_URL)
+        async_read_engine = create_async_engine(
+            async_read_url,
+            pool_pre_ping=True,
+            echo=settings.SQL_ECHO,
+            **pool_options(async_read_url)
+        )
+    # expire_on_commit=False: attributes can't lazy-load once we're back on the event loop
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+
+async def get_async_db():
+    """
+    Async version of get_db, yields an AsyncSession per request
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_read_db():
+    """
+    Async version of get_read_db
+    """
+    async with AsyncReadSessionLocal() as db:
+        yield db
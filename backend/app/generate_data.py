@@ -0,0 +1,254 @@
+"""
+Deterministic bulk generator of synthetic users, transactions and chat history
+Writes straight to the database with batched Core INSERTs, so it can load
+millions of rows in minutes. Scale is users x years x transactions per month;
+the same arguments and --seed always produce the same data.
+Run from the backend folder after create_tables:
+    python -m app.generate_data --users 2000 --years 5 --per-month 84   (~10M transactions)
+"""
+import argparse
+import calendar
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Tuple
+from sqlalchemy import insert, select
+from app.database import engine, SessionLocal
+from app.models.chat import ChatMessage
+from app.models.transaction import Transaction, TransactionType
+from app.models.user import User
+from app.services.balance_service import BalanceService
+from app.services.category_service import CategoryService
+from app.services.chatbot_service import ChatbotService
+from app.services.financial_snapshot import FinancialSnapshot
+from app.services.rollup_service import RollupService
+from app.utils.security import hash_password
+from seed_data import INCOME_CATEGORIES, EXPENSE_CATEGORIES
+
+INCOME_RANGES = {c["category"]: c["amount_range"] for c in INCOME_CATEGORIES}
+EXPENSE_RANGES = {c["category"]: c["amount_range"] for c in EXPENSE_CATEGORIES}
+
+# Relative frequency of the day-to-day expenses (rent is recurring, see below)
+EXPENSE_WEIGHTS = {"Food": 40, "Transport": 20, "Shopping": 12, "Entertainment": 10, "Utilities": 6, "Healthcare": 4}
+# Chance that a non-recurring transaction is side income instead of an expense
+EXTRA_INCOME_RATE = 0.05
+EXTRA_INCOME = ["Freelance", "Investment"]
+YEARLY_RAISE = 0.03
+
+DESCRIPTIONS = {
+    "Food": ["Groceries", "Restaurant", "Coffee", "Takeaway"],
+    "Transport": ["Fuel", "Bus pass", "Taxi", "Parking"],
+    "Shopping": ["Clothes", "Electronics", "Household items"],
+    "Entertainment": ["Movies", "Concert", "Streaming", "Games"],
+    "Utilities": ["Electricity", "Water", "Internet", "Phone"],
+    "Healthcare": ["Pharmacy", "Doctor visit", "Dental"],
+    "Freelance": ["Client project"],
+    "Investment": ["Dividends", "Interest"],
+    "Bonus": ["Year-end bonus"],
+}
+
+CHAT_PROMPTS = [
+    "What's my balance?", "How much did I spend on food?", "How much have I spent?",
+    "Show my income", "Give me savings tips", "How much did I spend on transport?",
+]
+
+def month_starts(years: int) -> List[datetime]:
+    """First day of every month in the last `years` years, oldest first, ending with this month"""
+    today = datetime.now()
+    year, month = today.year, today.month
+    months = []
+    for _ in range(years * 12):
+        months.append(datetime(year, month, 1))
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return months[::-1]
+
+class UserGenerator:
+    """Generates one user's transactions and chat messages month by month"""
+
+    def __init__(self, user_id: int, user_index: int, seed: int, per_month: int, chat_per_month: int):
+        self.user_id = user_id
+        self.per_month = per_month
+        self.chat_per_month = chat_per_month
+        # Seeded by position, not database id, so reruns on another database match
+        self.rng = random.Random(seed * 1_000_003 + user_index)
+        # Fixed per user, so salary and rent recur with the same amount
+        self.salary = round(self.rng.uniform(*INCOME_RANGES["Salary"]), 2)
+        self.rent = round(self.rng.uniform(*EXPENSE_RANGES["Rent"]), 2)
+        self.pay_day = self.rng.randint(1, 28)
+        self.rent_day = self.rng.randint(1, 5)
+        self.totals: Dict[Tuple[TransactionType, str], List] = {}
+
+        extra = max(per_month - 2, 0)
+        weight_sum = sum(EXPENSE_WEIGHTS.values())
+        # Per-transaction amounts are scaled so a month's total in each category
+        # lands in the range seed_data uses for a single entry
+        self.expected = {c: max(extra * w / weight_sum, 1.0) for c, w in EXPENSE_WEIGHTS.items()}
+        self.expense_names = list(EXPENSE_WEIGHTS)
+        self.expense_cum_weights = []
+        running = 0
+        for weight in EXPENSE_WEIGHTS.values():
+            running += weight
+            self.expense_cum_weights.append(running)
+
+    def month(self, start: datetime, year_index: int) -> Tuple[List[Dict], List[Dict]]:
+        """(transactions, chat messages) of one month"""
+        rng = self.rng
+        days = calendar.monthrange(start.year, start.month)[1]
+        today = datetime.now()
+        if (start.year, start.month) == (today.year, today.month):
+            # Nothing dated in the future
+            days = today.day
+        rows = []
+
+        def add(t_type, category, amount, day, description):
+            when = start + timedelta(days=day - 1, seconds=rng.randint(8 * 3600, 22 * 3600))
+            rows.append({
+                "user_id": self.user_id, "amount": amount, "type": t_type, "category": category,
+                "description": description, "date": when
+            })
+            entry = self.totals.setdefault((t_type, category), [0.0, 0])
+            entry[0] += amount
+            entry[1] += 1
+
+        add(TransactionType.INCOME, "Salary", round(self.salary * (1 + YEARLY_RAISE) ** year_index, 2),
+            min(self.pay_day, days), "Monthly salary")
+        add(TransactionType.EXPENSE, "Rent", self.rent, min(self.rent_day, days), "Monthly rent")
+        if start.month == 12 and rng.random() < 0.5:
+            add(TransactionType.INCOME, "Bonus", round(rng.uniform(*INCOME_RANGES["Bonus"]), 2),
+                rng.randint(15, days), "Year-end bonus")
+
+        for _ in range(self.per_month - 2):
+            day = rng.randint(1, days)
+            if rng.random() < EXTRA_INCOME_RATE:
+                category = rng.choice(EXTRA_INCOME)
+                low, high = INCOME_RANGES[category]
+                add(TransactionType.INCOME, category, round(rng.triangular(low, high, low), 2), day,
+                    rng.choice(DESCRIPTIONS[category]))
+            else:
+                category = rng.choices(self.expense_names, cum_weights=self.expense_cum_weights)[0]
+                low, high = EXPENSE_RANGES[category]
+                amount = rng.triangular(low, high, low) / self.expected[category]
+                add(TransactionType.EXPENSE, category, round(max(amount, 1.0), 2), day,
+                    rng.choice(DESCRIPTIONS[category]))
+
+        return rows, self._chat(start, days)
+
+    def _chat(self, start: datetime, days: int) -> List[Dict]:
+        """Questions asked this month, answered from the totals so far by the real handlers"""
+        if not self.chat_per_month:
+            return []
+        snapshot = FinancialSnapshot({key: (total, count) for key, (total, count) in self.totals.items()})
+        messages = []
+        for _ in range(self.chat_per_month):
+            prompt = self.rng.choice(CHAT_PROMPTS)
+            if "balance" in prompt:
+                intent, response = ChatbotService._handle_balance(snapshot)
+            elif "food" in prompt or "transport" in prompt:
+                intent, response = ChatbotService._handle_category_spending(snapshot, prompt.split()[-1].rstrip("?"))
+            elif "spent" in prompt:
+                intent, response = ChatbotService._handle_total_spending(snapshot)
+            elif "income" in prompt:
+                intent, response = ChatbotService._handle_income(snapshot)
+            else:
+                intent, response = ChatbotService._handle_savings_advice(snapshot)
+            messages.append({
+                "user_id": self.user_id, "user_message": prompt, "bot_response": response, "intent": intent,
+                "created_at": start + timedelta(days=days - 1, seconds=self.rng.randint(0, 86399))
+            })
+        return messages
+
+def create_users(count: int, email_domain: str, password: str, batch_size: int) -> List[int]:
+    """Insert the synthetic users (one shared bcrypt hash) and return their ids"""
+    hashed = hash_password(password)
+    ids = []
+    with engine.connect() as conn:
+        for offset in range(0, count, batch_size):
+            emails = [f"user{i}@{email_domain}" for i in range(offset, min(offset + batch_size, count))]
+            conn.execute(insert(User.__table__), [
+                {"email": email, "hashed_password": hashed, "full_name": f"Synthetic User {email.split('@')[0][4:]}",
+                 "is_active": True}
+                for email in emails
+            ])
+            ids.extend(conn.execute(select(User.id).where(User.email.in_(emails)).order_by(User.id)).scalars())
+            conn.commit()
+    return ids
+
+def generate_rows(user_ids: List[int], years: int, per_month: int, chat_per_month: int,
+                  seed: int) -> Iterator[Tuple[List[Dict], List[Dict]]]:
+    """(transactions, chat messages) per user-month - one user is held in memory at a time"""
+    months = month_starts(years)
+    for user_index, user_id in enumerate(user_ids):
+        user = UserGenerator(user_id, user_index, seed, per_month, chat_per_month)
+        for month_index, start in enumerate(months):
+            yield user.month(start, month_index // 12)
+
+def generate(users: int, years: int, per_month: int, chat_per_month: int, seed: int = 42,
+             email_domain: str = "synthetic.example.com", password: str = "password123",
+             batch_size: int = 20000) -> Dict[str, int]:
+    """
+    Generate and load the dataset, then rebuild the balance aggregates and rollups
+    Memory stays bounded by batch_size regardless of scale
+    """
+    started = time.perf_counter()
+    user_ids = create_users(users, email_domain, password, batch_size)
+    db = SessionLocal()
+    try:
+        # Curated, so every synthetic user shares them
+        category_ids = {name: CategoryService.get_or_create(db, name, None) for name in {**INCOME_RANGES, **EXPENSE_RANGES}}
+        db.commit()
+    finally:
+        db.close()
+
+    counts = {"users": len(user_ids), "transactions": 0, "chat_messages": 0}
+    transaction_batch, chat_batch = [], []
+    with engine.connect() as conn:
+        def flush():
+            if transaction_batch:
+                conn.execute(insert(Transaction.__table__), transaction_batch)
+                counts["transactions"] += len(transaction_batch)
+                transaction_batch.clear()
+            if chat_batch:
+                conn.execute(insert(ChatMessage.__table__), chat_batch)
+                counts["chat_messages"] += len(chat_batch)
+                chat_batch.clear()
+            conn.commit()
+
+        for transactions, messages in generate_rows(user_ids, years, per_month, chat_per_month, seed):
+            for row in transactions:
+                row["category_id"] = category_ids[row["category"]]
+            transaction_batch.extend(transactions)
+            chat_batch.extend(messages)
+            if len(transaction_batch) >= batch_size:
+                flush()
+                print(f"  {counts['transactions']:,} transactions ({time.perf_counter() - started:.0f}s)", end="\r")
+        flush()
+    print()
+
+    db = SessionLocal()
+    try:
+        # Per user, so memory stays bounded here too
+        for user_id in user_ids:
+            BalanceService.rebuild(db, user_id=user_id)
+            RollupService.backfill(db, user_id=user_id)
+    finally:
+        db.close()
+
+    counts["seconds"] = round(time.perf_counter() - started)
+    return counts
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load a deterministic synthetic dataset straight into the database")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--years", type=int, default=2)
+    parser.add_argument("--per-month", type=int, default=30, help="Transactions per user per month, incl. salary and rent")
+    parser.add_argument("--chat-per-month", type=int, default=4, help="Chat messages per user per month")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--email-domain", default="synthetic.example.com", help="Users are user<N>@<domain>")
+    parser.add_argument("--password", default="password123", help="Password of every generated user")
+    parser.add_argument("--batch-size", type=int, default=20000, help="Rows per INSERT batch")
+    args = parser.parse_args()
+
+    counts = generate(args.users, args.years, args.per_month, args.chat_per_month, args.seed,
+                      args.email_domain, args.password, args.batch_size)
+    print(f"----- Generated {counts['users']:,} users, {counts['transactions']:,} transactions and "
+          f"{counts['chat_messages']:,} chat messages in {counts['seconds']}s -----")
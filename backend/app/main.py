@@ -1,7 +1,14 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, APIRouter
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import get_settings
-from app.routes import auth, transactions, chat
+from app.database import engine, read_engine, async_engine, async_read_engine
+from app.routes import auth, transactions, chat, analytics
+from app.utils.auth_cache import auth_cache_stats
+from app.services.response_cache import chat_response_cache
+from app.services.chat_log_writer import chat_log_writer
+from app.services.chat_archive_service import chat_archiver
+from app.services.chat_channel import chat_connections
 
 settings = get_settings()
 
@@ -18,12 +25,70 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+def _with_async_overrides(sync_router: APIRouter, async_router: APIRouter) -> APIRouter:
+    """
+    Replace each sync route with its async twin (same path and methods)
+    Keeps the sync router's route order, and endpoints that have no async
+    version yet keep working as sync routes
+    """
+    def route_key(route):
+        return (route.path, frozenset(getattr(route, "methods", None) or ()))
+
+    overrides = {route_key(route): route for route in async_router.routes}
+    merged = APIRouter()
+    merged.routes.extend(overrides.get(route_key(route), route) for route in sync_router.routes)
+    return merged
+
+# Instrumentation - nothing is hooked in when it is disabled, so it costs nothing
+if settings.METRICS_ENABLED:
+    from app.utils import metrics
+
+    app.add_middleware(metrics.MetricsMiddleware)
+    metrics.instrument_engine(engine, settings.SLOW_QUERY_MS)
+    if read_engine is not engine:
+        metrics.instrument_engine(read_engine, settings.SLOW_QUERY_MS)
+    if async_engine is not None:
+        metrics.instrument_engine(async_engine.sync_engine, settings.SLOW_QUERY_MS)
+    if async_read_engine is not async_engine:
+        metrics.instrument_engine(async_read_engine.sync_engine, settings.SLOW_QUERY_MS)
+    metrics.stats_collector("auth_cache", "Auth cache statistics", auth_cache_stats)
+    metrics.stats_collector("chat_cache", "Chatbot reply cache statistics", chat_response_cache.stats)
+    metrics.stats_collector("chat_log_writer", "Write-behind chat log statistics", chat_log_writer.stats)
+    metrics.stats_collector("chat_ws_connections", "WebSocket chat connections", chat_connections.stats)
+
+    @app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+    def get_metrics():
+        return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
 # Include routers
-app.include_router(auth.router)
-app.include_router(transactions.router)
-app.include_router(chat.router)
+if settings.DB_MODE == "async":
+    from app.routes import async_auth, async_transactions, async_chat
+
+    app.include_router(_with_async_overrides(auth.router, async_auth.router))
+    app.include_router(_with_async_overrides(transactions.router, async_transactions.router))
+    app.include_router(_with_async_overrides(chat.router, async_chat.router))
+else:
+    app.include_router(auth.router)
+    app.include_router(transactions.router)
+    app.include_router(chat.router)
+
+app.include_router(analytics.router)
+
+@app.on_event("startup")
+def start_background_workers():
+    if settings.CHAT_WRITE_BEHIND:
+        chat_log_writer.start()
+    # No-op unless CHAT_ARCHIVE_INTERVAL_MINUTES is set
+    chat_archiver.start()
+
+@app.on_event("shutdown")
+def stop_background_workers():
+    # Commit every chat message still queued before the process exits
+    chat_log_writer.stop()
+    chat_archiver.stop()
 
 @app.get("/")
 def root():
@@ -37,7 +102,11 @@ def root():
 def health_check():
     return {
         "status": "healthy",
-        "database": "connected"
+        "database": "connected",
+        "auth_cache": auth_cache_stats(),
+        "chat_cache": chat_response_cache.stats(),
+        "chat_log_writer": chat_log_writer.stats(),
+        "chat_ws_connections": chat_connections.stats()
     }
 
 
@@ -0,0 +1,138 @@
+import argparse
+from sqlalchemy import and_, case, inspect, func, select, update, text
+from app.database import engine, Base, SessionLocal
+from app.models import (  # noqa: F401 - registers the tables
+    Transaction, Category, CategoryAlias, UserCategoryBalance, TransactionRollup
+)
+from app.services.balance_service import BalanceService
+from app.services.category_service import CategoryService
+from app.services.rollup_service import RollupService
+
+def add_category_column():
+    """
+    Add transactions.category_id to a database created before the categories table
+    create_all never alters existing tables, so the column is added by hand
+    """
+    Base.metadata.create_all(bind=engine, tables=[Category.__table__, CategoryAlias.__table__])
+    columns = {column["name"] for column in inspect(engine).get_columns("transactions")}
+    if "category_id" not in columns:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE transactions ADD COLUMN category_id INTEGER REFERENCES categories(id)"))
+    for index in Transaction.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+def scope_categories() -> bool:
+    """
+    Re-create categories and category_aliases made before categories had owners
+    There every name any user typed was a category shared by everyone; the
+    transactions' category_id is cleared so the backfill resolves each name
+    again for its own user, and the aggregates keyed on the old ids are
+    dropped to be rebuilt. Returns whether it ran
+    """
+    inspector = inspect(engine)
+    if not inspector.has_table(Category.__tablename__) or "user_id" in {
+        column["name"] for column in inspector.get_columns(Category.__tablename__)
+    }:
+        return False
+
+    with engine.begin() as conn:
+        conn.execute(update(Transaction).values(category_id=None))
+        if conn.dialect.name == "mysql":
+            # Lets categories be dropped under transactions' foreign key, which then points at the new table
+            conn.execute(text("SET FOREIGN_KEY_CHECKS = 0"))
+        for model in (UserCategoryBalance, TransactionRollup, CategoryAlias, Category):
+            model.__table__.drop(bind=conn, checkfirst=True)
+        Base.metadata.create_all(bind=conn, tables=[Category.__table__, CategoryAlias.__table__])
+        if conn.dialect.name == "mysql":
+            conn.execute(text("SET FOREIGN_KEY_CHECKS = 1"))
+    print("----- Re-created categories with owners -----")
+    return True
+
+def migrate_categories(batch_size: int = 50000):
+    """
+    Point every transaction at its category
+    Creates the default (curated) categories, then fills category_id in id
+    ranges of batch_size rows, one commit per range, so it can run while the
+    app is serving: each user's names resolve to a curated category or to one
+    of that user's own, created as needed (names that differ only in case
+    share one). Safe to re-run - only rows without an id are touched
+    Then re-keys the balance and rollup aggregates on category_id, once, on
+    databases made before they were - run that before starting this version
+    """
+    scope_categories()
+    add_category_column()
+    db = SessionLocal()
+    try:
+        CategoryService.seed_defaults(db)
+        db.commit()
+
+        low, high = db.execute(
+            select(func.min(Transaction.id), func.max(Transaction.id)).where(Transaction.category_id.is_(None))
+        ).one()
+        updated = 0
+        while low is not None and low <= high:
+            in_range = and_(
+                Transaction.id >= low,
+                Transaction.id < low + batch_size,
+                Transaction.category_id.is_(None)
+            )
+            # Only the (user, name) pairs present in the range, so the statement stays bounded
+            category_ids = {}
+            for user_id, name in db.execute(select(Transaction.user_id, Transaction.category).where(in_range).distinct()):
+                category_ids.setdefault(user_id, {})[name] = CategoryService.get_or_create(db, name, user_id)
+            # One UPDATE per range, mapping every user's names to their ids with a CASE per user
+            if category_ids:
+                updated += db.execute(
+                    update(Transaction).where(in_range).values(category_id=case(
+                        {user_id: case(names, value=Transaction.category) for user_id, names in category_ids.items()},
+                        value=Transaction.user_id
+                    ))
+                ).rowcount
+            db.commit()
+            low += batch_size
+            print(f"  {updated:,} transaction(s) updated", end="\r")
+        print()
+    finally:
+        db.close()
+    print(f"----- Backfilled category_id on {updated:,} transaction(s) -----")
+    rekey_aggregates()
+    return updated
+
+def rekey_aggregates():
+    """
+    Move user_category_balances and transaction_rollups onto category_id
+    Tables made before they were keyed on it hold the category text instead:
+    they are dropped, recreated and rebuilt from the transactions, which
+    needs category_id backfilled first. Missing ones (see scope_categories)
+    are created and rebuilt the same way
+    """
+    inspector = inspect(engine)
+    stale = [
+        model.__table__ for model in (UserCategoryBalance, TransactionRollup)
+        if not inspector.has_table(model.__tablename__)
+        or "category_id" not in {column["name"] for column in inspector.get_columns(model.__tablename__)}
+    ]
+    for table in stale:
+        table.drop(bind=engine, checkfirst=True)
+    Base.metadata.create_all(bind=engine, tables=[UserCategoryBalance.__table__, TransactionRollup.__table__])
+    if not stale:
+        return
+
+    db = SessionLocal()
+    try:
+        if UserCategoryBalance.__table__ in stale:
+            BalanceService.rebuild(db)
+        if TransactionRollup.__table__ in stale:
+            RollupService.backfill(db)
+    finally:
+        db.close()
+    print(f"----- Rebuilt {', '.join(table.name for table in stale)} by category id -----")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Create the categories table, backfill transactions.category_id and re-key the aggregates on it"
+    )
+    parser.add_argument("--batch-size", type=int, default=50000, help="Transaction ids per commit")
+    args = parser.parse_args()
+
+    migrate_categories(args.batch_size)
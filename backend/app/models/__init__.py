@@ -0,0 +1,6 @@
+from app.models.user import User
+from app.models.transaction import Transaction, TransactionType
+from app.models.category import Category, CategoryAlias
+from app.models.chat import ChatMessage, ChatArchive
+from app.models.balance import UserBalance, UserCategoryBalance
+from app.models.rollup import TransactionRollup, RollupPeriod
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, Float, DateTime, Enum, ForeignKey, Index, text
+from sqlalchemy.sql import func
+from app.database import Base
+from app.models.transaction import TransactionType
+
+class UserBalance(Base):
+    """
+    Running totals of a user's transactions
+    Kept up to date by TransactionService so summaries never scan the transactions table
+    """
+    __tablename__ = "user_balances"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    total_income = Column(Float, nullable=False, default=0.0)
+    total_expenses = Column(Float, nullable=False, default=0.0)
+    transaction_count = Column(Integer, nullable=False, default=0)
+    # Bumped on every write to the user's transactions - cached chatbot replies are keyed on it
+    data_version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class UserCategoryBalance(Base):
+    """
+    Running total and count of a user's transactions per (type, category)
+    Keyed on the category id, so every spelling of a category adds to one row
+    """
+    __tablename__ = "user_category_balances"
+    __table_args__ = (
+        # Chat snapshots: a user's non-empty rows read off the index alone. Partial
+        # on SQLite, so emptied categories cost nothing; a full covering index elsewhere
+        Index("ix_user_category_balances_user_nonempty", "user_id", "type", "category_id", "total", "count",
+              sqlite_where=text("count > 0")),
+    )
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    type = Column(Enum(TransactionType), primary_key=True)
+    category_id = Column(Integer, ForeignKey("categories.id"), primary_key=True)
+    total = Column(Float, nullable=False, default=0.0)
+    count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,46 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.database import Base
+
+class Category(Base):
+    """
+    Transaction category - transactions point at it through category_id
+    Curated categories (user_id NULL, e.g. the defaults) are shared by everyone;
+    any other name a user types becomes a category of that user's own
+    """
+    __tablename__ = "categories"
+    __table_args__ = (
+        UniqueConstraint("user_id", "name", name="uq_categories_user_name"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    # Owner of a user's own category, NULL for a curated one
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
+    # Display name, e.g. "Food"
+    name = Column(String(100), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    aliases = relationship("CategoryAlias", back_populates="category", cascade="all, delete-orphan")
+
+class CategoryAlias(Base):
+    """
+    A spelling that resolves to a category ("food", "groceries", ...)
+    Stored normalized (lowercase, single spaces); the category's own name is one of them
+    Scoped like its category: curated aliases (user_id NULL) mean the same for
+    everyone, a user's own only for them
+    """
+    __tablename__ = "category_aliases"
+    __table_args__ = (
+        # Lookups are by alias, then narrowed to curated or the user's own
+        # NULLs never collide, so this guards users' own aliases; curated ones are
+        # only added by seed_defaults and the scripts, which resolve before adding
+        UniqueConstraint("alias", "user_id", name="uq_category_aliases_alias_user"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    alias = Column(String(100), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    category = relationship("Category", back_populates="aliases")
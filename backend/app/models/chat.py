@@ -0,0 +1,45 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, LargeBinary
+from sqlalchemy.orm import relationship
+from datetime import datetime, timezone
+from sqlalchemy.sql import func
+from app.database import Base
+
+class ChatMessage(Base):
+    """One user message and the bot's reply to it"""
+    __tablename__ = "chat_messages"
+    __table_args__ = (
+        # Chat history: the user's latest messages straight off the index
+        Index("ix_chat_messages_user_created", "user_id", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_message = Column(Text, nullable=False)
+    bot_response = Column(Text, nullable=False)
+    intent = Column(String(50), nullable=True)
+    # Stamped in Python (UTC) like the write-behind rows, not by the database's
+    # clock, so rows from every write path sort together
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc),
+                        server_default=func.now())
+
+    user = relationship("User", back_populates="chat_messages")
+
+class ChatArchive(Base):
+    """
+    A run of a user's old chat messages, moved out of chat_messages by the
+    retention job and stored as one zlib-compressed JSON blob
+    """
+    __tablename__ = "chat_archives"
+    __table_args__ = (
+        # Archived history pages walk a user's blobs newest first
+        Index("ix_chat_archives_user_first_created", "user_id", "first_created_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    first_created_at = Column(DateTime(timezone=True), nullable=False)
+    last_created_at = Column(DateTime(timezone=True), nullable=False)
+    message_count = Column(Integer, nullable=False)
+    # MEDIUMBLOB on MySQL - a plain BLOB caps out at 64 KB
+    payload = Column(LargeBinary(length=2 ** 24), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
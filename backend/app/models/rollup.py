@@ -0,0 +1,26 @@
+import enum
+from sqlalchemy import Column, Integer, Float, Date, Enum, ForeignKey
+from app.database import Base
+from app.models.transaction import TransactionType
+
+class RollupPeriod(str, enum.Enum):
+    MONTH = "month"
+    QUARTER = "quarter"
+    YEAR = "year"
+
+class TransactionRollup(Base):
+    """
+    Totals of a user's transactions per (period, category id, type)
+    One row per month, quarter and year the user has data in - analytics
+    read these instead of the transactions table
+    """
+    __tablename__ = "transaction_rollups"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    period = Column(Enum(RollupPeriod), primary_key=True)
+    # First day of the month / quarter / year
+    period_start = Column(Date, primary_key=True)
+    type = Column(Enum(TransactionType), primary_key=True)
+    category_id = Column(Integer, ForeignKey("categories.id"), primary_key=True)
+    total = Column(Float, nullable=False, default=0.0)
+    count = Column(Integer, nullable=False, default=0)
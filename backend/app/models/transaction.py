@@ -0,0 +1,38 @@
+import enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, Enum, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.database import Base
+
+class TransactionType(str, enum.Enum):
+    INCOME = "income"
+    EXPENSE = "expense"
+
+class Transaction(Base):
+    """Single income or expense entry of a user"""
+    __tablename__ = "transactions"
+    __table_args__ = (
+        # Listing pages walk this index backwards: newest first, id breaks ties
+        Index("ix_transactions_user_date_id", "user_id", "date", "id"),
+        # Biggest expense: top of the user's expenses by amount without sorting them all
+        Index("ix_transactions_user_type_amount", "user_id", "type", "amount"),
+        # Chat questions about a period ("last month", "in March") range-scan one type's dates
+        Index("ix_transactions_user_type_date", "user_id", "type", "date"),
+        # Listing filtered by category: same walk as ix_transactions_user_date_id within one category
+        Index("ix_transactions_user_category_date_id", "user_id", "category_id", "date", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    amount = Column(Float, nullable=False)
+    type = Column(Enum(TransactionType), nullable=False)
+    # As the user typed it; category_id is what filters and groups use
+    category = Column(String(100), nullable=False)
+    # Nullable only for rows written before app/migrate_categories.py ran
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
+    description = Column(String(500), nullable=True)
+    date = Column(DateTime, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    user = relationship("User", back_populates="transactions")
@@ -0,0 +1,36 @@
+import argparse
+from app.database import SessionLocal
+from app.services.balance_service import BalanceService
+
+def rebuild_balances(user_id: int = None, verify_only: bool = False):
+    """
+    Recompute the per-user balance aggregates from the transactions table
+    Prints every aggregate row that had drifted from the raw data
+    """
+    db = SessionLocal()
+    try:
+        drift = BalanceService.rebuild(db, user_id=user_id, verify_only=verify_only)
+    finally:
+        db.close()
+
+    for entry in drift:
+        label = f"user {entry['user_id']}"
+        if entry["category"] is not None:
+            label += f" / {entry['type']} / {entry['category']}"
+        print(f"DRIFT {label}: expected {entry['expected']}, stored {entry['actual']}")
+
+    if verify_only:
+        print(f"----- Verified balances: {len(drift)} drifted row(s) -----")
+    else:
+        print(f"----- Rebuilt balances: fixed {len(drift)} drifted row(s) -----")
+    return drift
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild or verify the per-user balance aggregates")
+    parser.add_argument("--verify", action="store_true", help="Only report drift, do not rewrite")
+    parser.add_argument("--user-id", type=int, default=None, help="Only check one user")
+    args = parser.parse_args()
+
+    drift = rebuild_balances(args.user_id, args.verify)
+    if args.verify and drift:
+        raise SystemExit(1)
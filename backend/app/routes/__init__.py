@@ -1 +1 @@
-from app.routes import auth, transactions,chat
\ No newline at end of file
+from app.routes import auth, transactions,chat,analytics
\ No newline at end of file
@@ -0,0 +1,78 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from datetime import date
+from typing import List, Optional
+from app.database import get_read_db
+from app.models.rollup import RollupPeriod
+from app.models.transaction import TransactionType
+from app.models.user import User
+from app.schemas.analytics import PeriodSummary, TrendReport
+from app.services.analytics_engine import analytics_engine, AnalyticsEngine
+from app.services.category_service import CategoryService
+from app.services.rollup_service import RollupService
+from app.utils.dependencies import get_current_user
+
+router = APIRouter(
+    prefix="/analytics",
+    tags=["Analytics"]
+)
+
+@router.get("/trends", response_model=TrendReport)
+def get_trends(
+    months: int = Query(12, ge=1, le=120, description="How many recent months to return"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Rolling 30/90-day spend, category shares and a monthly savings-rate series
+    Computed with NumPy over a cached columnar copy of the user's transactions
+    
+    **Protected route** - requires authentication
+    """
+    cols = analytics_engine.columns(db, current_user.id)
+    return {
+        "rolling_30d_spend": AnalyticsEngine.rolling_spend(cols, 30),
+        "rolling_90d_spend": AnalyticsEngine.rolling_spend(cols, 90),
+        "categories": AnalyticsEngine.category_breakdown(cols),
+        "months": AnalyticsEngine.monthly_series(cols)[-months:],
+    }
+
+@router.get("/{period}", response_model=List[PeriodSummary])
+def get_period_analytics(
+    period: RollupPeriod,
+    start: Optional[date] = Query(None, description="First day to include (its whole period is included)"),
+    end: Optional[date] = Query(None, description="Last day to include"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Monthly, quarterly or yearly income, expenses and savings, oldest first
+    Served from the rollup tables, so cost depends on the number of periods,
+    not the number of transactions
+    
+    **Protected route** - requires authentication
+    """
+    summaries = {}
+    CategoryService.warm(db)
+    for row in RollupService.get_rollups(db, current_user.id, period, start, end):
+        summary = summaries.setdefault(row.period_start, {
+            "period_start": row.period_start,
+            "total_income": 0.0,
+            "total_expenses": 0.0,
+            "transaction_count": 0,
+            "categories": []
+        })
+        if row.type == TransactionType.INCOME:
+            summary["total_income"] += row.total
+        else:
+            summary["total_expenses"] += row.total
+        summary["transaction_count"] += row.count
+        summary["categories"].append({
+            "category": CategoryService.name(db, row.category_id), "type": row.type,
+            "total": row.total, "count": row.count
+        })
+
+    for summary in summaries.values():
+        summary["net_savings"] = summary["total_income"] - summary["total_expenses"]
+        summary["categories"].sort(key=lambda c: c["total"], reverse=True)
+    return list(summaries.values())
@@ -0,0 +1,42 @@
+from fastapi import Depends, status, APIRouter
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app.schemas.user import UserCreate, UserLogin, UserResponse
+from app.services.auth_service import AsyncAuthService
+from app.utils.dependencies import get_current_user_async
+from app.models.user import User
+
+# Async twins of app/routes/auth.py, used when DB_MODE=async
+router = APIRouter(
+    prefix='/auth',
+    tags=["Authentication"]
+)
+
+@router.post('/register', response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+async def register(
+    user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    """Registering a new user needs: email, fullname, password (min 8 characters)"""
+    user = await AsyncAuthService.register_user(db, user_data)
+    return user
+
+@router.post('/login')
+async def login(login_data: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    """Login needs email, password
+    returns jwt tokens for authenticated requests"""
+    result = await AsyncAuthService.login_user(db, login_data)
+    return {
+        "access_token": result["access_token"],
+        "token_type": result["token_type"],
+        "user": UserResponse.from_orm(result["user"])
+    }
+
+@router.get("/me", response_model=UserResponse)
+async def get_my_profile(
+    current_user: User = Depends(get_current_user_async)
+):
+    """
+    Get current authenticated user's profile
+    
+    **Protected route** - requires valid JWT token
+    """
+    return current_user
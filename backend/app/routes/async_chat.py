@@ -0,0 +1,111 @@
+from fastapi import APIRouter, Depends, Query, Header, Response, HTTPException, WebSocket, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.config import get_settings
+from app.database import get_async_db, get_async_read_db, AsyncSessionLocal
+from app.schemas.chat import ChatRequest, ChatBatchRequest, ChatResponse, ChatHistoryResponse
+from app.models.user import User
+from app.services.chatbot_service import AsyncChatbotService, HISTORY_FIELDS, HISTORY_COLUMNS
+from app.services.chat_archive_service import AsyncChatArchiveService
+from app.services.chat_channel import serve_chat
+from app.utils.dependencies import get_current_user_async, websocket_credentials
+from app.utils.pagination import encode_cursor, decode_cursor, NEXT_CURSOR_HEADER
+from app.utils.serializers import rows_response, MSGPACK_RESPONSES
+
+settings = get_settings()
+
+# Async twins of app/routes/chat.py, used when DB_MODE=async
+router = APIRouter(
+    prefix="/chat",
+    tags=["Chatbot"]
+)
+
+@router.post("/", response_model=ChatResponse)
+async def send_message(
+    chat_request: ChatRequest,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Send a message to the chatbot and get a response
+    **Protected route** - requires authentication
+    """
+    response = await AsyncChatbotService.process_message(db, current_user, chat_request.message)
+    return response
+
+@router.post("/batch", response_model=List[ChatResponse])
+async def send_messages(
+    batch: ChatBatchRequest,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Send several messages at once (up to 20) and get the replies in the same order
+    Data the messages share is loaded once and every message is saved in one commit,
+    so e.g. a home screen costs one request instead of one per question
+    **Protected route** - requires authentication
+    """
+    responses = await AsyncChatbotService.process_batch(db, current_user, batch.messages)
+    return responses
+
+@router.websocket("/ws")
+async def chat_socket(websocket: WebSocket):
+    """
+    Chat over one long-lived connection, see app/routes/chat.py
+    """
+    await websocket.accept()
+    async with AsyncSessionLocal() as db:
+        try:
+            user = await get_current_user_async(websocket_credentials(websocket), db)
+        except HTTPException as exc:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=exc.detail)
+            return
+        finally:
+            await db.close()
+
+        async def reply(message: str):
+            try:
+                return await AsyncChatbotService.process_message(db, user, message)
+            finally:
+                await db.close()
+
+        await serve_chat(websocket, user.id, reply)
+
+@router.get("/history", response_model=List[ChatHistoryResponse], responses=MSGPACK_RESPONSES)
+async def get_chat_history(
+    limit: int = Query(20, ge=1, le=settings.CHAT_HISTORY_MAX_LIMIT, description="Latest messages to return"),
+    accept: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get user's chat history
+    Send Accept: application/msgpack for a MessagePack body instead of JSON
+    
+    **Protected route** - requires authentication
+    """
+    rows = await AsyncChatbotService.get_chat_history(db, current_user, limit, HISTORY_COLUMNS)
+    return rows_response(rows, HISTORY_FIELDS, accept)
+
+@router.get("/history/archived", response_model=List[ChatHistoryResponse])
+async def get_archived_chat_history(
+    response: Response,
+    before: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    limit: int = Query(20, ge=1, le=settings.CHAT_HISTORY_MAX_LIMIT, description="Messages per page"),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Get user's archived chat history, newest first
+    Messages older than the retention period live here instead of /chat/history.
+    When another page exists its cursor is returned in the X-Next-Cursor header;
+    pass it back as `before` to continue
+    
+    **Protected route** - requires authentication
+    """
+    messages, next_key = await AsyncChatArchiveService.get_archived_history(
+        db, current_user, before=decode_cursor(before) if before else None, limit=limit
+    )
+    if next_key:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(*next_key)
+    return messages
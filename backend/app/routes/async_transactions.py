@@ -0,0 +1,192 @@
+from fastapi import Depends, status, APIRouter, Query, Request, Header, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date
+from typing import List, Optional
+from app.config import get_settings
+from app.database import get_async_db, get_async_read_db, AsyncReadSessionLocal
+from app.routes.transactions import EXPORT_FORMATS, _bulk_records
+from app.schemas.transaction import (
+    TransactionCreate, TransactionResponse, TransactionSummary, TransactionUpdate, BulkImportResult
+)
+from app.models.transaction import TransactionType
+from app.models.user import User
+from app.services.search_service import AsyncSearchService
+from app.services.transaction_service import AsyncTransactionService, RESPONSE_FIELDS, RESPONSE_COLUMNS
+from app.utils.dependencies import get_current_user_async
+from app.utils.exporters import encode_batches
+from app.utils.pagination import encode_cursor, decode_cursor, NEXT_CURSOR_HEADER
+from app.utils.serializers import rows_response, MSGPACK_RESPONSES
+
+settings = get_settings()
+
+# Async twins of app/routes/transactions.py, used when DB_MODE=async
+router = APIRouter(
+    prefix='/transactions',
+    tags=['Transactions']
+)
+
+@router.post('/', response_model=TransactionResponse, status_code=status.HTTP_201_CREATED)
+async def create_transaction(transaction_data: TransactionCreate,
+                             current_user: User = Depends(get_current_user_async),
+                             db: AsyncSession = Depends(get_async_db)):
+    """Create a new transaction income/expense"""
+    transaction = await AsyncTransactionService.create_transaction(db, transaction_data, current_user)
+    return transaction
+
+@router.post('/bulk', response_model=BulkImportResult)
+async def bulk_create_transactions(request: Request,
+                                   current_user: User = Depends(get_current_user_async),
+                                   db: AsyncSession = Depends(get_async_db)):
+    """
+    Import many transactions in one call
+    Body: a JSON array of transactions, or NDJSON (one transaction per line)
+    with Content-Type application/x-ndjson, which is streamed instead of loaded whole
+    Rows are validated and inserted in chunks; invalid rows are reported, not fatal
+    """
+    result = {"received": 0, "inserted": 0, "failed": 0, "errors": []}
+
+    async def flush(chunk):
+        inserted, errors = await AsyncTransactionService.bulk_create_transactions(db, chunk, current_user)
+        result["inserted"] += inserted
+        result["errors"].extend(errors)
+
+    chunk = []
+    async for index, record in _bulk_records(request):
+        result["received"] += 1
+        chunk.append((index, record))
+        if len(chunk) >= settings.BULK_INSERT_CHUNK_SIZE:
+            await flush(chunk)
+            chunk = []
+    if chunk:
+        await flush(chunk)
+
+    result["failed"] = len(result["errors"])
+    return result
+
+@router.get('/', response_model=List[TransactionResponse], responses=MSGPACK_RESPONSES)
+async def get_transactions(
+    transaction_type: Optional[TransactionType] = Query(None, description="Filter by type (income/expense)"),
+    category: Optional[str] = Query(None, description="Filter by category"),
+    skip: int = Query(0, ge=0, description="Number of records to skip (prefer `after` for deep pages)"),
+    after: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    limit: int = Query(100, ge=1, le=100, description="Max records to return"),
+    accept: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    List transactions, newest first
+    When another page exists its cursor is returned in the X-Next-Cursor header
+    Send Accept: application/msgpack for a MessagePack body instead of JSON
+    """
+    if skip and after:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Use either skip or after, not both")
+
+    if skip:
+        rows = await AsyncTransactionService.get_user_transactions(
+            db, current_user, transaction_type=transaction_type, category=category, skip=skip, limit=limit,
+            columns=RESPONSE_COLUMNS
+        )
+        return rows_response(rows, RESPONSE_FIELDS, accept)
+
+    rows, next_key = await AsyncTransactionService.get_transactions_page(
+        db, current_user, transaction_type=transaction_type, category=category,
+        after=decode_cursor(after) if after else None, limit=limit, columns=RESPONSE_COLUMNS
+    )
+    headers = {NEXT_CURSOR_HEADER: encode_cursor(*next_key)} if next_key else None
+    return rows_response(rows, RESPONSE_FIELDS, accept, headers)
+
+@router.get("/summary", response_model=TransactionSummary)
+async def get_summary(
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Get financial summary for the authenticated user
+    Returns total income, expenses, and net savings
+    """
+    summary = await AsyncTransactionService.get_summary(db, current_user)
+    return summary
+
+@router.get("/search", response_model=List[TransactionResponse], responses=MSGPACK_RESPONSES)
+async def search_transactions(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find in descriptions, the last may be partial"),
+    transaction_type: Optional[TransactionType] = Query(None, description="Filter by type (income/expense)"),
+    category: Optional[str] = Query(None, description="Filter by category"),
+    start: Optional[date] = Query(None, description="First day to include"),
+    end: Optional[date] = Query(None, description="Last day to include"),
+    skip: int = Query(0, ge=0, description="Number of matches to skip"),
+    limit: int = Query(50, ge=1, le=100, description="Max matches to return"),
+    accept: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Find transactions by description, most relevant first
+    Send Accept: application/msgpack for a MessagePack body instead of JSON
+    """
+    rows = await AsyncSearchService.search(
+        db, current_user, q, transaction_type=transaction_type, category=category,
+        start=start, end=end, skip=skip, limit=limit, columns=RESPONSE_COLUMNS
+    )
+    return rows_response(rows, RESPONSE_FIELDS, accept)
+
+@router.get("/export")
+async def export_transactions(
+    format: str = Query("csv", pattern="^(csv|ndjson)$", description="csv or ndjson"),
+    current_user: User = Depends(get_current_user_async)
+):
+    """
+    Download the user's full transaction history as CSV or NDJSON
+    The file is streamed, so memory use doesn't grow with history size
+    """
+    encode, media_type = EXPORT_FORMATS[format]
+
+    async def stream():
+        # The stream outlives the request's session, so it gets its own
+        async with AsyncReadSessionLocal() as db:
+            async for chunk in encode_batches(encode, AsyncTransactionService.export_transactions(db, current_user)):
+                yield chunk
+
+    return StreamingResponse(
+        stream(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="transactions.{format}"'}
+    )
+
+@router.get("/{transaction_id}", response_model=TransactionResponse)
+async def get_transaction(
+    transaction_id: int,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get transaction based of a partcular user based on user_id"""
+    transaction = await AsyncTransactionService.get_transaction_by_id(db, transaction_id, current_user)
+    return transaction
+
+@router.put("/{transaction_id}", response_model=TransactionResponse)
+async def update_transaction(
+    transaction_id: int,
+    transaction_data: TransactionUpdate,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Update a transaction
+    Only some/provided fields will be updated
+    """
+    transaction = await AsyncTransactionService.update_transaction(db, transaction_id, transaction_data, current_user)
+    return transaction
+
+@router.delete("/{transaction_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_transaction(
+    transaction_id: int,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Delete a transaction
+    """
+    await AsyncTransactionService.delete_transaction(db, transaction_id, current_user)
+    return None
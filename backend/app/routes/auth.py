@@ -12,17 +12,17 @@ router = APIRouter(
 )
 
 @router.post('/register', response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(
+async def register(
     user_data: UserCreate, db: Session = Depends(get_db)):
     """Registering a new user needs: email, fullname, password (min 8 characters)"""
-    user= AuthService.register_user(db, user_data)
+    user= await AuthService.register_user(db, user_data)
     return user
 
 @router.post('/login')
-def login(login_data: UserLogin, db:Session = Depends(get_db)):
+async def login(login_data: UserLogin, db:Session = Depends(get_db)):
     """Login needs email, password
     returns jwt tokens for authenticated requests"""
-    result = AuthService.login_user(db, login_data)
+    result = await AuthService.login_user(db, login_data)
     return {
         "access_token": result["access_token"],
         "token_type": result["token_type"],
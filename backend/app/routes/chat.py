@@ -1,11 +1,19 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Header, Response, HTTPException, WebSocket, status
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
-from app.schemas.chat import ChatRequest, ChatResponse, ChatHistoryResponse
+from typing import List, Optional
+from app.config import get_settings
+from app.database import get_db, get_read_db, SessionLocal
+from app.schemas.chat import ChatRequest, ChatBatchRequest, ChatResponse, ChatHistoryResponse
 from app.models.user import User
-from app.services.chatbot_service import ChatbotService
-from app.utils.dependencies import get_current_user
+from app.services.chatbot_service import ChatbotService, HISTORY_FIELDS, HISTORY_COLUMNS
+from app.services.chat_archive_service import ChatArchiveService
+from app.services.chat_channel import serve_chat
+from app.utils.dependencies import get_current_user, websocket_credentials
+from app.utils.pagination import encode_cursor, decode_cursor, NEXT_CURSOR_HEADER
+from app.utils.serializers import rows_response, MSGPACK_RESPONSES
+
+settings = get_settings()
 
 router = APIRouter(
     prefix="/chat",
@@ -30,16 +38,86 @@ def send_message(
     response = ChatbotService.process_message(db, current_user, chat_request.message)
     return response
 
-@router.get("/history", response_model=List[ChatHistoryResponse])
+@router.post("/batch", response_model=List[ChatResponse])
+def send_messages(
+    batch: ChatBatchRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Send several messages at once (up to 20) and get the replies in the same order
+    Data the messages share is loaded once and every message is saved in one commit,
+    so e.g. a home screen costs one request instead of one per question
+    **Protected route** - requires authentication
+    """
+    responses = ChatbotService.process_batch(db, current_user, batch.messages)
+    return responses
+
+@router.websocket("/ws")
+async def chat_socket(websocket: WebSocket):
+    """
+    Chat over one long-lived connection: /chat/ws?token=<access token>
+    (or an Authorization: Bearer header). The token is checked once, then
+    every {"message": ...} frame gets a ChatResponse JSON frame back, in order
+    """
+    await websocket.accept()
+    # One session for the whole connection; it gives its DB connection back to
+    # the pool after every message, so idle sockets don't hold pool slots
+    db = SessionLocal()
+    try:
+        try:
+            user = await run_in_threadpool(get_current_user, websocket_credentials(websocket), db)
+        except HTTPException as exc:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=exc.detail)
+            return
+        finally:
+            await run_in_threadpool(db.close)
+
+        def reply(message: str):
+            try:
+                return ChatbotService.process_message(db, user, message)
+            finally:
+                db.close()
+
+        await serve_chat(websocket, user.id, lambda message: run_in_threadpool(reply, message))
+    finally:
+        await run_in_threadpool(db.close)
+
+@router.get("/history", response_model=List[ChatHistoryResponse], responses=MSGPACK_RESPONSES)
 def get_chat_history(
-    limit: int = 20,
+    limit: int = Query(20, ge=1, le=settings.CHAT_HISTORY_MAX_LIMIT, description="Latest messages to return"),
+    accept: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Get user's chat history
+    Send Accept: application/msgpack for a MessagePack body instead of JSON
+    
+    **Protected route** - requires authentication
+    """
+    rows = ChatbotService.get_chat_history(db, current_user, limit, HISTORY_COLUMNS)
+    return rows_response(rows, HISTORY_FIELDS, accept)
+
+@router.get("/history/archived", response_model=List[ChatHistoryResponse])
+def get_archived_chat_history(
+    response: Response,
+    before: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    limit: int = Query(20, ge=1, le=settings.CHAT_HISTORY_MAX_LIMIT, description="Messages per page"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get user's archived chat history, newest first
+    Messages older than the retention period live here instead of /chat/history.
+    When another page exists its cursor is returned in the X-Next-Cursor header;
+    pass it back as `before` to continue
     
     **Protected route** - requires authentication
     """
-    messages = ChatbotService.get_chat_history(db, current_user, limit)
-    return messages
\ No newline at end of file
+    messages, next_key = ChatArchiveService.get_archived_history(
+        db, current_user, before=decode_cursor(before) if before else None, limit=limit
+    )
+    if next_key:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(*next_key)
+    return messages
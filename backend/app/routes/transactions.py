@@ -1,18 +1,37 @@
-from fastapi import Depends, status, APIRouter, Query
+import json
+from fastapi import Depends, status, APIRouter, Query, Request, Header, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from datetime import date
 from typing import List, Optional
-from app.database import get_db
-from app.schemas.transaction import TransactionCreate, TransactionResponse, TransactionSummary, TransactionUpdate
+from app.config import get_settings
+from app.database import get_db, get_read_db, ReadSessionLocal
+from app.schemas.transaction import (
+    TransactionCreate, TransactionResponse, TransactionSummary, TransactionUpdate, BulkImportResult
+)
 from app.models.transaction import TransactionType
 from app.models.user import User
-from app.services.transaction_service import TransactionService
+from app.services.search_service import SearchService
+from app.services.transaction_service import TransactionService, RESPONSE_FIELDS, RESPONSE_COLUMNS
 from app.utils.dependencies import get_current_user
+from app.utils.exporters import csv_chunks, ndjson_chunks
+from app.utils.pagination import encode_cursor, decode_cursor, NEXT_CURSOR_HEADER
+from app.utils.serializers import rows_response, MSGPACK_RESPONSES
+
+settings = get_settings()
 
 router=APIRouter(
     prefix='/transactions',
     tags=['Transactions']
 )
 
+# Export format -> (row encoder, media type)
+EXPORT_FORMATS = {
+    "csv": (csv_chunks, "text/csv"),
+    "ndjson": (ndjson_chunks, "application/x-ndjson"),
+}
+
 @router.post('/', response_model=TransactionResponse, status_code=status.HTTP_201_CREATED)
 def create_transaction(transaction_data: TransactionCreate,
                        current_user: User=Depends(get_current_user),
@@ -21,22 +40,103 @@ def create_transaction(transaction_data: TransactionCreate,
     transaction=TransactionService.create_transaction(db,transaction_data, current_user)
     return transaction
 
-@router.get('/', response_model=List[TransactionResponse])
+@router.post('/bulk', response_model=BulkImportResult)
+async def bulk_create_transactions(request: Request,
+                                   current_user: User=Depends(get_current_user),
+                                   db: Session = Depends(get_db)):
+    """
+    Import many transactions in one call
+    Body: a JSON array of transactions, or NDJSON (one transaction per line)
+    with Content-Type application/x-ndjson, which is streamed instead of loaded whole
+    Rows are validated and inserted in chunks; invalid rows are reported, not fatal
+    """
+    result = {"received": 0, "inserted": 0, "failed": 0, "errors": []}
+
+    async def flush(chunk):
+        inserted, errors = await run_in_threadpool(
+            TransactionService.bulk_create_transactions, db, chunk, current_user
+        )
+        result["inserted"] += inserted
+        result["errors"].extend(errors)
+
+    chunk = []
+    async for index, record in _bulk_records(request):
+        result["received"] += 1
+        chunk.append((index, record))
+        if len(chunk) >= settings.BULK_INSERT_CHUNK_SIZE:
+            await flush(chunk)
+            chunk = []
+    if chunk:
+        await flush(chunk)
+
+    result["failed"] = len(result["errors"])
+    return result
+
+async def _bulk_records(request: Request):
+    """Yield (row index, raw row) from a JSON array or an NDJSON stream"""
+    content_type = request.headers.get("content-type", "")
+
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        index = 0
+        buffer = b""
+        async for piece in request.stream():
+            buffer += piece
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield index, line
+                    index += 1
+        if buffer.strip():
+            yield index, buffer
+        return
+
+    try:
+        records = json.loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Body must be a JSON array or NDJSON")
+    if not isinstance(records, list):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Body must be a JSON array of transactions")
+    for index, record in enumerate(records):
+        yield index, record
+
+@router.get('/', response_model=List[TransactionResponse], responses=MSGPACK_RESPONSES)
 def get_transactions(
     transaction_type: Optional[TransactionType] = Query(None, description="Filter by type (income/expense)"),
     category: Optional[str] = Query(None, description="Filter by category"),
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    skip: int = Query(0, ge=0, description="Number of records to skip (prefer `after` for deep pages)"),
+    after: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     limit: int = Query(100, ge=1, le=100, description="Max records to return"),
+    accept: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-  transactions=TransactionService.get_user_transactions(db,current_user,category,skip,limit,transaction_type)
-  return transactions
+  """
+  List transactions, newest first
+  When another page exists its cursor is returned in the X-Next-Cursor header;
+  pass it back as `after` to continue
+  Send Accept: application/msgpack for a MessagePack body instead of JSON
+  """
+  if skip and after:
+      raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Use either skip or after, not both")
+
+  # Only the response columns are selected and the row tuples encoded as they are
+  if skip:
+      rows=TransactionService.get_user_transactions(db,current_user,transaction_type=transaction_type,
+                                                    category=category,skip=skip,limit=limit,
+                                                    columns=RESPONSE_COLUMNS)
+      return rows_response(rows,RESPONSE_FIELDS,accept)
+
+  rows,next_key=TransactionService.get_transactions_page(
+      db,current_user,transaction_type=transaction_type,category=category,
+      after=decode_cursor(after) if after else None,limit=limit,columns=RESPONSE_COLUMNS
+  )
+  headers={NEXT_CURSOR_HEADER: encode_cursor(*next_key)} if next_key else None
+  return rows_response(rows,RESPONSE_FIELDS,accept,headers)
 
 @router.get("/summary", response_model=TransactionSummary)
 def get_summary(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get financial summary for the authenticated user
@@ -45,6 +145,57 @@ def get_summary(
     summary = TransactionService.get_summary(db, current_user)
     return summary
 
+@router.get("/search", response_model=List[TransactionResponse], responses=MSGPACK_RESPONSES)
+def search_transactions(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find in descriptions, the last may be partial"),
+    transaction_type: Optional[TransactionType] = Query(None, description="Filter by type (income/expense)"),
+    category: Optional[str] = Query(None, description="Filter by category"),
+    start: Optional[date] = Query(None, description="First day to include"),
+    end: Optional[date] = Query(None, description="Last day to include"),
+    skip: int = Query(0, ge=0, description="Number of matches to skip"),
+    limit: int = Query(50, ge=1, le=100, description="Max matches to return"),
+    accept: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Find transactions by description, most relevant first
+    Every word must be in the description, the last one may be partial
+    ("amazon ord" finds "Amazon order"); served from the full-text index
+    (FTS5 on SQLite, FULLTEXT on MySQL)
+    Send Accept: application/msgpack for a MessagePack body instead of JSON
+    """
+    rows = SearchService.search(
+        db, current_user, q, transaction_type=transaction_type, category=category,
+        start=start, end=end, skip=skip, limit=limit, columns=RESPONSE_COLUMNS
+    )
+    return rows_response(rows, RESPONSE_FIELDS, accept)
+
+@router.get("/export")
+def export_transactions(
+    format: str = Query("csv", pattern="^(csv|ndjson)$", description="csv or ndjson"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Download the user's full transaction history as CSV or NDJSON
+    The file is streamed, so memory use doesn't grow with history size
+    """
+    encode, media_type = EXPORT_FORMATS[format]
+
+    def stream():
+        # The stream outlives the request's session, so it gets its own
+        db = ReadSessionLocal()
+        try:
+            yield from encode(TransactionService.export_transactions(db, current_user))
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        stream(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="transactions.{format}"'}
+    )
+
 @router.get("/{transaction_id}", response_model=TransactionResponse)
 def get_transaction(
     transaction_id: int,
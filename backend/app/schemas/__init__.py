@@ -5,4 +5,5 @@ from app.schemas.transaction import(
     TransactionSummary,
     TransactionUpdate
 )
-from app.schemas.chat import ChatRequest, ChatHistoryResponse, ChatResponse
\ No newline at end of file
+from app.schemas.chat import ChatRequest, ChatBatchRequest, ChatHistoryResponse, ChatResponse
+from app.schemas.analytics import PeriodSummary, CategoryTotal, TrendReport
\ No newline at end of file
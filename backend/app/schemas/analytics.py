@@ -0,0 +1,47 @@
+from pydantic import BaseModel
+from datetime import date
+from typing import List, Optional
+from app.models.transaction import TransactionType
+
+class CategoryTotal(BaseModel):
+    """Total of one category within a period"""
+    category: str
+    type: TransactionType
+    total: float
+    count: int
+
+class PeriodSummary(BaseModel):
+    """
+    Income, expenses and savings of one month, quarter or year
+    """
+    period_start: date
+    total_income: float
+    total_expenses: float
+    net_savings: float
+    transaction_count: int
+    categories: List[CategoryTotal]
+
+class CategoryShare(BaseModel):
+    """Spending of one category over the user's whole history"""
+    category: str
+    total: float
+    count: int
+    average: float
+    share: float
+
+class MonthTrend(BaseModel):
+    """One calendar month of the trend series"""
+    month: date
+    income: float
+    expenses: float
+    savings_rate: Optional[float] = None
+    expense_change: Optional[float] = None
+
+class TrendReport(BaseModel):
+    """
+    Savings and spending trends computed from the user's full history
+    """
+    rolling_30d_spend: float
+    rolling_90d_spend: float
+    categories: List[CategoryShare]
+    months: List[MonthTrend]
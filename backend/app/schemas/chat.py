@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import Annotated, List, Optional
 
 class ChatRequest(BaseModel):
     '''User's message! '''
@@ -13,6 +13,18 @@ class ChatRequest(BaseModel):
             }
         }
         
+class ChatBatchRequest(BaseModel):
+    """Several messages answered in one call, e.g. everything a home screen shows"""
+    messages: List[Annotated[str, Field(min_length=1, max_length=100)]] = Field(..., min_length=1, max_length=20)
+
+    class Config:
+        json_schema_extra= {
+            "example":{
+                "messages":["What's my balance?", "How much have I spent this month?",
+                            "Show my recent transactions", "Give me savings tips"]
+            }
+        }
+
 class ChatResponse(BaseModel):
     """Reply from the bot! """
     user_message: str
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 from app.models.transaction import TransactionType
 
 class TransactionCreate(BaseModel):
@@ -53,4 +53,20 @@ class TransactionSummary(BaseModel):
     total_income: float
     total_expenses: float
     net_savings: float
-    transaction_count: int
\ No newline at end of file
+    transaction_count: int
+
+class BulkRowError(BaseModel):
+    """
+    Why one row of a bulk import was rejected
+    """
+    index: int
+    error: str
+
+class BulkImportResult(BaseModel):
+    """
+    Outcome of a bulk import - rows that failed don't stop the rest
+    """
+    received: int
+    inserted: int
+    failed: int
+    errors: List[BulkRowError]
@@ -0,0 +1,245 @@
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from functools import partial
+from typing import Callable, Dict, List, Optional
+import numpy as np
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.models.balance import UserBalance
+from app.models.transaction import Transaction, TransactionType
+from app.services.balance_service import DRIFT_TOLERANCE
+from app.services.category_service import CategoryService
+
+settings = get_settings()
+
+class UserColumns:
+    """
+    One user's transactions as parallel NumPy arrays, ordered by id
+    amounts float64, dates datetime64[s], categories as int32 codes into
+    category_names (one code per category id, so aliases share it), is_income
+    as a bool mask
+    """
+
+    def __init__(self):
+        self.ids = np.empty(0, dtype=np.int64)
+        self.amounts = np.empty(0, dtype=np.float64)
+        self.dates = np.empty(0, dtype="datetime64[s]")
+        self.category_codes = np.empty(0, dtype=np.int32)
+        self.is_income = np.empty(0, dtype=bool)
+        self.category_names: List[str] = []
+        # category id -> code
+        self._category_index: Dict[Optional[int], int] = {}
+        # Latest created_at/updated_at seen - rows touched after it are refetched
+        self.watermark: Optional[datetime] = None
+        self.data_version = -1
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def copy(self) -> "UserColumns":
+        """An independent copy to merge into - cached instances are never changed in place"""
+        clone = UserColumns()
+        for name in ("ids", "amounts", "dates", "category_codes", "is_income"):
+            setattr(clone, name, getattr(self, name).copy())
+        clone.category_names = list(self.category_names)
+        clone._category_index = dict(self._category_index)
+        clone.watermark = self.watermark
+        clone.data_version = self.data_version
+        return clone
+
+    def merge(self, rows, name_of: Callable[[Optional[int]], str]) -> None:
+        """
+        Upsert (id, amount, date, category_id, type, created_at, updated_at) rows
+        New ids are appended, ids already loaded are overwritten in place
+        name_of gives the display name of a category id not seen before
+        """
+        if not rows:
+            return
+        ids, amounts, dates, category_ids, types, created, updated = zip(*rows)
+
+        codes = np.fromiter(
+            (self._code(category_id, name_of) for category_id in category_ids), dtype=np.int32, count=len(rows)
+        )
+        new = {
+            "ids": np.asarray(ids, dtype=np.int64),
+            "amounts": np.asarray(amounts, dtype=np.float64),
+            "dates": np.asarray(dates, dtype="datetime64[s]"),
+            "category_codes": codes,
+            "is_income": np.fromiter((t == TransactionType.INCOME for t in types), dtype=bool, count=len(rows)),
+        }
+
+        # Rows we already hold were updated - overwrite them where they sit
+        existing = np.zeros(len(rows), dtype=bool)
+        positions = np.zeros(len(rows), dtype=np.int64)
+        if len(self.ids):
+            positions = np.minimum(np.searchsorted(self.ids, new["ids"]), len(self.ids) - 1)
+            existing = self.ids[positions] == new["ids"]
+        for name, values in new.items():
+            column = getattr(self, name)
+            column[positions[existing]] = values[existing]
+            setattr(self, name, np.concatenate([column, values[~existing]]))
+
+        if not np.all(existing):
+            order = np.argsort(self.ids, kind="stable")
+            for name in new:
+                setattr(self, name, getattr(self, name)[order])
+
+        touched = [stamp for stamp in created + updated if stamp is not None]
+        if touched:
+            latest = max(touched)
+            self.watermark = latest if self.watermark is None else max(self.watermark, latest)
+
+    def agrees_with(self, count: int, income: float, expenses: float) -> bool:
+        """Whether the arrays still add up to the user's balance aggregates"""
+        return (
+            len(self) == count
+            and np.isclose(self.amounts[self.is_income].sum(), income, rtol=1e-9, atol=DRIFT_TOLERANCE)
+            and np.isclose(self.amounts[~self.is_income].sum(), expenses, rtol=1e-9, atol=DRIFT_TOLERANCE)
+        )
+
+    def _code(self, category_id: Optional[int], name_of: Callable[[Optional[int]], str]) -> int:
+        code = self._category_index.get(category_id)
+        if code is None:
+            code = self._category_index[category_id] = len(self.category_names)
+            self.category_names.append(name_of(category_id))
+        return code
+
+class AnalyticsEngine:
+    """
+    Vectorized per-user analytics over columnar copies of the transactions
+    A user's rows are loaded once and then kept current by fetching only rows
+    added or updated since the last load; deletes trigger a full reload
+    """
+
+    def __init__(self, max_users: int):
+        self.max_users = max_users
+        self._users: "OrderedDict[int, UserColumns]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def columns(self, db: Session, user_id: int) -> UserColumns:
+        """
+        Up-to-date columns for the user (one PK lookup when nothing changed)
+        A refresh builds a new UserColumns and swaps it in, so callers still
+        computing on the previous one never see it change under them
+        """
+        balance = db.query(
+            UserBalance.data_version, UserBalance.transaction_count,
+            UserBalance.total_income, UserBalance.total_expenses
+        ).filter(UserBalance.user_id == user_id).first()
+        version, expected_count, income, expenses = balance if balance else (0, 0, 0.0, 0.0)
+
+        with self._lock:
+            cols = self._users.get(user_id)
+            if cols is not None:
+                self._users.move_to_end(user_id)
+        if cols is not None and cols.data_version == version:
+            return cols
+
+        CategoryService.warm(db)
+        name_of = partial(CategoryService.name, db)
+        if cols is None:
+            fresh = UserColumns()
+            fresh.merge(self._fetch(db, user_id), name_of)
+        else:
+            fresh = cols.copy()
+            fresh.merge(self._fetch(db, user_id, after_id=int(cols.ids[-1]) if len(cols) else 0,
+                                    since=cols.watermark), name_of)
+            if not fresh.agrees_with(expected_count, income, expenses):
+                # Rows were deleted (or changed in a way the watermark missed) - start over
+                fresh = UserColumns()
+                fresh.merge(self._fetch(db, user_id), name_of)
+        fresh.data_version = version
+
+        with self._lock:
+            # A concurrent refresh may have stored a newer version already - keep that one
+            current = self._users.get(user_id)
+            if current is None or current.data_version <= version:
+                self._users[user_id] = fresh
+            self._users.move_to_end(user_id)
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+        return fresh
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._users.pop(user_id, None)
+
+    @staticmethod
+    def _fetch(db: Session, user_id: int, after_id: Optional[int] = None, since: Optional[datetime] = None):
+        query = db.query(
+            Transaction.id, Transaction.amount, Transaction.date, Transaction.category_id,
+            Transaction.type, Transaction.created_at, Transaction.updated_at
+        ).filter(Transaction.user_id == user_id)
+        if after_id is not None:
+            changed = [Transaction.id > after_id]
+            if since is not None:
+                changed.append(Transaction.updated_at >= since)
+            query = query.filter(or_(*changed))
+        return query.order_by(Transaction.id).all()
+
+    # ----- computations -----
+
+    @staticmethod
+    def category_breakdown(cols: UserColumns, income: bool = False) -> List[Dict]:
+        """Total, count, average and share per category, biggest first"""
+        mask = cols.is_income if income else ~cols.is_income
+        size = len(cols.category_names)
+        totals = np.bincount(cols.category_codes[mask], weights=cols.amounts[mask], minlength=size)
+        counts = np.bincount(cols.category_codes[mask], minlength=size)
+        grand_total = totals.sum()
+
+        order = np.argsort(-totals)
+        return [
+            {
+                "category": cols.category_names[code],
+                "total": float(totals[code]),
+                "count": int(counts[code]),
+                "average": float(totals[code] / counts[code]),
+                "share": float(totals[code] / grand_total) if grand_total else 0.0,
+            }
+            for code in order if counts[code]
+        ]
+
+    @staticmethod
+    def rolling_spend(cols: UserColumns, days: int, as_of: Optional[date] = None) -> float:
+        """Expenses in the `days` days up to and including as_of (default today)"""
+        end = np.datetime64(as_of or date.today(), "D") + 1
+        start = end - days
+        day = cols.dates.astype("datetime64[D]")
+        mask = ~cols.is_income & (day >= start) & (day < end)
+        return float(cols.amounts[mask].sum())
+
+    @staticmethod
+    def monthly_series(cols: UserColumns) -> List[Dict]:
+        """
+        Income, expenses, savings rate and expense change per calendar month,
+        oldest first, months without data included as zeros
+        """
+        if not len(cols):
+            return []
+        months = cols.dates.astype("datetime64[M]")
+        first = months.min()
+        index = (months - first).astype(np.int64)
+        size = int(index.max()) + 1
+
+        income = np.bincount(index[cols.is_income], weights=cols.amounts[cols.is_income], minlength=size)
+        expenses = np.bincount(index[~cols.is_income], weights=cols.amounts[~cols.is_income], minlength=size)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            savings_rate = np.where(income > 0, (income - expenses) / income * 100, np.nan)
+        expense_change = np.concatenate([[np.nan], np.diff(expenses)])
+
+        labels = first + np.arange(size)
+        return [
+            {
+                "month": labels[i].astype("datetime64[D]").item(),
+                "income": float(income[i]),
+                "expenses": float(expenses[i]),
+                "savings_rate": None if np.isnan(savings_rate[i]) else float(savings_rate[i]),
+                "expense_change": None if np.isnan(expense_change[i]) else float(expense_change[i]),
+            }
+            for i in range(size)
+        ]
+
+analytics_engine = AnalyticsEngine(settings.ANALYTICS_CACHE_USERS)
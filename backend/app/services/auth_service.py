@@ -1,8 +1,13 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
 from app.models.user import User
 from app.schemas.user import UserCreate, UserLogin
-from app.utils.security import hash_password, verify_password, create_access_token
+from app.utils.security import (
+    hash_password_async, verify_password_async, password_needs_rehash, create_access_token
+)
 from datetime import timedelta
 from app.config import get_settings
 
@@ -13,16 +18,24 @@ class AuthService:
     Separates business logic from routes.
     """
     @staticmethod
-    def register_user(db: Session, user_data: UserCreate) -> User:
+    async def register_user(db: Session, user_data: UserCreate) -> User:
         """ Register a user 
         Input: db:Session, user_data: Validating user data from the UserCreate schema
         Output: User: The created user object
         else raises HTTPException if user already exists
+        The queries run in the threadpool and bcrypt is awaited on the hashing
+        pool, so no request thread sits blocked on either
         """
-        existing_user=db.query(User).filter(User.email == user_data.email).first()
-        if existing_user:
+        def email_taken():
+            taken = db.query(User.id).filter(User.email == user_data.email).first() is not None
+            # Hand the connection back to the pool while bcrypt runs - a login burst
+            # would otherwise hold one per request for the whole wait
+            db.rollback()
+            return taken
+
+        if await run_in_threadpool(email_taken):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
-        hashed_pass = hash_password(user_data.password)
+        hashed_pass = await hash_password_async(user_data.password)
 
         new_user = User(
             email=user_data.email,
@@ -30,25 +43,35 @@ class AuthService:
             full_name=user_data.full_name
         )
 
-        db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        def save():
+            db.add(new_user)
+            db.commit()
+            db.refresh(new_user)
+
+        await run_in_threadpool(save)
         return new_user
     
     @staticmethod
-    def login_user(db: Session, login_data: UserLogin)->dict:
+    async def login_user(db: Session, login_data: UserLogin)->dict:
         """Input
         db: Session , login_Data: from UserLogin schema
         Output: Dict with access token and token type
-        db: Session , login_Data: from UserLogin schema
-        Output: Dict with access token and token type
         else raises HTTPException if credentials are invalid
+        Runs like register_user: queries in the threadpool, bcrypt awaited
         """
 
-        user = db.query(User).filter(User.email == login_data.email).first()
+        def find_user():
+            user = db.query(User).filter(User.email == login_data.email).first()
+            # Detached with its columns loaded, so the rollback can free the connection before bcrypt runs
+            if user is not None:
+                db.expunge(user)
+            db.rollback()
+            return user
+
+        user = await run_in_threadpool(find_user)
         
         # Check if user exists and password is correct
-        if not user or not verify_password(login_data.password, user.hashed_password):
+        if not user or not await verify_password_async(login_data.password, user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
@@ -62,6 +85,18 @@ class AuthService:
                 detail="Account is inactive"
             )
         
+        # Upgrade the stored hash when BCRYPT_ROUNDS has changed since it was made
+        if password_needs_rehash(user.hashed_password):
+            hashed_pass = await hash_password_async(login_data.password)
+
+            def save():
+                db.add(user)
+                user.hashed_password = hashed_pass
+                db.commit()
+                db.refresh(user)
+
+            await run_in_threadpool(save)
+        
         # Create access token
         access_token = create_access_token(
             data={"sub": str(user.id), "email": user.email},
@@ -91,3 +126,83 @@ class AuthService:
                 detail="User not found"
             )
         return user
+
+class AsyncAuthService:
+    """
+    Async version of AuthService
+    Queries go through the AsyncSession directly and bcrypt is awaited on the
+    hashing pool, so neither blocks the event loop
+    """
+    @staticmethod
+    async def register_user(db: AsyncSession, user_data: UserCreate) -> User:
+        """Same contract as AuthService.register_user"""
+        result = await db.execute(select(User.id).where(User.email == user_data.email))
+        taken = result.first() is not None
+        # Free the connection while bcrypt runs, as AuthService.register_user does
+        await db.rollback()
+        if taken:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
+        hashed_pass = await hash_password_async(user_data.password)
+
+        new_user = User(
+            email=user_data.email,
+            hashed_password=hashed_pass,
+            full_name=user_data.full_name
+        )
+
+        db.add(new_user)
+        await db.commit()
+        await db.refresh(new_user)
+        return new_user
+
+    @staticmethod
+    async def login_user(db: AsyncSession, login_data: UserLogin) -> dict:
+        """Same contract as AuthService.login_user"""
+        result = await db.execute(select(User).where(User.email == login_data.email))
+        user = result.scalars().first()
+        if user is not None:
+            db.expunge(user)
+        await db.rollback()
+
+        if not user or not await verify_password_async(login_data.password, user.hashed_password):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Incorrect email or password",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+        if not user.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Account is inactive"
+            )
+
+        if password_needs_rehash(user.hashed_password):
+            hashed_pass = await hash_password_async(login_data.password)
+            db.add(user)
+            user.hashed_password = hashed_pass
+            await db.commit()
+            await db.refresh(user)
+
+        access_token = create_access_token(
+            data={"sub": str(user.id), "email": user.email},
+            expires_delta=timedelta(minutes=setting.ACCESS_TOKEN_EXPIRE_MINUTES)
+        )
+
+        return {
+            "access_token": access_token,
+            "token_type": "bearer",
+            "user": user
+        }
+
+    @staticmethod
+    async def get_current_user(db: AsyncSession, user_id: int) -> User:
+        """Same contract as AuthService.get_current_user"""
+        result = await db.execute(select(User).where(User.id == user_id))
+        user = result.scalars().first()
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+        return user
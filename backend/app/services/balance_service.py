@@ -0,0 +1,233 @@
+import threading
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import event, func, select
+from typing import Iterable, Optional, List, Dict, Tuple
+from app.config import get_settings
+from app.models.balance import UserBalance, UserCategoryBalance
+from app.models.transaction import Transaction, TransactionType
+from app.services.category_service import CategoryService
+from app.utils.aggregates import increment_row, increment_row_async
+from app.utils.auth_cache import TTLCache
+
+settings = get_settings()
+
+# Float sums built up incrementally may differ from a fresh SUM() by rounding noise
+DRIFT_TOLERANCE = 0.005
+
+# Session.info key of the users whose data version the session's transaction bumped
+BUMPED_USERS = "bumped_data_versions"
+
+class DataVersionCache:
+    """
+    Users' data versions as last read by this process, so the chatbot can look up
+    cached replies without reading user_balances first
+    Filled by queries that select the version alongside their data; a commit
+    that bumped a user's version evicts them, and writes made by other
+    processes show up once the entry expires
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._versions = TTLCache(maxsize, ttl)
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[int]:
+        return self._versions.get(user_id)
+
+    def mark(self) -> int:
+        """Take before a query that reads a version, and hand it to remember()"""
+        return self._evictions
+
+    def remember(self, user_id: int, version: int, mark: int) -> None:
+        """Store a version read by a query, unless a commit evicted anything since mark"""
+        with self._lock:
+            if self._evictions == mark:
+                self._versions.set(user_id, version)
+
+    def evict(self, user_ids: Iterable[int]) -> None:
+        with self._lock:
+            self._evictions += 1
+            for user_id in user_ids:
+                self._versions.invalidate(user_id)
+
+    def stats(self) -> dict:
+        return self._versions.stats()
+
+data_versions = DataVersionCache(settings.DATA_VERSION_CACHE_SIZE, settings.DATA_VERSION_TTL_SECONDS)
+
+@event.listens_for(Session, "after_commit")
+def _evict_bumped_versions(session):
+    users = session.info.pop(BUMPED_USERS, None)
+    if users:
+        data_versions.evict(users)
+
+@event.listens_for(Session, "after_rollback")
+def _forget_bumped_versions(session):
+    session.info.pop(BUMPED_USERS, None)
+
+class BalanceService:
+    """Maintains the per-user balance aggregates used by summaries and the chatbot"""
+
+    @staticmethod
+    def apply(db: Session, user_id: int, transaction_type: TransactionType,
+              category_id: int, amount: float, count: int = 1) -> None:
+        """
+        Add a transaction to the aggregates (pass negative amount and count to remove one)
+        Runs inside the caller's DB transaction - the caller commits
+        """
+        for model, keys, deltas in BalanceService._increments(user_id, transaction_type, category_id, amount, count):
+            increment_row(db, model, keys, deltas)
+
+    @staticmethod
+    def _increments(user_id: int, transaction_type: TransactionType, category_id: int,
+                    amount: float, count: int) -> List[Tuple]:
+        """(model, keys, deltas) of the aggregate rows apply() adds to"""
+        is_income = transaction_type == TransactionType.INCOME
+        return [
+            (UserBalance, {"user_id": user_id}, {
+                "total_income": amount if is_income else 0.0,
+                "total_expenses": 0.0 if is_income else amount,
+                "transaction_count": count,
+            }),
+            (UserCategoryBalance, {"user_id": user_id, "type": transaction_type, "category_id": category_id},
+             {"total": amount, "count": count}),
+        ]
+
+    @staticmethod
+    def bump_version(db: Session, user_id: int) -> None:
+        """
+        Mark the user's transaction data as changed
+        Called by every transaction write, inside the caller's DB transaction
+        """
+        increment_row(db, UserBalance, {"user_id": user_id}, {"data_version": 1})
+        db.info.setdefault(BUMPED_USERS, set()).add(user_id)
+
+    @staticmethod
+    def version_column(user_id: int):
+        """
+        The user's data version as a scalar subquery, for queries that want it
+        alongside their rows instead of in a round trip of its own
+        """
+        return select(UserBalance.data_version).where(
+            UserBalance.user_id == user_id
+        ).scalar_subquery().label("data_version")
+
+    @staticmethod
+    def get_balance(db: Session, user_id: int) -> tuple[float, float, int]:
+        """
+        Returns (total_income, total_expenses, transaction_count) with a single primary key lookup
+        """
+        balance = db.execute(BalanceService.balance_statement(user_id)).first()
+        return tuple(balance) if balance else (0.0, 0.0, 0)
+
+    @staticmethod
+    def balance_statement(user_id: int):
+        """The get_balance lookup, shared with the async summary"""
+        return select(UserBalance.total_income, UserBalance.total_expenses, UserBalance.transaction_count).where(
+            UserBalance.user_id == user_id
+        )
+
+    @staticmethod
+    def rebuild(db: Session, user_id: Optional[int] = None, verify_only: bool = False) -> List[Dict]:
+        """
+        Recompute the aggregates from the raw transactions and report drift
+        Input:
+            user_id: Only check this user (all users when None)
+            verify_only: Report drift without rewriting the aggregates
+        Output: List of drift entries, one per aggregate row that did not match
+        Category rows are keyed on category_id, so it must be filled in on every
+        transaction first (app/migrate_categories.py does it for old rows)
+        """
+        raw = db.query(
+            Transaction.user_id,
+            Transaction.type,
+            Transaction.category_id,
+            func.sum(Transaction.amount),
+            func.count(Transaction.id)
+        ).group_by(Transaction.user_id, Transaction.type, Transaction.category_id)
+        stored_users = db.query(UserBalance)
+        stored_categories = db.query(UserCategoryBalance)
+
+        if user_id is not None:
+            raw = raw.filter(Transaction.user_id == user_id)
+            stored_users = stored_users.filter(UserBalance.user_id == user_id)
+            stored_categories = stored_categories.filter(UserCategoryBalance.user_id == user_id)
+
+        expected_categories = {}
+        expected_users = {}
+        for uid, t_type, category_id, total, count in raw.all():
+            expected_categories[(uid, t_type, category_id)] = (total or 0.0, count)
+            income, expenses, n = expected_users.get(uid, (0.0, 0.0, 0))
+            if t_type == TransactionType.INCOME:
+                income += total or 0.0
+            else:
+                expenses += total or 0.0
+            expected_users[uid] = (income, expenses, n + count)
+
+        drift = []
+        # Read as plain rows, so no loaded object clashes with its replacement below
+        stored_user_rows = stored_users.with_entities(
+            UserBalance.user_id, UserBalance.total_income, UserBalance.total_expenses,
+            UserBalance.transaction_count, UserBalance.data_version
+        ).all()
+        actual_users = {b.user_id: (b.total_income, b.total_expenses, b.transaction_count) for b in stored_user_rows}
+        versions = {b.user_id: b.data_version for b in stored_user_rows}
+        for uid in expected_users.keys() | actual_users.keys():
+            expected = expected_users.get(uid, (0.0, 0.0, 0))
+            actual = actual_users.get(uid, (0.0, 0.0, 0))
+            if not BalanceService._matches(expected, actual):
+                drift.append({"user_id": uid, "type": None, "category": None, "expected": expected, "actual": actual})
+
+        actual_categories = {(c.user_id, c.type, c.category_id): (c.total, c.count) for c in stored_categories.with_entities(
+            UserCategoryBalance.user_id, UserCategoryBalance.type, UserCategoryBalance.category_id,
+            UserCategoryBalance.total, UserCategoryBalance.count
+        ).all()}
+        for key in expected_categories.keys() | actual_categories.keys():
+            expected = expected_categories.get(key, (0.0, 0))
+            actual = actual_categories.get(key, (0.0, 0))
+            if not BalanceService._matches(expected, actual):
+                uid, t_type, category_id = key
+                drift.append({"user_id": uid, "type": t_type.value, "category": CategoryService.name(db, category_id),
+                              "expected": expected, "actual": actual})
+
+        if verify_only:
+            return drift
+
+        # Rewrite the aggregates from scratch for the checked users
+        # (data versions carry over and move forward so cached replies are dropped)
+        stored_categories.delete(synchronize_session=False)
+        stored_users.delete(synchronize_session=False)
+        db.info.setdefault(BUMPED_USERS, set()).update(expected_users.keys() | versions.keys())
+        for uid, (income, expenses, count) in expected_users.items():
+            db.add(UserBalance(user_id=uid, total_income=income, total_expenses=expenses, transaction_count=count,
+                               data_version=versions.get(uid, 0) + 1))
+        for (uid, t_type, category_id), (total, count) in expected_categories.items():
+            db.add(UserCategoryBalance(user_id=uid, type=t_type, category_id=category_id, total=total, count=count))
+        db.commit()
+
+        return drift
+
+    @staticmethod
+    def _matches(expected: tuple, actual: tuple) -> bool:
+        """Compare aggregate tuples, allowing rounding noise on the float totals"""
+        return all(
+            abs(e - a) <= DRIFT_TOLERANCE if isinstance(e, float) or isinstance(a, float) else e == a
+            for e, a in zip(expected, actual)
+        )
+
+class AsyncBalanceService:
+    """The aggregate writes of BalanceService for an AsyncSession"""
+
+    @staticmethod
+    async def apply(db: AsyncSession, user_id: int, transaction_type: TransactionType,
+                    category_id: int, amount: float, count: int = 1) -> None:
+        """Same contract as BalanceService.apply"""
+        for model, keys, deltas in BalanceService._increments(user_id, transaction_type, category_id, amount, count):
+            await increment_row_async(db, model, keys, deltas)
+
+    @staticmethod
+    async def bump_version(db: AsyncSession, user_id: int) -> None:
+        """Same contract as BalanceService.bump_version"""
+        await increment_row_async(db, UserBalance, {"user_id": user_id}, {"data_version": 1})
+        db.info.setdefault(BUMPED_USERS, set()).add(user_id)
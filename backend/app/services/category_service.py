@@ -0,0 +1,304 @@
+import threading
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import event, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.category import Category, CategoryAlias
+
+# Categories every database starts with, and the other spellings that mean them
+DEFAULT_ALIASES: Dict[str, List[str]] = {
+    "Food": ["groceries", "grocery", "dining", "restaurants", "restaurant", "eating out"],
+    "Rent": ["housing"],
+    "Transport": ["transportation", "commute", "fuel", "taxi"],
+    "Entertainment": ["fun", "movies"],
+    "Utilities": ["bills", "utility"],
+    "Shopping": ["clothes", "clothing"],
+    "Healthcare": ["health", "medical", "pharmacy"],
+    "Salary": ["wages", "paycheck"],
+    "Freelance": ["contract work"],
+    "Investment": ["investments", "dividends"],
+    "Bonus": ["bonuses"],
+}
+
+def normalize(name: str) -> str:
+    """Alias form of a category name: lowercase, single spaces"""
+    return " ".join(name.lower().split())
+
+class CategoryCache:
+    """
+    In-memory alias -> id and id -> name lookup of the categories table
+    Aliases are kept per owner (None for curated ones), so a user's own
+    categories are only seen by lookups made for that user
+    Categories are only ever added, so entries never go stale; a miss falls
+    back to the database (another process may have added the category)
+    """
+
+    def __init__(self):
+        self.loaded = False
+        # owner -> alias -> category id
+        self._ids: Dict[Optional[int], Dict[str, int]] = {}
+        self._names: Dict[int, str] = {}
+        # Bumped per owner whenever one of their aliases is added, so things built from them know to rebuild
+        self._versions: Dict[Optional[int], int] = {}
+        self._lock = threading.Lock()
+
+    def id_for(self, alias: str, user_id: Optional[int] = None) -> Optional[int]:
+        """The curated category the alias means, else the user's own"""
+        category_id = self._ids.get(None, {}).get(alias)
+        if category_id is None and user_id is not None:
+            category_id = self._ids.get(user_id, {}).get(alias)
+        return category_id
+
+    def name_for(self, category_id: int) -> Optional[str]:
+        return self._names.get(category_id)
+
+    def version(self, owner: Optional[int]) -> int:
+        return self._versions.get(owner, 0)
+
+    def has_own(self, user_id: int) -> bool:
+        """Whether the user has categories of their own"""
+        return bool(self._ids.get(user_id))
+
+    def aliases(self, owner: Optional[int]) -> Dict[str, str]:
+        """Every cached alias of the owner (None: the curated ones) -> the display name of its category"""
+        with self._lock:
+            return {alias: self._names[category_id] for alias, category_id in self._ids.get(owner, {}).items()}
+
+    def add(self, entries: List[Tuple[Optional[int], str, int, str]]) -> None:
+        """Remember (owner, alias, category id, category name) entries"""
+        with self._lock:
+            for owner, alias, category_id, name in entries:
+                aliases = self._ids.setdefault(owner, {})
+                if alias not in aliases:
+                    self._versions[owner] = self._versions.get(owner, 0) + 1
+                aliases[alias] = category_id
+                self._names[category_id] = name
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ids.clear()
+            self._names.clear()
+            self.loaded = False
+            for owner in self._versions:
+                self._versions[owner] += 1
+
+category_cache = CategoryCache()
+
+# Categories created inside a session are only cached once it commits, so a
+# rolled-back insert never leaves an id in the cache that doesn't exist
+_PENDING = "pending_categories"
+
+@event.listens_for(Session, "after_commit")
+def _publish_categories(session: Session) -> None:
+    category_cache.add(session.info.pop(_PENDING, []))
+
+@event.listens_for(Session, "after_rollback")
+def _discard_categories(session: Session) -> None:
+    session.info.pop(_PENDING, None)
+
+class CategoryService:
+    """
+    Resolves category names to ids through the alias cache
+    Lookups are made for a user: a name means the curated category with that
+    alias if there is one, else the user's own; new names become the user's own
+    """
+
+    @staticmethod
+    def warm(db: Session) -> None:
+        """Load every alias into the cache once (the table is small)"""
+        if category_cache.loaded:
+            return
+        rows = db.execute(CategoryService._all_aliases()).all()
+        category_cache.add([tuple(row) for row in rows])
+        category_cache.loaded = True
+
+    @staticmethod
+    def _all_aliases():
+        return select(CategoryAlias.user_id, CategoryAlias.alias, Category.id, Category.name).join(Category)
+
+    @staticmethod
+    def _alias_lookup(alias: str, user_id: Optional[int]):
+        """The alias's curated category, else the user's own - curated first"""
+        scope = CategoryAlias.user_id.is_(None)
+        if user_id is not None:
+            scope = or_(scope, CategoryAlias.user_id == user_id)
+        return select(CategoryAlias.user_id, Category.id, Category.name).join(Category).where(
+            CategoryAlias.alias == alias, scope
+        ).order_by(CategoryAlias.user_id.is_not(None))
+
+    @staticmethod
+    def _remember(db, alias: str, row) -> int:
+        """Cache an alias found in the database and return its category id"""
+        entry = (row.user_id, alias, row.id, row.name)
+        if _PENDING in db.info:
+            # This session created categories itself - the row may not be committed yet
+            db.info[_PENDING].append(entry)
+        else:
+            category_cache.add([entry])
+        return row.id
+
+    @staticmethod
+    def resolve(db: Session, name: str, user_id: Optional[int]) -> Optional[int]:
+        """
+        Id of the category a name or alias means to the user, case-insensitively, or None
+        user_id None looks at the curated categories only
+        """
+        CategoryService.warm(db)
+        alias = normalize(name)
+        category_id = category_cache.id_for(alias, user_id)
+        if category_id is not None:
+            return category_id
+
+        row = db.execute(CategoryService._alias_lookup(alias, user_id)).first()
+        if row is None:
+            return None
+        return CategoryService._remember(db, alias, row)
+
+    @staticmethod
+    def get_or_create(db: Session, name: str, user_id: Optional[int], aliases: Optional[List[str]] = None) -> int:
+        """
+        Id of the category name means to the user, creating it as the user's own
+        (with any extra aliases) if it's new; user_id None creates a curated one
+        Runs inside the caller's DB transaction - the caller commits
+        """
+        category_id = CategoryService.resolve(db, name, user_id)
+        if category_id is not None:
+            return category_id
+
+        category = CategoryService._new_category(name, user_id, aliases)
+        try:
+            # A concurrent writer creating the same category only rolls back this step
+            with db.begin_nested():
+                db.add(category)
+                db.flush()
+        except IntegrityError:
+            category_id = CategoryService.resolve(db, name, user_id)
+            if category_id is None:
+                raise
+            return category_id
+
+        CategoryService._created(db.info, category)
+        return category.id
+
+    @staticmethod
+    def _new_category(name: str, user_id: Optional[int], aliases: Optional[List[str]]) -> Category:
+        spellings = {normalize(name), *(normalize(alias) for alias in aliases or ())}
+        return Category(
+            name=" ".join(name.split()), user_id=user_id,
+            aliases=[CategoryAlias(alias=alias, user_id=user_id) for alias in spellings]
+        )
+
+    @staticmethod
+    def _created(info: dict, category: Category) -> None:
+        """Queue a new category's aliases for the cache, published when the session commits"""
+        info.setdefault(_PENDING, []).extend(
+            (category.user_id, alias.alias, category.id, category.name) for alias in category.aliases
+        )
+
+    @staticmethod
+    def name(db: Session, category_id: Optional[int]) -> str:
+        """Display name of a category id"""
+        if category_id is None:
+            return "Uncategorized"
+        name = category_cache.name_for(category_id)
+        if name is None:
+            name = db.execute(CategoryService._name_lookup(category_id)).scalar_one()
+        return name
+
+    @staticmethod
+    def _name_lookup(category_id: int):
+        return select(Category.name).where(Category.id == category_id)
+
+    @staticmethod
+    def keywords(user_id: Optional[int]) -> Dict[str, str]:
+        """
+        Every name and alias a message from the user can use for a category -> its
+        display name: the curated ones plus the user's own, from the cache (warm it first)
+        """
+        keywords = category_cache.aliases(user_id) if user_id is not None else {}
+        keywords.update(category_cache.aliases(None))
+        return keywords
+
+    @staticmethod
+    def canonical(name: str, user_id: Optional[int] = None) -> str:
+        """Display name of the category a name means to the user, from the cache; the name itself if unknown"""
+        category_id = category_cache.id_for(normalize(name), user_id)
+        return category_cache.name_for(category_id) if category_id is not None else name
+
+    @staticmethod
+    def same(first: str, second: str, user_id: Optional[int] = None) -> bool:
+        """Whether two names mean the same category to the user, e.g. "food" and "Groceries" """
+        first_id = category_cache.id_for(normalize(first), user_id)
+        second_id = category_cache.id_for(normalize(second), user_id)
+        if first_id is not None and second_id is not None:
+            return first_id == second_id
+        return normalize(first) == normalize(second)
+
+    @staticmethod
+    def seed_defaults(db: Session) -> None:
+        """Create the DEFAULT_ALIASES categories (curated) and add any aliases they are missing"""
+        for name, aliases in DEFAULT_ALIASES.items():
+            category_id = CategoryService.get_or_create(db, name, None, aliases)
+            for alias in aliases:
+                if CategoryService.resolve(db, alias, None) is None:
+                    db.add(CategoryAlias(alias=normalize(alias), user_id=None, category_id=category_id))
+                    db.flush()
+                    db.info.setdefault(_PENDING, []).append((None, normalize(alias), category_id, name))
+
+class AsyncCategoryService:
+    """CategoryService lookups for an AsyncSession - same cache, misses are awaited"""
+
+    @staticmethod
+    async def warm(db: AsyncSession) -> None:
+        if category_cache.loaded:
+            return
+        rows = (await db.execute(CategoryService._all_aliases())).all()
+        category_cache.add([tuple(row) for row in rows])
+        category_cache.loaded = True
+
+    @staticmethod
+    async def resolve(db: AsyncSession, name: str, user_id: Optional[int]) -> Optional[int]:
+        """Same contract as CategoryService.resolve"""
+        await AsyncCategoryService.warm(db)
+        alias = normalize(name)
+        category_id = category_cache.id_for(alias, user_id)
+        if category_id is not None:
+            return category_id
+
+        row = (await db.execute(CategoryService._alias_lookup(alias, user_id))).first()
+        if row is None:
+            return None
+        return CategoryService._remember(db, alias, row)
+
+    @staticmethod
+    async def get_or_create(db: AsyncSession, name: str, user_id: Optional[int],
+                            aliases: Optional[List[str]] = None) -> int:
+        """Same contract as CategoryService.get_or_create"""
+        category_id = await AsyncCategoryService.resolve(db, name, user_id)
+        if category_id is not None:
+            return category_id
+
+        category = CategoryService._new_category(name, user_id, aliases)
+        try:
+            async with db.begin_nested():
+                db.add(category)
+                await db.flush()
+        except IntegrityError:
+            category_id = await AsyncCategoryService.resolve(db, name, user_id)
+            if category_id is None:
+                raise
+            return category_id
+
+        CategoryService._created(db.info, category)
+        return category.id
+
+    @staticmethod
+    async def name(db: AsyncSession, category_id: Optional[int]) -> str:
+        """Same contract as CategoryService.name"""
+        if category_id is None:
+            return "Uncategorized"
+        name = category_cache.name_for(category_id)
+        if name is None:
+            name = (await db.execute(CategoryService._name_lookup(category_id))).scalar_one()
+        return name
@@ -0,0 +1,171 @@
+import json
+import logging
+import threading
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import distinct, select
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.chat import ChatMessage, ChatArchive
+from app.models.user import User
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+MESSAGE_FIELDS = ("id", "user_message", "bot_response", "intent", "created_at")
+
+def retention_cutoff(retention_days: int) -> datetime:
+    """Messages created before this are due for archiving (chat timestamps are UTC)"""
+    return datetime.now(timezone.utc) - timedelta(days=retention_days)
+
+class ChatArchiveService:
+    """Moves old chat messages into compressed per-user archives and reads them back"""
+
+    @staticmethod
+    def archive(db: Session, older_than: datetime, user_id: Optional[int] = None,
+                batch_size: int = settings.CHAT_ARCHIVE_BATCH_SIZE) -> Dict[int, int]:
+        """
+        Archive every message created before older_than, oldest first,
+        batch_size messages per blob and one commit per blob
+        Returns {user_id: messages archived}
+        """
+        users = db.query(distinct(ChatMessage.user_id)).filter(ChatMessage.created_at < older_than)
+        if user_id is not None:
+            users = users.filter(ChatMessage.user_id == user_id)
+
+        archived = {}
+        for (uid,) in users.all():
+            while True:
+                rows = db.query(*(getattr(ChatMessage, f) for f in MESSAGE_FIELDS)).filter(
+                    ChatMessage.user_id == uid,
+                    ChatMessage.created_at < older_than
+                ).order_by(ChatMessage.created_at, ChatMessage.id).limit(batch_size).all()
+                if not rows:
+                    break
+
+                db.add(ChatArchive(
+                    user_id=uid,
+                    first_created_at=rows[0].created_at,
+                    last_created_at=rows[-1].created_at,
+                    message_count=len(rows),
+                    payload=ChatArchiveService._pack(rows)
+                ))
+                db.query(ChatMessage).filter(
+                    ChatMessage.id.in_([row.id for row in rows])
+                ).delete(synchronize_session=False)
+                db.commit()
+                archived[uid] = archived.get(uid, 0) + len(rows)
+        return archived
+
+    @staticmethod
+    def get_archived_history(db: Session, user: User, before: Optional[Tuple[datetime, int]] = None,
+                             limit: int = 20) -> Tuple[List[Dict], Optional[Tuple[datetime, int]]]:
+        """
+        Archived messages newest first, continuing after `before` = (created_at, id)
+        Returns (messages, key of the last one) - the key is None on the last page
+        """
+        messages: List[Dict] = []
+        # Blobs are decompressed one at a time and only until the page is full
+        for archive in db.execute(ChatArchiveService._archives_statement(user, before)).scalars():
+            if ChatArchiveService._collect(messages, archive.payload, before, limit):
+                break
+        return ChatArchiveService._page(messages, limit)
+
+    @staticmethod
+    def _archives_statement(user: User, before: Optional[Tuple[datetime, int]]):
+        """The user's archives that can hold messages before `before`, newest first, 4 per fetch"""
+        statement = select(ChatArchive).where(ChatArchive.user_id == user.id)
+        if before is not None:
+            statement = statement.where(ChatArchive.first_created_at <= before[0])
+        return statement.order_by(
+            ChatArchive.first_created_at.desc(), ChatArchive.id.desc()
+        ).execution_options(yield_per=4)
+
+    @staticmethod
+    def _collect(messages: List[Dict], payload: bytes, before: Optional[Tuple[datetime, int]], limit: int) -> bool:
+        """Add a blob's messages before `before` to messages, newest first; True once past a full page"""
+        for message in reversed(ChatArchiveService._unpack(payload)):
+            if before is not None and (message["created_at"], message["id"]) >= before:
+                continue
+            messages.append(message)
+            if len(messages) > limit:
+                return True
+        return False
+
+    @staticmethod
+    def _page(messages: List[Dict], limit: int) -> Tuple[List[Dict], Optional[Tuple[datetime, int]]]:
+        if len(messages) <= limit:
+            return messages, None
+        page = messages[:limit]
+        return page, (page[-1]["created_at"], page[-1]["id"])
+
+    @staticmethod
+    def _pack(rows) -> bytes:
+        records = [
+            [row.id, row.user_message, row.bot_response, row.intent, row.created_at.isoformat()]
+            for row in rows
+        ]
+        return zlib.compress(json.dumps(records, separators=(",", ":")).encode("utf-8"))
+
+    @staticmethod
+    def _unpack(payload: bytes) -> List[Dict]:
+        records = json.loads(zlib.decompress(payload))
+        messages = []
+        for record in records:
+            message = dict(zip(MESSAGE_FIELDS, record))
+            message["created_at"] = datetime.fromisoformat(message["created_at"])
+            messages.append(message)
+        return messages
+
+class AsyncChatArchiveService:
+    """Async version of ChatArchiveService's reads, see AsyncTransactionService"""
+    @staticmethod
+    async def get_archived_history(db: AsyncSession, user: User, before: Optional[Tuple[datetime, int]] = None,
+                                   limit: int = 20):
+        """Same contract as ChatArchiveService.get_archived_history"""
+        messages: List[Dict] = []
+        result = await db.stream_scalars(ChatArchiveService._archives_statement(user, before))
+        async for archive in result:
+            if ChatArchiveService._collect(messages, archive.payload, before, limit):
+                break
+        await result.close()
+        return ChatArchiveService._page(messages, limit)
+
+class ChatArchiver:
+    """Runs the retention job in a background thread every interval_minutes"""
+
+    def __init__(self, interval_minutes: int, retention_days: int):
+        self.interval_minutes = interval_minutes
+        self.retention_days = retention_days
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None or self.interval_minutes <= 0:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="chat-archiver", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self.interval_minutes * 60):
+            db = SessionLocal()
+            try:
+                ChatArchiveService.archive(db, retention_cutoff(self.retention_days))
+            except Exception:
+                db.rollback()
+                logger.exception("Chat archiving failed, retrying next interval")
+            finally:
+                db.close()
+
+chat_archiver = ChatArchiver(settings.CHAT_ARCHIVE_INTERVAL_MINUTES, settings.CHAT_RETENTION_DAYS)
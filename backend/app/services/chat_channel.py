@@ -0,0 +1,95 @@
+import asyncio
+import threading
+from collections import Counter
+from typing import Awaitable, Callable, Dict
+from fastapi import WebSocket, status
+from pydantic import ValidationError
+from app.config import get_settings
+from app.schemas.chat import ChatRequest, ChatResponse
+
+settings = get_settings()
+
+# Queue markers telling the writer why the reader stopped
+_DISCONNECTED = object()
+_IDLE = object()
+
+class ConnectionLimiter:
+    """Open WebSocket connections per user, capped at max_per_user"""
+
+    def __init__(self, max_per_user: int):
+        self.max_per_user = max_per_user
+        self.rejected = 0
+        self._open: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def acquire(self, user_id: int) -> bool:
+        """Count a new connection, or return False if the user is at the cap"""
+        with self._lock:
+            if self._open[user_id] >= self.max_per_user:
+                self.rejected += 1
+                return False
+            self._open[user_id] += 1
+            return True
+
+    def release(self, user_id: int) -> None:
+        with self._lock:
+            self._open[user_id] -= 1
+            if self._open[user_id] <= 0:
+                del self._open[user_id]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "open": sum(self._open.values()),
+                "users": len(self._open),
+                "rejected": self.rejected,
+            }
+
+chat_connections = ConnectionLimiter(settings.CHAT_WS_MAX_CONNECTIONS_PER_USER)
+
+async def serve_chat(websocket: WebSocket, user_id: int, answer: Callable[[str], Awaitable[dict]]) -> None:
+    """
+    Answer {"message": ...} frames on an accepted socket until it closes or goes idle
+    Replies are ChatResponse JSON, sent in the order the messages arrived
+    A reader task reads ahead into a bounded queue; once CHAT_WS_MAX_PENDING
+    messages wait it stops reading, so a fast client is slowed to the
+    answering speed by TCP flow control instead of growing server memory
+    """
+    if not chat_connections.acquire(user_id):
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason="Too many open chat connections")
+        return
+
+    queue: asyncio.Queue = asyncio.Queue(maxsize=settings.CHAT_WS_MAX_PENDING)
+
+    async def read():
+        while True:
+            try:
+                message = await asyncio.wait_for(websocket.receive(), settings.CHAT_WS_IDLE_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                await queue.put(_IDLE)
+                return
+            if message["type"] == "websocket.disconnect":
+                await queue.put(_DISCONNECTED)
+                return
+            await queue.put(message.get("text") or (message.get("bytes") or b"").decode("utf-8", "replace"))
+
+    reader = asyncio.create_task(read())
+    try:
+        while True:
+            frame = await queue.get()
+            if frame is _DISCONNECTED:
+                return
+            if frame is _IDLE:
+                await websocket.close(code=status.WS_1000_NORMAL_CLOSURE, reason="Idle timeout")
+                return
+            try:
+                request = ChatRequest.model_validate_json(frame)
+            except ValidationError as exc:
+                errors = exc.errors(include_url=False, include_context=False, include_input=False)
+                await websocket.send_json({"error": "Invalid message", "detail": errors})
+                continue
+            reply = await answer(request.message)
+            await websocket.send_text(ChatResponse.model_validate(reply).model_dump_json())
+    finally:
+        reader.cancel()
+        chat_connections.release(user_id)
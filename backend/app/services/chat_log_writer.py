@@ -0,0 +1,221 @@
+import logging
+import queue
+import threading
+import time
+from typing import Dict, List, Optional
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.chat import ChatMessage
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# A failed bulk insert is retried this many times in all, waiting 0.1s, 0.2s, ... in between
+WRITE_ATTEMPTS = 3
+RETRY_BACKOFF_SECONDS = 0.1
+
+class ChatLogWriter:
+    """
+    Write-behind persistence of chat messages
+    Requests hand their ChatMessage rows to a bounded queue and return; a
+    background thread writes them in bulk INSERTs once batch_size rows are
+    waiting or flush_seconds have passed, whichever comes first
+    """
+
+    def __init__(self, max_queue: int, batch_size: int, flush_seconds: float):
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.flushed = 0
+        self.batches = 0
+        self.overflowed = 0
+        self._queue: "queue.Queue[Dict]" = queue.Queue(maxsize=max_queue)
+        # Rows per user that are queued or being written, for read-your-writes
+        self._pending: Dict[int, List[Dict]] = {}
+        self._pending_lock = threading.Lock()
+        # Held while rows are inserted, so the worker, flush_user and stop never write one twice
+        self._write_lock = threading.Lock()
+        self._accepting = False
+        self._flush_now = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stopping.clear()
+        with self._pending_lock:
+            self._accepting = True
+        self._thread = threading.Thread(target=self._run, name="chat-log-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """
+        Stop taking rows, let the worker write what it can within timeout,
+        then write whatever is still queued from the calling thread
+        """
+        with self._pending_lock:
+            self._accepting = False
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._flush_now.set()
+        self._thread.join(timeout)
+        self._drain()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, db: Session, row: Dict) -> None:
+        """
+        Queue one chat_messages row
+        When the queue is full (or the writer is not running) the row is written
+        through the caller's session instead, so a backlog slows requests down
+        rather than growing without bound
+        """
+        if not self.enqueue(row):
+            db.execute(insert(ChatMessage), [row])
+            db.commit()
+
+    def enqueue(self, row: Dict) -> bool:
+        """
+        Queue one chat_messages row if the writer takes it
+        False when the queue is full or the writer is not running - the caller writes it
+        """
+        with self._pending_lock:
+            if not self._accepting:
+                return False
+            try:
+                self._queue.put_nowait(row)
+            except queue.Full:
+                self.overflowed += 1
+                return False
+            self._pending.setdefault(row["user_id"], []).append(row)
+            return True
+
+    def flush_user(self, user_id: int) -> None:
+        """
+        Write the user's queued rows now, so a history read that follows sees
+        them with their ids; waits for a batch of theirs already being written
+        """
+        if not self.pending_rows(user_id):
+            return
+        with self._write_lock:
+            self._insert(self.pending_rows(user_id))
+
+    def pending_rows(self, user_id: int) -> List[Dict]:
+        """The user's rows that are queued or being written, oldest first"""
+        with self._pending_lock:
+            return list(self._pending.get(user_id, ()))
+
+    def stats(self) -> Dict:
+        with self._pending_lock:
+            return {
+                "running": self.running,
+                "queued": self._queue.qsize(),
+                "flushed": self.flushed,
+                "batches": self.batches,
+                "overflowed": self.overflowed,
+            }
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch:
+                with self._write_lock:
+                    # flush_user may have written some of these already
+                    self._insert(self._still_pending(batch))
+            elif self._stopping.is_set():
+                return
+
+    def _drain(self) -> None:
+        """Write every row left in the queue from the calling thread"""
+        rows: List[Dict] = []
+        while True:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        with self._write_lock:
+            self._insert(self._still_pending(rows))
+
+    def _next_batch(self) -> List[Dict]:
+        """Wait for the first row, then collect until the batch is full or the deadline passes"""
+        batch: List[Dict] = []
+        deadline = time.monotonic() + self.flush_seconds
+        while len(batch) < self.batch_size:
+            if self._flush_now.is_set() and self._queue.empty():
+                self._flush_now.clear()
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=min(remaining, 0.05)))
+            except queue.Empty:
+                continue
+        return batch
+
+    def _insert(self, rows: List[Dict]) -> None:
+        """
+        Bulk insert the rows, retrying with backoff; if every attempt fails they
+        are inserted one at a time, so only rows that can never be written are lost
+        Called with _write_lock held
+        """
+        if not rows:
+            return
+        try:
+            for attempt in range(WRITE_ATTEMPTS):
+                if self._insert_batch(rows):
+                    with self._pending_lock:
+                        self.flushed += len(rows)
+                        self.batches += 1
+                    return
+                if attempt + 1 < WRITE_ATTEMPTS:
+                    time.sleep(RETRY_BACKOFF_SECONDS * 2 ** attempt)
+            logger.warning("Bulk insert of %d chat messages kept failing, inserting them one by one", len(rows))
+            for row in rows:
+                if self._insert_batch([row]):
+                    with self._pending_lock:
+                        self.flushed += 1
+                else:
+                    logger.error("Dropped a chat message for user %s that could not be written", row["user_id"])
+        finally:
+            self._done(rows)
+
+    @staticmethod
+    def _insert_batch(rows: List[Dict]) -> bool:
+        db = SessionLocal()
+        try:
+            db.execute(insert(ChatMessage), rows)
+            db.commit()
+            return True
+        except Exception:
+            db.rollback()
+            logger.exception("Could not write %d chat messages", len(rows))
+            return False
+        finally:
+            db.close()
+
+    def _still_pending(self, rows: List[Dict]) -> List[Dict]:
+        with self._pending_lock:
+            return [row for row in rows if any(r is row for r in self._pending.get(row["user_id"], ()))]
+
+    def _done(self, rows: List[Dict]) -> None:
+        with self._pending_lock:
+            for row in rows:
+                remaining = [r for r in self._pending.get(row["user_id"], ()) if r is not row]
+                if remaining:
+                    self._pending[row["user_id"]] = remaining
+                else:
+                    self._pending.pop(row["user_id"], None)
+
+chat_log_writer = ChatLogWriter(
+    settings.CHAT_WRITE_BEHIND_QUEUE_SIZE,
+    settings.CHAT_WRITE_BEHIND_BATCH_SIZE,
+    settings.CHAT_WRITE_BEHIND_FLUSH_SECONDS,
+)
@@ -1,11 +1,32 @@
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import Optional,Dict
-from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Optional
+from datetime import datetime, timedelta, timezone
 import re
+from app.config import get_settings
 from app.models.chat import ChatMessage
 from app.models.user import User
 from app.models.transaction import Transaction, TransactionType
+from app.services.financial_snapshot import FinancialSnapshot, AsyncFinancialSnapshot
+from app.services.category_service import AsyncCategoryService
+from app.services.intent_matcher import category_matcher, MatchResult
+from app.services.time_window import TimeWindow, parse_time_window
+from app.services.balance_service import data_versions
+from app.services.response_cache import chat_response_cache
+from app.services.chat_log_writer import chat_log_writer
+from app.schemas.chat import ChatHistoryResponse
+
+settings = get_settings()
+
+# Columns of ChatHistoryResponse, for history queries that skip building ORM objects
+HISTORY_FIELDS = tuple(ChatHistoryResponse.model_fields)
+HISTORY_COLUMNS = tuple(getattr(ChatMessage, field) for field in HISTORY_FIELDS)
+
+def _period(window: Optional[TimeWindow]) -> str:
+    """How a reply names its period: " (last month)", or nothing for all time"""
+    return f" ({window.label})" if window else ""
 
 class ChatbotService:
     """Chatbot Service: handles intent recognition and response generation"""
@@ -15,90 +36,184 @@ class ChatbotService:
         message_lower = message.lower().strip()
 
         intent,response = ChatbotService._generate_response(db,user,message_lower)
-        chat_message=ChatMessage(
-            user_id=user.id,
-            user_message=message,
-            bot_response=response,
-            intent=intent
-        )
-        db.add(chat_message)
-        db.commit()
+        row = ChatbotService._log_rows(user, [message], [(intent, response)])[0]
+        if settings.CHAT_WRITE_BEHIND:
+            # The background writer commits it
+            chat_log_writer.submit(db, row)
+        else:
+            db.add(ChatMessage(**row))
+            db.commit()
 
-        return{
-            "user_message":message,
-            "bot_response":response,
-            "intent":intent,
-            "timestamp":datetime.now()
-        }
+        return ChatbotService._replies([message], [(intent, response)])[0]
     
     @staticmethod
-    def _generate_response(db: Session, user: User, message: str) -> tuple[str, str]:
+    def process_batch(db: Session, user: User, messages: List[str]) -> List[Dict[str, str]]:
+        """
+        Answer several messages in one go, replies in the same order
+        Each snapshot (all time or per window) is loaded once and shared by
+        every message that needs it, repeated questions come from the reply
+        cache, and all the ChatMessage rows go in with one INSERT and one commit
+        """
+        snapshots: Dict = {}
+        replies = [
+            ChatbotService._generate_response(db, user, message.lower().strip(), snapshots)
+            for message in messages
+        ]
+
+        rows = ChatbotService._log_rows(user, messages, replies)
+        if settings.CHAT_WRITE_BEHIND:
+            for row in rows:
+                chat_log_writer.submit(db, row)
+        else:
+            db.execute(insert(ChatMessage), rows)
+            db.commit()
+
+        return ChatbotService._replies(messages, replies)
+
+    @staticmethod
+    def _log_rows(user: User, messages: List[str], replies: List[tuple]) -> List[Dict]:
+        """
+        chat_messages rows of the messages and their (intent, response) replies
+        created_at is always stamped here, in UTC, whichever path writes the row,
+        so history and the archive order every message by the same clock; a
+        batch is stamped a microsecond apart to keep the order it was sent in
+        """
+        now = datetime.now(timezone.utc)
+        return [
+            {
+                "user_id": user.id,
+                "user_message": message,
+                "bot_response": response,
+                "intent": intent,
+                "created_at": now + timedelta(microseconds=i)
+            }
+            for i, (message, (intent, response)) in enumerate(zip(messages, replies))
+        ]
+
+    @staticmethod
+    def _replies(messages: List[str], replies: List[tuple]) -> List[Dict]:
+        timestamp = datetime.now()
+        return [
+            {"user_message": message, "bot_response": response, "intent": intent, "timestamp": timestamp}
+            for message, (intent, response) in zip(messages, replies)
+        ]
+    
+    @staticmethod
+    def _generate_response(db: Session, user: User, message: str,
+                           snapshots: Optional[Dict] = None) -> tuple[str, str]:
         """
         Detect intent and generate response
+        Intents are scored by the compiled matcher in one pass over the message,
+        after any time expression ("last month", "in March") is taken out of it
+        snapshots: shared across a batch, see process_batch
         Returns: (intent, response)
         """
         
+        window, message = parse_time_window(message)
+        match = category_matcher.get(db, user.id).match(message)
+        if match.intent is None:
+            # Default: Didn't understand
+            return ChatbotService._handle_unknown(message)
+        
+        # Replies only change when the user's data does, so they are cached per
+        # data version - a repeated question skips the aggregation entirely.
+        # The version comes from memory (the snapshot query reads it), never
+        # from a query of its own; while it is unknown replies are not cached
+        key = ChatbotService._reply_key(user, match, window)
+        version = data_versions.get(user.id)
+        cached = ChatbotService._cached_reply(key, version)
+        if cached:
+            return cached
+        
+        result = ChatbotService._dispatch(db, user, match, window, snapshots)
+        ChatbotService._cache_reply(key, version, result)
+        return result
+
+    @staticmethod
+    def _reply_key(user: User, match: MatchResult, window: Optional[TimeWindow]) -> tuple:
+        entities = (match.category,) if match.intent == "spending" else ()
+        period = window.key if window else None
+        return (user.id, match.intent, entities, period)
+
+    @staticmethod
+    def _cached_reply(key: tuple, version: Optional[int]) -> Optional[tuple]:
+        if version is None:
+            return None
+        return chat_response_cache.get((*key, version))
+
+    @staticmethod
+    def _cache_reply(key: tuple, version: Optional[int], result: tuple) -> None:
+        """Cache a reply under the version read before it was built, else the one its snapshot read"""
+        if version is None:
+            version = data_versions.get(key[0])
+        if version is not None:
+            chat_response_cache.put((*key, version), result)
+    
+    @staticmethod
+    def _dispatch(db: Session, user: User, match: MatchResult, window: Optional[TimeWindow] = None,
+                  snapshots: Optional[Dict] = None) -> tuple[str, str]:
+        """Run the handler for the matched intent, limited to the window's dates when given"""
+        intent = match.intent
+        
+        # Intent 4: Recent transactions
+        if intent == "recent_transactions":
+            return ChatbotService._handle_recent_transactions(db, user, window)
+        
+        # Intent 6: Biggest expense
+        if intent == "biggest_expense":
+            return ChatbotService._handle_biggest_expense(db, user, window)
+        
+        return ChatbotService._answer(match, ChatbotService._snapshot(db, user, window, snapshots))
+
+    @staticmethod
+    def _answer(match: MatchResult, snapshot: FinancialSnapshot) -> tuple[str, str]:
+        """
+        Run the handler of an aggregate intent
+        They all read from one snapshot, loaded in a single query (and only
+        once per batch when snapshots is given)
+        """
+        intent = match.intent
+        
         # Intent 1: Balance/Summary
-        if any(word in message for word in ["balance", "summary", "total", "overview"]):
-            return ChatbotService._handle_balance(db, user)
+        if intent == "balance_query":
+            return ChatbotService._handle_balance(snapshot)
         
         # Intent 2: Spending by category
-        if "spend" in message or "spent" in message:
-            category = ChatbotService._extract_category(message)
-            if category:
-                return ChatbotService._handle_category_spending(db, user, category)
+        if intent == "spending":
+            if match.category:
+                return ChatbotService._handle_category_spending(snapshot, match.category)
             else:
-                return ChatbotService._handle_total_spending(db, user)
+                return ChatbotService._handle_total_spending(snapshot)
         
         # Intent 3: Income queries
-        if "income" in message or "earned" in message or "salary" in message:
-            return ChatbotService._handle_income(db, user)
-        
-        # Intent 4: Recent transactions
-        if "recent" in message or "last" in message or "latest" in message:
-            return ChatbotService._handle_recent_transactions(db, user)
+        if intent == "income_query":
+            return ChatbotService._handle_income(snapshot)
         
         # Intent 5: Savings advice
-        if any(word in message for word in ["save", "saving", "tips", "advice", "recommend"]):
-            return ChatbotService._handle_savings_advice(db, user)
-        
-        # Intent 6: Biggest expense
-        if "biggest" in message or "largest" in message or "most expensive" in message:
-            return ChatbotService._handle_biggest_expense(db, user)
+        if intent == "savings_advice":
+            return ChatbotService._handle_savings_advice(snapshot)
         
-        # Default: Didn't understand
-        return ChatbotService._handle_unknown(message)
+        raise ValueError(f"No handler for intent {intent!r}")
     
     @staticmethod
-    def _extract_category(message: str) -> Optional[str]:
-        """
-        Extract category from message
-        """
-        categories = ["food", "rent", "transport", "entertainment", "utilities", 
-                     "shopping", "healthcare", "salary", "freelance"]
-        
-        for category in categories:
-            if category in message:
-                return category.capitalize()
-        return None
+    def _snapshot(db: Session, user: User, window: Optional[TimeWindow], snapshots: Optional[Dict]) -> FinancialSnapshot:
+        """The user's snapshot for the window, memoized in snapshots when given"""
+        if snapshots is None:
+            return FinancialSnapshot.load(db, user.id, window)
+        key = window.key if window else None
+        if key not in snapshots:
+            snapshots[key] = FinancialSnapshot.load(db, user.id, window)
+        return snapshots[key]
     
     @staticmethod
-    def _handle_balance(db: Session, user: User) -> tuple[str, str]:
+    def _handle_balance(snapshot: FinancialSnapshot) -> tuple[str, str]:
         """Handle balance/summary queries"""
-        total_income = db.query(func.sum(Transaction.amount)).filter(
-            Transaction.user_id == user.id,
-            Transaction.type == TransactionType.INCOME
-        ).scalar() or 0.0
-        
-        total_expenses = db.query(func.sum(Transaction.amount)).filter(
-            Transaction.user_id == user.id,
-            Transaction.type == TransactionType.EXPENSE
-        ).scalar() or 0.0
-        
-        net_balance = total_income - total_expenses
+        total_income = snapshot.total_income
+        total_expenses = snapshot.total_expenses
+        net_balance = snapshot.net_balance
         
         response = (
-            f"🧾**Financial Summary**\n\n"
+            f"🧾**Financial Summary{_period(snapshot.window)}**\n\n"
             f"💰 Total Income: ${total_income:,.2f}\n"
             f"💸 Total Expenses: ${total_expenses:,.2f}\n"
             f"𓍝 Net Balance: ${net_balance:,.2f}\n\n"
@@ -114,26 +229,16 @@ class ChatbotService:
         return ("balance_query", response)
     
     @staticmethod
-    def _handle_category_spending(db: Session, user: User, category: str) -> tuple[str, str]:
+    def _handle_category_spending(snapshot: FinancialSnapshot, category: str) -> tuple[str, str]:
         """Handle spending by specific category"""
-        total = db.query(func.sum(Transaction.amount)).filter(
-            Transaction.user_id == user.id,
-            Transaction.type == TransactionType.EXPENSE,
-            Transaction.category.ilike(f"%{category}%")
-        ).scalar() or 0.0
-        
-        count = db.query(Transaction).filter(
-            Transaction.user_id == user.id,
-            Transaction.type == TransactionType.EXPENSE,
-            Transaction.category.ilike(f"%{category}%")
-        ).count()
+        total, count = snapshot.category_spending(category)
         
         if count == 0:
-            response = f"You haven't recorded any expenses in the '{category}' category yet."
+            response = f"You haven't recorded any expenses in the '{category}' category{_period(snapshot.window) or ' yet'}."
         else:
             avg = total / count
             response = (
-                f"📊 **{category} Spending**\n\n"
+                f"📊 **{category} Spending{_period(snapshot.window)}**\n\n"
                 f"💸 Total: ${total:,.2f}\n"
                 f"📝 Transactions: {count}\n"
                 f"📊 Average: ${avg:,.2f} per transaction"
@@ -142,23 +247,14 @@ class ChatbotService:
         return ("category_spending", response)
     
     @staticmethod
-    def _handle_total_spending(db: Session, user: User) -> tuple[str, str]:
+    def _handle_total_spending(snapshot: FinancialSnapshot) -> tuple[str, str]:
         """Handle total spending queries"""
-        total_expenses = db.query(func.sum(Transaction.amount)).filter(
-            Transaction.user_id == user.id,
-            Transaction.type == TransactionType.EXPENSE
-        ).scalar() or 0.0
+        total_expenses = snapshot.total_expenses
         
         # Top 3 categories
-        top_categories = db.query(
-            Transaction.category,
-            func.sum(Transaction.amount).label('total')
-        ).filter(
-            Transaction.user_id == user.id,
-            Transaction.type == TransactionType.EXPENSE
-        ).group_by(Transaction.category).order_by(func.sum(Transaction.amount).desc()).limit(3).all()
+        top_categories = snapshot.top_expense_categories(3)
         
-        response = f"💸 **Total Expenses: ${total_expenses:,.2f}**\n\n"
+        response = f"💸 **Total Expenses{_period(snapshot.window)}: ${total_expenses:,.2f}**\n\n"
         
         if top_categories:
             response += "Top spending categories:\n"
@@ -169,20 +265,13 @@ class ChatbotService:
         return ("total_spending", response)
     
     @staticmethod
-    def _handle_income(db: Session, user: User) -> tuple[str, str]:
+    def _handle_income(snapshot: FinancialSnapshot) -> tuple[str, str]:
         """Handle income queries"""
-        total_income = db.query(func.sum(Transaction.amount)).filter(
-            Transaction.user_id == user.id,
-            Transaction.type == TransactionType.INCOME
-        ).scalar() or 0.0
-        
-        count = db.query(Transaction).filter(
-            Transaction.user_id == user.id,
-            Transaction.type == TransactionType.INCOME
-        ).count()
+        total_income = snapshot.total_income
+        count = snapshot.income_count
         
         response = (
-            f"💰 **Income Summary**\n\n"
+            f"💰 **Income Summary{_period(snapshot.window)}**\n\n"
             f"📈 Total Income: ${total_income:,.2f}\n"
             f"📝 Income Transactions: {count}"
         )
@@ -190,16 +279,25 @@ class ChatbotService:
         return ("income_query", response)
     
     @staticmethod
-    def _handle_recent_transactions(db: Session, user: User) -> tuple[str, str]:
+    def _handle_recent_transactions(db: Session, user: User, window: Optional[TimeWindow] = None) -> tuple[str, str]:
         """Handle recent transactions queries"""
-        recent = db.query(Transaction).filter(
+        recent = db.execute(ChatbotService._recent_statement(user, window)).scalars().all()
+        return ChatbotService._recent_reply(recent, window)
+
+    @staticmethod
+    def _recent_statement(user: User, window: Optional[TimeWindow]):
+        return ChatbotService._in_window(select(Transaction).where(
             Transaction.user_id == user.id
-        ).order_by(Transaction.date.desc()).limit(5).all()
-        
-        if not recent:
+        ), window).order_by(Transaction.date.desc()).limit(5)
+
+    @staticmethod
+    def _recent_reply(recent: List[Transaction], window: Optional[TimeWindow]) -> tuple[str, str]:
+        if not recent and window:
+            response = f"You don't have any transactions{_period(window)}."
+        elif not recent:
             response = "You don't have any transactions yet. Start adding some!"
         else:
-            response = "📋 **Recent Transactions:**\n\n"
+            response = f"📋 **Recent Transactions{_period(window)}:**\n\n"
             for t in recent:
                 emoji = "📈" if t.type == TransactionType.INCOME else "📉"
                 response += f"{emoji} ${t.amount:,.2f} - {t.category} ({t.description or 'No description'})\n"
@@ -207,24 +305,19 @@ class ChatbotService:
         return ("recent_transactions", response)
     
     @staticmethod
-    def _handle_savings_advice(db: Session, user: User) -> tuple[str, str]:
+    def _handle_savings_advice(snapshot: FinancialSnapshot) -> tuple[str, str]:
         """Handle savings advice queries"""
-        total_income = db.query(func.sum(Transaction.amount)).filter(
-            Transaction.user_id == user.id,
-            Transaction.type == TransactionType.INCOME
-        ).scalar() or 0.0
-        
-        total_expenses = db.query(func.sum(Transaction.amount)).filter(
-            Transaction.user_id == user.id,
-            Transaction.type == TransactionType.EXPENSE
-        ).scalar() or 0.0
+        total_income = snapshot.total_income
+        total_expenses = snapshot.total_expenses
         
+        if total_income == 0 and snapshot.window:
+            return ("savings_advice", f"You have no income recorded{_period(snapshot.window)}, so I can't work out a savings rate for it.")
         if total_income == 0:
             return ("savings_advice", "Add some income transactions first so I can give you personalized advice!")
         
         savings_rate = ((total_income - total_expenses) / total_income * 100) if total_income > 0 else 0
         
-        response = "💡 **Savings Tips:**\n\n"
+        response = f"💡 **Savings Tips{_period(snapshot.window)}:**\n\n"
         
         if savings_rate >= 20:
             response += f"🌟 Excellent! You're saving {savings_rate:.1f}% of your income. Keep it up!"
@@ -236,34 +329,39 @@ class ChatbotService:
             response += f"🚨 You're spending more than you earn! Consider cutting unnecessary expenses."
         
         # Find biggest expense category
-        top_category = db.query(
-            Transaction.category,
-            func.sum(Transaction.amount).label('total')
-        ).filter(
-            Transaction.user_id == user.id,
-            Transaction.type == TransactionType.EXPENSE
-        ).group_by(Transaction.category).order_by(func.sum(Transaction.amount).desc()).first()
+        top_category = snapshot.top_expense_categories(1)
         
         if top_category:
-            cat_name, cat_total = top_category
+            cat_name, cat_total = top_category[0]
             percentage = (cat_total / total_income * 100) if total_income > 0 else 0
             response += f"\n\n💰 Your biggest expense is {cat_name} (${cat_total:,.2f}, {percentage:.1f}% of income). Consider reducing this category to boost savings!"
         
         return ("savings_advice", response)
     
     @staticmethod
-    def _handle_biggest_expense(db: Session, user: User) -> tuple[str, str]:
-        """Handle biggest expense queries"""
-        biggest = db.query(Transaction).filter(
+    def _handle_biggest_expense(db: Session, user: User, window: Optional[TimeWindow] = None) -> tuple[str, str]:
+        """
+        Handle biggest expense queries
+        All time reads the top of ix_transactions_user_type_amount; a window
+        range-scans ix_transactions_user_type_date and sorts only its rows
+        """
+        biggest = db.execute(ChatbotService._biggest_statement(user, window)).scalars().first()
+        return ChatbotService._biggest_reply(biggest, window)
+
+    @staticmethod
+    def _biggest_statement(user: User, window: Optional[TimeWindow]):
+        return ChatbotService._in_window(select(Transaction).where(
             Transaction.user_id == user.id,
             Transaction.type == TransactionType.EXPENSE
-        ).order_by(Transaction.amount.desc()).first()
-        
+        ), window).order_by(Transaction.amount.desc()).limit(1)
+
+    @staticmethod
+    def _biggest_reply(biggest: Optional[Transaction], window: Optional[TimeWindow]) -> tuple[str, str]:
         if not biggest:
-            response = "You don't have any expenses recorded yet."
+            response = f"You don't have any expenses recorded{_period(window) or ' yet'}."
         else:
             response = (
-                f"💸 **Your Biggest Expense:**\n\n"
+                f"💸 **Your Biggest Expense{_period(window)}:**\n\n"
                 f"Amount: ${biggest.amount:,.2f}\n"
                 f"Category: {biggest.category}\n"
                 f"Description: {biggest.description or 'No description'}\n"
@@ -272,6 +370,13 @@ class ChatbotService:
         
         return ("biggest_expense", response)
     
+    @staticmethod
+    def _in_window(query, window: Optional[TimeWindow]):
+        """Bound a transactions select() to the window's dates"""
+        if window is None:
+            return query
+        return query.where(Transaction.date >= window.start, Transaction.date < window.end)
+    
     @staticmethod
     def _handle_unknown(message: str) -> tuple[str, str]:
         """Handle unrecognized queries"""
@@ -283,18 +388,108 @@ class ChatbotService:
             "📋 See **recent** transactions\n"
             "💡 Get **savings tips** and advice\n"
             "💸 Find your **biggest expense**\n\n"
+            "Add a period like 'this month', 'last week', 'in March' or 'last 90 days' to narrow any of these.\n"
             "Try asking me something like: 'What's my balance?' or 'How much did I spend on food?'"
         )
         
         return ("unknown", response)
     
     @staticmethod
-    def get_chat_history(db: Session, user: User, limit: int = 20) -> list:
+    def get_chat_history(db: Session, user: User, limit: int = 20, columns=None) -> list:
         """
         Get user's chat history
+        Messages still in the write-behind buffer are written first, so a reply
+        just sent is always listed (with its id) without waiting for the flush
+        Pass columns (e.g. HISTORY_COLUMNS) to get row tuples instead of ORM objects
         """
-        messages = db.query(ChatMessage).filter(
+        chat_log_writer.flush_user(user.id)
+        result = db.execute(ChatbotService._history_statement(user, limit, columns))
+        return result.all() if columns else result.scalars().all()
+
+    @staticmethod
+    def _history_statement(user: User, limit: int, columns=None):
+        return select(*(columns or (ChatMessage,))).where(
             ChatMessage.user_id == user.id
-        ).order_by(ChatMessage.created_at.desc()).limit(limit).all()
-        
-        return messages
+        ).order_by(ChatMessage.created_at.desc()).limit(limit)
+
+class AsyncChatbotService:
+    """
+    Async version of ChatbotService, see AsyncTransactionService
+    Matching, the reply cache and the handlers are shared; the snapshot,
+    transaction and chat log statements are awaited on the AsyncSession
+    """
+    @staticmethod
+    async def process_message(db: AsyncSession, user: User, message: str) -> Dict[str, str]:
+        """Same contract as ChatbotService.process_message"""
+        replies = [await AsyncChatbotService._generate_response(db, user, message.lower().strip())]
+        await AsyncChatbotService._log(db, ChatbotService._log_rows(user, [message], replies))
+        return ChatbotService._replies([message], replies)[0]
+
+    @staticmethod
+    async def process_batch(db: AsyncSession, user: User, messages: List[str]) -> List[Dict[str, str]]:
+        """Same contract as ChatbotService.process_batch"""
+        snapshots: Dict = {}
+        replies = [
+            await AsyncChatbotService._generate_response(db, user, message.lower().strip(), snapshots)
+            for message in messages
+        ]
+        await AsyncChatbotService._log(db, ChatbotService._log_rows(user, messages, replies))
+        return ChatbotService._replies(messages, replies)
+
+    @staticmethod
+    async def _log(db: AsyncSession, rows: List[Dict]) -> None:
+        """Hand the rows to the write-behind writer, writing whatever it doesn't take in one INSERT"""
+        if settings.CHAT_WRITE_BEHIND:
+            rows = [row for row in rows if not chat_log_writer.enqueue(row)]
+        if rows:
+            await db.execute(insert(ChatMessage), rows)
+            await db.commit()
+
+    @staticmethod
+    async def _generate_response(db: AsyncSession, user: User, message: str,
+                                 snapshots: Optional[Dict] = None) -> tuple[str, str]:
+        """Same contract as ChatbotService._generate_response"""
+        window, message = parse_time_window(message)
+        await AsyncCategoryService.warm(db)
+        match = category_matcher.for_user(user.id).match(message)
+        if match.intent is None:
+            return ChatbotService._handle_unknown(message)
+
+        key = ChatbotService._reply_key(user, match, window)
+        version = data_versions.get(user.id)
+        cached = ChatbotService._cached_reply(key, version)
+        if cached:
+            return cached
+
+        result = await AsyncChatbotService._dispatch(db, user, match, window, snapshots)
+        ChatbotService._cache_reply(key, version, result)
+        return result
+
+    @staticmethod
+    async def _dispatch(db: AsyncSession, user: User, match: MatchResult, window: Optional[TimeWindow] = None,
+                        snapshots: Optional[Dict] = None) -> tuple[str, str]:
+        """Same contract as ChatbotService._dispatch"""
+        if match.intent == "recent_transactions":
+            result = await db.execute(ChatbotService._recent_statement(user, window))
+            return ChatbotService._recent_reply(result.scalars().all(), window)
+
+        if match.intent == "biggest_expense":
+            result = await db.execute(ChatbotService._biggest_statement(user, window))
+            return ChatbotService._biggest_reply(result.scalars().first(), window)
+
+        if snapshots is None:
+            snapshot = await AsyncFinancialSnapshot.load(db, user.id, window)
+        else:
+            key = window.key if window else None
+            if key not in snapshots:
+                snapshots[key] = await AsyncFinancialSnapshot.load(db, user.id, window)
+            snapshot = snapshots[key]
+        return ChatbotService._answer(match, snapshot)
+
+    @staticmethod
+    async def get_chat_history(db: AsyncSession, user: User, limit: int = 20, columns=None) -> list:
+        """Same contract as ChatbotService.get_chat_history, the query awaited"""
+        if chat_log_writer.pending_rows(user.id):
+            await run_in_threadpool(chat_log_writer.flush_user, user.id)
+        result = await db.execute(ChatbotService._history_statement(user, limit, columns))
+        return result.all() if columns else result.scalars().all()
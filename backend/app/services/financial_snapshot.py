@@ -0,0 +1,151 @@
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Optional, Tuple
+from app.models.balance import UserCategoryBalance
+from app.models.transaction import Transaction, TransactionType
+from app.services.balance_service import BalanceService, data_versions
+from app.services.category_service import CategoryService, AsyncCategoryService
+from app.services.time_window import TimeWindow
+
+class FinancialSnapshot:
+    """
+    Everything the chatbot handlers need to know about a user's totals
+    Loaded with one query over the per-category aggregates (or over the
+    window's transactions), then read in memory
+    """
+
+    def __init__(self, categories: Dict[Tuple[TransactionType, str], Tuple[float, int]],
+                 window: Optional[TimeWindow] = None, user_id: Optional[int] = None):
+        # (type, category) -> (total, count)
+        self.categories = categories
+        # Date range the totals cover, None for all time
+        self.window = window
+        # Whose totals these are - category names are read the way this user means them
+        self.user_id = user_id
+
+        self.total_income = 0.0
+        self.total_expenses = 0.0
+        self.income_count = 0
+        self.expense_count = 0
+        for (t_type, _), (total, count) in categories.items():
+            if t_type == TransactionType.INCOME:
+                self.total_income += total
+                self.income_count += count
+            else:
+                self.total_expenses += total
+                self.expense_count += count
+
+    @staticmethod
+    def load(db: Session, user_id: int, window: Optional[TimeWindow] = None) -> "FinancialSnapshot":
+        """Build the snapshot for a user in a single round trip"""
+        if window is not None:
+            return FinancialSnapshot.load_window(db, user_id, window)
+
+        CategoryService.warm(db)
+        mark = data_versions.mark()
+        rows = db.execute(FinancialSnapshot._totals_statement(user_id)).all()
+        FinancialSnapshot._remember_version(user_id, rows, mark)
+        names = {category_id: CategoryService.name(db, category_id) for category_id in {row[1] for row in rows}}
+        return FinancialSnapshot._from_rows(rows, names, None, user_id)
+
+    @staticmethod
+    def load_window(db: Session, user_id: int, window: TimeWindow) -> "FinancialSnapshot":
+        """
+        Totals of the transactions dated inside the window, grouped in the database
+        by category id. Listing both types lets the date bound seek
+        ix_transactions_user_type_date once per type, so the cost follows the
+        window size, not the history
+        """
+        CategoryService.warm(db)
+        rows = db.execute(FinancialSnapshot._window_statement(user_id, window)).all()
+        names = {category_id: CategoryService.name(db, category_id) for category_id in {row[1] for row in rows}}
+        return FinancialSnapshot._from_rows(rows, names, window, user_id)
+
+    @staticmethod
+    def _totals_statement(user_id: int):
+        """The user's non-empty per-category aggregates, with their data version"""
+        return select(
+            UserCategoryBalance.type,
+            UserCategoryBalance.category_id,
+            UserCategoryBalance.total,
+            UserCategoryBalance.count,
+            # The data version rides along, so the chatbot learns it without a query of its own
+            BalanceService.version_column(user_id)
+        ).where(
+            UserCategoryBalance.user_id == user_id,
+            # Emptied categories keep their row at zero - ix_user_category_balances_user_nonempty
+            # leaves them out; a literal 0, as SQLite only uses a partial index whose WHERE it can match
+            UserCategoryBalance.count > literal_column("0")
+        )
+
+    @staticmethod
+    def _window_statement(user_id: int, window: TimeWindow):
+        return select(
+            Transaction.type,
+            Transaction.category_id,
+            func.sum(Transaction.amount),
+            func.count(Transaction.id)
+        ).where(
+            Transaction.user_id == user_id,
+            Transaction.type.in_(list(TransactionType)),
+            Transaction.date >= window.start,
+            Transaction.date < window.end
+        ).group_by(Transaction.type, Transaction.category_id)
+
+    @staticmethod
+    def _remember_version(user_id: int, rows: List, mark: int) -> None:
+        if rows and rows[0].data_version is not None:
+            data_versions.remember(user_id, rows[0].data_version, mark)
+
+    @staticmethod
+    def _from_rows(rows: List, names: Dict[int, str], window: Optional[TimeWindow],
+                   user_id: int) -> "FinancialSnapshot":
+        """
+        Snapshot from (type, category id, total, count, ...) rows
+        Rows are per category id, so every spelling of a category is already in one
+        """
+        return FinancialSnapshot(
+            {(row[0], names[row[1]]): (row[2], row[3]) for row in rows}, window, user_id
+        )
+
+    @property
+    def net_balance(self) -> float:
+        return self.total_income - self.total_expenses
+
+    def category_spending(self, category: str) -> Tuple[float, int]:
+        """
+        Total and count of expenses in the category the given name means to the user
+        Matched by category id, so any case or alias of the name counts ("groceries" is Food)
+        """
+        total, count = 0.0, 0
+        for (t_type, name), (cat_total, cat_count) in self.categories.items():
+            if t_type == TransactionType.EXPENSE and CategoryService.same(name, category, self.user_id):
+                total += cat_total
+                count += cat_count
+        return (total, count)
+
+    def top_expense_categories(self, limit: int = 3) -> List[Tuple[str, float]]:
+        """Expense categories with the highest totals, biggest first"""
+        expenses = [
+            (name, total) for (t_type, name), (total, _) in self.categories.items()
+            if t_type == TransactionType.EXPENSE
+        ]
+        expenses.sort(key=lambda item: item[1], reverse=True)
+        return expenses[:limit]
+
+class AsyncFinancialSnapshot:
+    """FinancialSnapshot.load for an AsyncSession - the same statements, awaited"""
+
+    @staticmethod
+    async def load(db: AsyncSession, user_id: int, window: Optional[TimeWindow] = None) -> FinancialSnapshot:
+        """Same contract as FinancialSnapshot.load"""
+        await AsyncCategoryService.warm(db)
+        if window is not None:
+            rows = (await db.execute(FinancialSnapshot._window_statement(user_id, window))).all()
+        else:
+            mark = data_versions.mark()
+            rows = (await db.execute(FinancialSnapshot._totals_statement(user_id))).all()
+            FinancialSnapshot._remember_version(user_id, rows, mark)
+        names = {category_id: await AsyncCategoryService.name(db, category_id) for category_id in {row[1] for row in rows}}
+        return FinancialSnapshot._from_rows(rows, names, window, user_id)
@@ -0,0 +1,179 @@
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.services.category_service import CategoryService, DEFAULT_ALIASES, category_cache, normalize
+
+settings = get_settings()
+
+# Keywords per intent - dict order is the tie-break priority when two intents score the same
+INTENT_KEYWORDS: Dict[str, List[str]] = {
+    "balance_query": ["balance", "balances", "summary", "total", "totals", "overview"],
+    "spending": ["spend", "spent", "spending", "spends"],
+    "income_query": ["income", "earned", "salary"],
+    "recent_transactions": ["recent", "last", "latest"],
+    "savings_advice": ["save", "saving", "savings", "tips", "advice", "recommend", "recommendation", "recommendations"],
+    "biggest_expense": ["biggest", "largest", "most expensive"],
+}
+
+# Category keyword -> category display name, for the default categories (no database needed)
+# Requests use CategoryMatcher, which adds the curated categories' aliases and the user's own
+CATEGORY_KEYWORDS: Dict[str, str] = {
+    keyword: name for name, aliases in DEFAULT_ALIASES.items() for keyword in (normalize(name), *aliases)
+}
+
+AMOUNT_PATTERN = r"\$?\d[\d,]*(?:\.\d+)?"
+
+class MatchResult:
+    """Everything the matcher found in one message"""
+
+    def __init__(self, intent: Optional[str], scores: Dict[str, int], categories: List[str], amounts: List[float]):
+        self.intent = intent
+        self.scores = scores
+        self.categories = categories
+        self.amounts = amounts
+
+    @property
+    def category(self) -> Optional[str]:
+        """First category mentioned in the message"""
+        return self.categories[0] if self.categories else None
+
+class IntentMatcher:
+    """
+    Finds intent keywords, categories and amounts in a single regex pass
+    All keywords are compiled into one trie-shaped pattern anchored on word
+    boundaries, so matching cost stays flat as keywords are added and
+    "last" no longer matches inside "atlas"
+    """
+
+    def __init__(self, intents: Dict[str, List[str]], categories: Dict[str, str]):
+        self.priority = {intent: rank for rank, intent in enumerate(intents)}
+
+        # keyword -> what it means; one word can be both an intent keyword and a category
+        self.lookup: Dict[str, List[Tuple[str, str]]] = {}
+        for intent, words in intents.items():
+            for word in words:
+                self.lookup.setdefault(word.lower(), []).append(("intent", intent))
+        for keyword, category in categories.items():
+            self.lookup.setdefault(normalize(keyword), []).append(("category", category))
+
+        keywords = _trie_pattern(self.lookup.keys())
+        self.pattern = re.compile(
+            rf"(?P<keyword>\b{keywords}\b)|(?P<amount>{AMOUNT_PATTERN})",
+            re.IGNORECASE
+        )
+
+    def match(self, message: str) -> MatchResult:
+        """Scan the message once and score every intent it mentions"""
+        scores: Counter = Counter()
+        categories: List[str] = []
+        amounts: List[float] = []
+
+        for found in self.pattern.finditer(message):
+            if found.lastgroup == "amount":
+                try:
+                    amounts.append(float(found.group().lstrip("$").replace(",", "")))
+                except ValueError:
+                    pass
+                continue
+
+            keyword = " ".join(found.group().lower().split())
+            for kind, value in self.lookup.get(keyword, ()):
+                if kind == "intent":
+                    scores[value] += 1
+                elif value not in categories:
+                    categories.append(value)
+
+        intent = None
+        if scores:
+            intent = min(scores, key=lambda name: (-scores[name], self.priority[name]))
+        return MatchResult(intent, dict(scores), categories, amounts)
+
+def _trie_pattern(words) -> str:
+    """
+    Build a regex alternation shaped like a trie of the given words
+    Shared prefixes are matched once, so the regex engine never retries
+    every keyword at every position
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return _node_pattern(trie)
+
+def _node_pattern(node: dict) -> str:
+    ends_here = "" in node
+    branches = [
+        (r"\s+" if char == " " else re.escape(char)) + _node_pattern(child)
+        for char, child in sorted(node.items()) if char
+    ]
+    if not branches:
+        return ""
+    if len(branches) == 1 and not ends_here:
+        return branches[0]
+    group = "(?:" + "|".join(branches) + ")"
+    return group + "?" if ends_here else group
+
+class CategoryMatcher:
+    """
+    IntentMatcher over the category names and aliases a user's messages can use:
+    the curated ones in CategoryService's cache plus the user's own, so "dining"
+    is found as Food and a user's own "Gym" is found - for that user only
+    Users without categories of their own share one matcher; the others get one
+    each, kept for the max_users most recently used
+    A matcher is recompiled only when its aliases have changed since it was built
+    """
+
+    def __init__(self, intents: Dict[str, List[str]], max_users: int):
+        self.intents = intents
+        self.max_users = max_users
+        self._shared: Tuple[Optional[int], Optional[IntentMatcher]] = (None, None)
+        self._users: "OrderedDict[int, Tuple[Tuple[int, int], IntentMatcher]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, user_id: int) -> IntentMatcher:
+        CategoryService.warm(db)
+        return self.for_user(user_id)
+
+    def for_user(self, user_id: int) -> IntentMatcher:
+        """The user's matcher, from the category cache alone - warm it first"""
+        if not category_cache.has_own(user_id):
+            return self._shared_matcher()
+
+        version = (category_cache.version(None), category_cache.version(user_id))
+        with self._lock:
+            built = self._users.get(user_id)
+            if built is not None:
+                self._users.move_to_end(user_id)
+        if built is not None and built[0] == version:
+            return built[1]
+
+        # Compiled outside the lock; two requests racing for one user both build, one wins
+        matcher = IntentMatcher(self.intents, {**CATEGORY_KEYWORDS, **CategoryService.keywords(user_id)})
+        with self._lock:
+            self._users[user_id] = (version, matcher)
+            self._users.move_to_end(user_id)
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+        return matcher
+
+    def _shared_matcher(self) -> IntentMatcher:
+        """The matcher over the curated categories only"""
+        version, matcher = self._shared
+        if version != category_cache.version(None):
+            with self._lock:
+                version, matcher = self._shared
+                if version != category_cache.version(None):
+                    version = category_cache.version(None)
+                    matcher = IntentMatcher(self.intents, {**CATEGORY_KEYWORDS, **CategoryService.keywords(None)})
+                    self._shared = (version, matcher)
+        return matcher
+
+# Compiled once at import - the default categories only
+default_matcher = IntentMatcher(INTENT_KEYWORDS, CATEGORY_KEYWORDS)
+# Shared by every request
+category_matcher = CategoryMatcher(INTENT_KEYWORDS, settings.CATEGORY_MATCHER_CACHE_USERS)
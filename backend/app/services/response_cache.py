@@ -0,0 +1,65 @@
+import sys
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+from app.config import get_settings
+
+settings = get_settings()
+
+class ResponseCache:
+    """
+    LRU cache of rendered chatbot replies, capped by memory instead of entry count
+    Keys carry the user's data version, so a write makes the old entries
+    unreachable and they age out of the LRU on their own
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Tuple[str, str], int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Tuple[str, str]]:
+        """Cached (intent, response) for the key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Tuple[str, str]) -> None:
+        size = sys.getsizeof(key) + sum(sys.getsizeof(part) for part in value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size_bytes -= old[1]
+            self._entries[key] = (value, size)
+            self.size_bytes += size
+            while self.size_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.size_bytes -= evicted_size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self.size_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+chat_response_cache = ResponseCache(settings.CHAT_RESPONSE_CACHE_MAX_BYTES)
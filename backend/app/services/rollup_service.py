@@ -0,0 +1,112 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, extract
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+from app.models.rollup import TransactionRollup, RollupPeriod
+from app.models.transaction import Transaction, TransactionType
+from app.utils.aggregates import increment_row, increment_row_async
+
+# (type, category id, transaction date) -> [amount, count]
+RollupDeltas = Dict[Tuple[TransactionType, int, datetime], List]
+
+class RollupService:
+    """Maintains the month/quarter/year rollups and serves the analytics reads"""
+
+    @staticmethod
+    def period_start(period: RollupPeriod, day: date) -> date:
+        """First day of the month, quarter or year that contains day"""
+        if period == RollupPeriod.MONTH:
+            return date(day.year, day.month, 1)
+        if period == RollupPeriod.QUARTER:
+            return date(day.year, 3 * ((day.month - 1) // 3) + 1, 1)
+        return date(day.year, 1, 1)
+
+    @staticmethod
+    def apply(db: Session, user_id: int, deltas: RollupDeltas) -> None:
+        """
+        Add transaction changes to the rollups (negative amount/count removes them)
+        Changes landing in the same period row are merged first, so a bulk
+        chunk costs one update per touched row
+        Runs inside the caller's DB transaction - the caller commits
+        """
+        for keys, row_deltas in RollupService._increments(user_id, deltas):
+            increment_row(db, TransactionRollup, keys, row_deltas)
+
+    @staticmethod
+    def _increments(user_id: int, deltas: RollupDeltas) -> List[Tuple[Dict, Dict]]:
+        """(keys, deltas) of the rollup rows apply() adds to, merged per row"""
+        merged: Dict[Tuple[RollupPeriod, date, TransactionType, int], List] = {}
+        for (t_type, category_id, when), (amount, count) in deltas.items():
+            for period in RollupPeriod:
+                key = (period, RollupService.period_start(period, when), t_type, category_id)
+                delta = merged.setdefault(key, [0.0, 0])
+                delta[0] += amount
+                delta[1] += count
+
+        return [
+            ({"user_id": user_id, "period": period, "period_start": start, "type": t_type, "category_id": category_id},
+             {"total": amount, "count": count})
+            for (period, start, t_type, category_id), (amount, count) in merged.items()
+            if count != 0 or amount != 0
+        ]
+
+    @staticmethod
+    def get_rollups(db: Session, user_id: int, period: RollupPeriod,
+                    start: Optional[date] = None, end: Optional[date] = None) -> List[TransactionRollup]:
+        """Rollup rows of one granularity, oldest period first - a primary key range read"""
+        query = db.query(TransactionRollup).filter(
+            TransactionRollup.user_id == user_id,
+            TransactionRollup.period == period,
+            TransactionRollup.count > 0
+        )
+        if start:
+            query = query.filter(TransactionRollup.period_start >= RollupService.period_start(period, start))
+        if end:
+            query = query.filter(TransactionRollup.period_start <= end)
+        return query.order_by(TransactionRollup.period_start).all()
+
+    @staticmethod
+    def backfill(db: Session, user_id: Optional[int] = None) -> int:
+        """
+        Rebuild the rollups from the raw transactions
+        Input: user_id - only this user (all users when None)
+        Output: number of rollup rows written
+        Like BalanceService.rebuild, needs category_id filled in on every transaction
+        """
+        year = extract("year", Transaction.date)
+        month = extract("month", Transaction.date)
+        raw = db.query(
+            Transaction.user_id, year, month, Transaction.type, Transaction.category_id,
+            func.sum(Transaction.amount), func.count(Transaction.id)
+        ).group_by(Transaction.user_id, year, month, Transaction.type, Transaction.category_id)
+        stored = db.query(TransactionRollup)
+        if user_id is not None:
+            raw = raw.filter(Transaction.user_id == user_id)
+            stored = stored.filter(TransactionRollup.user_id == user_id)
+
+        # Month rows come straight from SQL, quarters and years are summed from them
+        rows: Dict[Tuple, List] = {}
+        for uid, y, m, t_type, category_id, total, count in raw.all():
+            month_start = date(int(y), int(m), 1)
+            for period in RollupPeriod:
+                key = (uid, period, RollupService.period_start(period, month_start), t_type, category_id)
+                row = rows.setdefault(key, [0.0, 0])
+                row[0] += total or 0.0
+                row[1] += count
+
+        stored.delete(synchronize_session=False)
+        for (uid, period, start, t_type, category_id), (total, count) in rows.items():
+            db.add(TransactionRollup(user_id=uid, period=period, period_start=start,
+                                     type=t_type, category_id=category_id, total=total, count=count))
+        db.commit()
+        return len(rows)
+
+class AsyncRollupService:
+    """The rollup writes of RollupService for an AsyncSession"""
+
+    @staticmethod
+    async def apply(db: AsyncSession, user_id: int, deltas: RollupDeltas) -> None:
+        """Same contract as RollupService.apply"""
+        for keys, row_deltas in RollupService._increments(user_id, deltas):
+            await increment_row_async(db, TransactionRollup, keys, row_deltas)
@@ -0,0 +1,184 @@
+import re
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional, Sequence
+from fastapi import HTTPException, status
+from sqlalchemy import and_, func, inspect, literal_column, table, column, text
+from sqlalchemy.dialects.mysql import match as mysql_match
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.transaction import Transaction, TransactionType
+from app.models.user import User
+from app.services.transaction_service import TransactionService, AsyncTransactionService
+
+# Words of a search - anything else (quotes, operators, punctuation) is dropped,
+# so user input never reaches the engines' query syntax
+SEARCH_TERM = re.compile(r"\w+")
+MAX_SEARCH_TERMS = 8
+
+class SqliteSearchIndex:
+    """
+    FTS5 index over transactions.description
+    An external-content table (the text lives only in transactions) kept in
+    step by triggers, so every insert path - the ORM, executemany imports,
+    migrations - updates it in the same DB transaction
+    user_id is indexed as a second column so a search intersects the user's
+    rows inside the index instead of matching every user's and filtering after
+    """
+    TABLE = "transactions_fts"
+    DDL = [
+        # prefix='2 3': short prefixes ("am*", "ama*") read a prebuilt index instead of expanding terms
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5("
+        f"description, user_id, content='transactions', content_rowid='id', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS {TABLE}_insert AFTER INSERT ON transactions BEGIN "
+        f"INSERT INTO {TABLE}(rowid, description, user_id) VALUES (new.id, new.description, new.user_id); END",
+        f"CREATE TRIGGER IF NOT EXISTS {TABLE}_delete AFTER DELETE ON transactions BEGIN "
+        f"INSERT INTO {TABLE}({TABLE}, rowid, description, user_id) "
+        f"VALUES ('delete', old.id, old.description, old.user_id); END",
+        f"CREATE TRIGGER IF NOT EXISTS {TABLE}_update AFTER UPDATE OF description, user_id ON transactions BEGIN "
+        f"INSERT INTO {TABLE}({TABLE}, rowid, description, user_id) "
+        f"VALUES ('delete', old.id, old.description, old.user_id); "
+        f"INSERT INTO {TABLE}(rowid, description, user_id) VALUES (new.id, new.description, new.user_id); END",
+    ]
+    _fts = table(TABLE, column("rowid"), column("rank"))
+
+    @staticmethod
+    def create(connection) -> None:
+        fts = SqliteSearchIndex.TABLE
+        exists = inspect(connection).has_table(fts)
+        for statement in SqliteSearchIndex.DDL:
+            connection.execute(text(statement))
+        if not exists:
+            # Relevance comes from the description alone, and rows written before the table existed get indexed
+            connection.execute(text(f"INSERT INTO {fts}({fts}, rank) VALUES ('rank', 'bm25(1.0, 0.0)')"))
+            connection.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+    @staticmethod
+    def apply(query, user_id: int, terms: List[str]):
+        """The user's matches containing every term (the last as a word prefix), best bm25 rank first"""
+        fts = SqliteSearchIndex._fts
+        # Whole words seek through the index; a prefix longer than 3 letters has to merge
+        # every word it starts, so only the word still being typed is one
+        words = " AND ".join([f'"{term}"' for term in terms[:-1]] + [f'"{terms[-1]}"*'])
+        expression = f'user_id : "{user_id}" AND description : ({words})'
+        return query.join(fts, fts.c.rowid == Transaction.id).filter(
+            literal_column(SqliteSearchIndex.TABLE).op("MATCH")(expression)
+        ).order_by(fts.c.rank)
+
+class MysqlSearchIndex:
+    """
+    InnoDB FULLTEXT index over transactions.description
+    InnoDB maintains it on every write itself. Words shorter than
+    innodb_ft_min_token_size (3 by default) and stopwords are not indexed.
+    The index can't be scoped to a user: matches are filtered by user_id after
+    """
+    INDEX = "ft_transactions_description"
+
+    @staticmethod
+    def create(connection) -> None:
+        indexes = {index["name"] for index in inspect(connection).get_indexes("transactions")}
+        if MysqlSearchIndex.INDEX not in indexes:
+            connection.execute(text(f"ALTER TABLE transactions ADD FULLTEXT INDEX {MysqlSearchIndex.INDEX} (description)"))
+
+    @staticmethod
+    def apply(query, user_id: int, terms: List[str]):
+        """Matches containing every term (the last as a word prefix), highest relevance first"""
+        against = " ".join([f"+{term}" for term in terms[:-1]] + [f"+{terms[-1]}*"])
+        score = mysql_match(Transaction.description, against=against).in_boolean_mode()
+        return query.filter(score).order_by(score.desc())
+
+class LikeSearchIndex:
+    """
+    No index: a substring scan of the user's descriptions, newest first
+    Used on databases without a full-text backend, and as the benchmark baseline
+    """
+
+    @staticmethod
+    def create(connection) -> None:
+        pass
+
+    @staticmethod
+    def apply(query, user_id: int, terms: List[str]):
+        return query.filter(and_(*(
+            func.lower(Transaction.description).contains(term, autoescape=True) for term in terms
+        )))
+
+# Full-text backend per SQLAlchemy dialect name
+SEARCH_INDEXES = {
+    "sqlite": SqliteSearchIndex,
+    "mysql": MysqlSearchIndex,
+}
+
+class SearchService:
+    """Full-text search over transaction descriptions, on whichever index the database has"""
+
+    @staticmethod
+    def index_for(bind):
+        return SEARCH_INDEXES.get(bind.dialect.name, LikeSearchIndex)
+
+    @staticmethod
+    def create_index(engine) -> None:
+        """Create the search index (and index existing rows) if it's missing - safe to re-run"""
+        with engine.begin() as connection:
+            SearchService.index_for(connection).create(connection)
+
+    @staticmethod
+    def terms(q: str) -> List[str]:
+        """Lowercased words of a search string"""
+        terms = SEARCH_TERM.findall(q.lower())[:MAX_SEARCH_TERMS]
+        if not terms:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Search needs at least one word")
+        return terms
+
+    @staticmethod
+    def search(db: Session, user: User, q: str,
+               transaction_type: Optional[TransactionType]=None,
+               category: Optional[str]=None,
+               start: Optional[date]=None,
+               end: Optional[date]=None,
+               skip: int=0,
+               limit: int=50,
+               columns: Optional[Sequence]=None,
+               index=None) -> List[Transaction]:
+        """
+        The user's transactions whose description contains every word of q,
+        the last one matched as a word prefix so results follow typing
+        ("amazon ord" finds "Amazon order"), most relevant first, ties newest first
+        Filters are the listing's (type, category by id) plus a start/end day range
+        index: force a backend (e.g. LikeSearchIndex) instead of the database's own
+        """
+        terms = SearchService.terms(q)
+        index = index or SearchService.index_for(db.get_bind())
+        query = TransactionService._user_transactions_query(db, user, transaction_type, category, columns)
+        query = SearchService._narrow(query, user, terms, index, start, end)
+        return TransactionService._rows(db.execute(query.offset(skip).limit(limit)), columns)
+
+    @staticmethod
+    def _narrow(query, user: User, terms: List[str], index, start: Optional[date], end: Optional[date]):
+        """The listing query cut down to the matches of terms within start..end, most relevant first"""
+        if start:
+            query = query.filter(Transaction.date >= datetime.combine(start, time.min))
+        if end:
+            query = query.filter(Transaction.date < datetime.combine(end + timedelta(days=1), time.min))
+
+        # Relevance goes in front of the listing's newest-first order
+        query = index.apply(query.order_by(None), user.id, terms)
+        return query.order_by(Transaction.date.desc(), Transaction.id.desc())
+
+class AsyncSearchService:
+    """SearchService.search for an AsyncSession - the same statement, awaited"""
+
+    @staticmethod
+    async def search(db: AsyncSession, user: User, q: str,
+                     transaction_type: Optional[TransactionType]=None,
+                     category: Optional[str]=None,
+                     start: Optional[date]=None,
+                     end: Optional[date]=None,
+                     skip: int=0,
+                     limit: int=50,
+                     columns: Optional[Sequence]=None,
+                     index=None) -> List[Transaction]:
+        terms = SearchService.terms(q)
+        index = index or SearchService.index_for(db.get_bind())
+        query = await AsyncTransactionService._user_transactions_query(db, user, transaction_type, category, columns)
+        query = SearchService._narrow(query, user, terms, index, start, end)
+        return TransactionService._rows(await db.execute(query.offset(skip).limit(limit)), columns)
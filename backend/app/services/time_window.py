@@ -0,0 +1,111 @@
+import calendar
+import re
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+MONTHS = {name.lower(): number for number, name in enumerate(calendar.month_name) if name}
+
+UNIT_DAYS = {"day": 1, "week": 7}
+
+# Longest forms first, so "last 90 days" isn't read as "last" + "90"
+TIME_PATTERN = re.compile(
+    r"\b(?:"
+    r"(?:in\s+the\s+|over\s+the\s+|for\s+the\s+)?(?:last|past)\s+(?P<count>\d{1,4})\s+(?P<unit>day|week|month)s?"
+    r"|(?P<relative>this|last|previous|current)\s+(?P<period>week|month|year)"
+    r"|(?:(?P<month_prefix>in|during)\s+)?(?P<month>" + "|".join(MONTHS) + r")(?:\s+(?P<month_year>(?:19|20)\d{2}))?"
+    r"|(?:(?:in|during)\s+)?(?<![$.,])(?P<year>(?:19|20)\d{2})(?![.,]\d)"
+    r"|(?P<day>today|yesterday)"
+    r")\b",
+    re.IGNORECASE
+)
+
+class TimeWindow:
+    """A [start, end) range of transaction dates plus how to name it in a reply"""
+
+    def __init__(self, start: datetime, end: datetime, label: str):
+        self.start = start
+        self.end = end
+        self.label = label
+
+    @property
+    def key(self) -> Tuple[datetime, datetime]:
+        """Identifies the range in cache keys"""
+        return (self.start, self.end)
+
+def parse_time_window(message: str, now: Optional[datetime] = None) -> Tuple[Optional[TimeWindow], str]:
+    """
+    Find the first time expression in a message
+    ("this month", "last week", "in March", "last 90 days", "2024", "yesterday", ...)
+    Returns (window or None, message with the expression removed) - the rest
+    goes to the intent matcher, so "last" in "last week" isn't read as "recent"
+    """
+    now = now or datetime.now()
+    for found in TIME_PATTERN.finditer(message):
+        window = _window(found, now)
+        if window is not None:
+            rest = (message[:found.start()] + " " + message[found.end():]).strip()
+            return window, rest
+    return None, message
+
+def _window(found: re.Match, now: datetime) -> Optional[TimeWindow]:
+    today = datetime(now.year, now.month, now.day)
+    groups = found.groupdict()
+
+    if groups["count"]:
+        count, unit = int(groups["count"]), groups["unit"].lower()
+        if count == 0:
+            return None
+        if unit == "month":
+            start = _add_months(today, -count) + timedelta(days=1)
+        else:
+            start = today - timedelta(days=count * UNIT_DAYS[unit] - 1)
+        label = f"the last {count} {unit}s" if count > 1 else f"the last {unit}"
+        return TimeWindow(start, today + timedelta(days=1), label)
+
+    if groups["relative"]:
+        previous = groups["relative"].lower() in ("last", "previous")
+        period = groups["period"].lower()
+        if period == "week":
+            start = today - timedelta(days=today.weekday())
+            if previous:
+                start -= timedelta(days=7)
+            end = start + timedelta(days=7)
+        elif period == "month":
+            start = datetime(today.year, today.month, 1)
+            if previous:
+                start = _add_months(start, -1)
+            end = _add_months(start, 1)
+        else:
+            start = datetime(today.year - previous, 1, 1)
+            end = datetime(start.year + 1, 1, 1)
+        return TimeWindow(start, end, f"{'last' if previous else 'this'} {period}")
+
+    if groups["month"]:
+        month = MONTHS[groups["month"].lower()]
+        if month == 5 and not (groups["month_prefix"] or groups["month_year"]):
+            # A bare "may" is almost always the verb
+            return None
+        if groups["month_year"]:
+            year = int(groups["month_year"])
+        else:
+            # The most recent one: "in March" asked in January means last March
+            year = today.year if month <= today.month else today.year - 1
+        start = datetime(year, month, 1)
+        return TimeWindow(start, _add_months(start, 1), f"{calendar.month_name[month]} {year}")
+
+    if groups["year"]:
+        year = int(groups["year"])
+        return TimeWindow(datetime(year, 1, 1), datetime(year + 1, 1, 1), str(year))
+
+    if groups["day"]:
+        start = today if groups["day"].lower() == "today" else today - timedelta(days=1)
+        return TimeWindow(start, start + timedelta(days=1), groups["day"].lower())
+
+    return None
+
+def _add_months(day: datetime, months: int) -> datetime:
+    """Same day of month `months` away, clamped to that month's length"""
+    index = day.year * 12 + day.month - 1 + months
+    year, month = divmod(index, 12)
+    month += 1
+    return day.replace(year=year, month=month, day=min(day.day, calendar.monthrange(year, month)[1]))
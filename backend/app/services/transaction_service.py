@@ -1,59 +1,293 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import insert, select, or_, and_, false
+from sqlalchemy.exc import SQLAlchemyError
 from fastapi import HTTPException, status
-from typing import List, Optional
+from starlette.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from typing import List, Optional, Any, AsyncIterator, Tuple, Dict, Iterator, Sequence
 from datetime import datetime
 from app.models.transaction import Transaction, TransactionType
 from app.models.user import User
-from app.schemas.transaction import TransactionCreate, TransactionUpdate, TransactionSummary
+from app.schemas.transaction import TransactionCreate, TransactionUpdate, TransactionSummary, TransactionResponse
+from app.services.balance_service import BalanceService, AsyncBalanceService
+from app.services.category_service import CategoryService, AsyncCategoryService
+from app.services.rollup_service import RollupService, AsyncRollupService
+
+# Columns of TransactionResponse, for list queries that skip building ORM objects
+RESPONSE_FIELDS = tuple(TransactionResponse.model_fields)
+RESPONSE_COLUMNS = tuple(getattr(Transaction, field) for field in RESPONSE_FIELDS)
 
 class TransactionService:
     @staticmethod
     def create_transaction(db: Session, transaction_data: Transaction, user: User) ->Transaction:
         """ New Transaction for the user"""
-        new_transaction = Transaction(
+        new_transaction = TransactionService._new_transaction(
+            transaction_data, user, CategoryService.get_or_create(db, transaction_data.category, user.id)
+        )
+
+        db.add(new_transaction)
+        TransactionService._apply_changes(db, user.id, [TransactionService._added(new_transaction)])
+        db.commit()
+        db.refresh(new_transaction)
+        return new_transaction
+
+    @staticmethod
+    def _new_transaction(transaction_data: TransactionCreate, user: User, category_id: int) -> Transaction:
+        return Transaction(
             user_id=user.id,
             amount=transaction_data.amount,
             type=transaction_data.type,
             category=transaction_data.category,
+            category_id=category_id,
             description=transaction_data.description,
             date=transaction_data.date
         )
 
-        db.add(new_transaction)
-        db.commit()
-        db.refresh(new_transaction)
-        return new_transaction
+    @staticmethod
+    def _added(transaction: Transaction) -> Tuple[TransactionType, int, datetime, float, int]:
+        """The _apply_changes entry of a transaction being added"""
+        return (transaction.type, transaction.category_id, transaction.date, transaction.amount, 1)
+
+    @staticmethod
+    def _removed(transaction: Transaction) -> Tuple[TransactionType, int, datetime, float, int]:
+        """The _apply_changes entry of a transaction being removed"""
+        return (transaction.type, transaction.category_id, transaction.date, -transaction.amount, -1)
     
     @staticmethod
-    def get_user_transaction(db: Session, user=User ,transaction_type: Optional[TransactionType]=None,
+    def bulk_create_transactions(db: Session, records: List[Tuple[int, Any]], user: User) -> Tuple[int, List[Dict]]:
+        """
+        Validate and insert one chunk of a bulk import
+        Input:
+            records: (row index, raw row) pairs - a dict from a JSON array or a str/bytes NDJSON line
+        Output: (inserted count, per-row errors)
+        Valid rows go in with a single executemany INSERT and one commit
+        """
+        rows, row_indexes, errors = TransactionService._validate_bulk_records(records, user.id)
+        return TransactionService._insert_bulk_rows(db, user.id, rows, row_indexes, errors)
+
+    @staticmethod
+    def _validate_bulk_records(records: List[Tuple[int, Any]], user_id: int) -> Tuple[List[Dict], List[int], List[Dict]]:
+        """Parse a bulk chunk into (insertable rows, their row indexes, per-row errors) - no DB access"""
+        rows = []
+        row_indexes = []
+        errors = []
+        for index, record in records:
+            try:
+                if isinstance(record, (str, bytes)):
+                    data = TransactionCreate.model_validate_json(record)
+                else:
+                    data = TransactionCreate.model_validate(record)
+            except ValidationError as e:
+                message = "; ".join(
+                    f"{'.'.join(str(part) for part in err['loc']) or 'row'}: {err['msg']}" for err in e.errors()
+                )
+                errors.append({"index": index, "error": message})
+                continue
+
+            rows.append({
+                "user_id": user_id,
+                "amount": data.amount,
+                "type": data.type,
+                "category": data.category,
+                "description": data.description,
+                "date": data.date
+            })
+            row_indexes.append(index)
+        return (rows, row_indexes, errors)
+
+    @staticmethod
+    def _insert_bulk_rows(db: Session, user_id: int, rows: List[Dict], row_indexes: List[int],
+                          errors: List[Dict]) -> Tuple[int, List[Dict]]:
+        """Insert validated bulk rows and update the aggregates, in one commit"""
+        if not rows:
+            return (0, errors)
+
+        try:
+            # One lookup per distinct category in the chunk, usually straight from the cache
+            category_ids = {name: CategoryService.get_or_create(db, name, user_id) for name in {row["category"] for row in rows}}
+            for row in rows:
+                row["category_id"] = category_ids[row["category"]]
+            db.execute(insert(Transaction), rows)
+            TransactionService._apply_changes(db, user_id, TransactionService._bulk_changes(rows))
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            return (0, TransactionService._bulk_failed(e, row_indexes, errors))
+
+        return (len(rows), errors)
+
+    @staticmethod
+    def _bulk_changes(rows: List[Dict]) -> List[Tuple[TransactionType, int, datetime, float, int]]:
+        return [(row["type"], row["category_id"], row["date"], row["amount"], 1) for row in rows]
+
+    @staticmethod
+    def _bulk_failed(error: SQLAlchemyError, row_indexes: List[int], errors: List[Dict]) -> List[Dict]:
+        """Errors of a chunk whose insert was rolled back - every row in it failed"""
+        errors.extend({"index": index, "error": f"database error: {error.__class__.__name__}"} for index in row_indexes)
+        return errors
+    
+    @staticmethod
+    def _apply_changes(db: Session, user_id: int,
+                       changes: List[Tuple[TransactionType, int, datetime, float, int]]) -> None:
+        """
+        Keep every store derived from transactions in step with a write
+        Input: changes - (type, category id, date, amount, count) per added row,
+               with negative amount and count for removed rows
+        Balances and rollups get one update per touched row, and the user's
+        data version is bumped even when no totals moved
+        Runs inside the caller's DB transaction - the caller commits
+        """
+        balance_deltas, rollup_deltas = TransactionService._merge_changes(changes)
+        for (t_type, category_id), (amount, count) in balance_deltas.items():
+            BalanceService.apply(db, user_id, t_type, category_id, amount, count=count)
+        RollupService.apply(db, user_id, rollup_deltas)
+        BalanceService.bump_version(db, user_id)
+
+    @staticmethod
+    def _merge_changes(changes: List[Tuple[TransactionType, int, datetime, float, int]]) -> Tuple[Dict, Dict]:
+        """(balance deltas per (type, category id), rollup deltas per (type, category id, date))"""
+        balance_deltas: Dict[Tuple[TransactionType, int], List] = {}
+        rollup_deltas: Dict[Tuple[TransactionType, int, datetime], List] = {}
+        for t_type, category_id, when, amount, count in changes:
+            for deltas, key in ((balance_deltas, (t_type, category_id)), (rollup_deltas, (t_type, category_id, when))):
+                delta = deltas.setdefault(key, [0.0, 0])
+                delta[0] += amount
+                delta[1] += count
+        return balance_deltas, rollup_deltas
+    
+    @staticmethod
+    def get_user_transactions(db: Session, user: User, transaction_type: Optional[TransactionType]=None,
                              category: Optional[str]=None,
                              skip: int=0,
-                             limit: int=100)->List[Transaction]:
+                             limit: int=100,
+                             columns: Optional[Sequence]=None)->List[Transaction]:
         """Input
         Get all transactions of a user
+        Offset paging - prefer get_transactions_page for deep pages
+        Pass columns (e.g. RESPONSE_COLUMNS) to get row tuples instead of ORM objects
         """    
+        query=TransactionService._user_transactions_query(db,user,transaction_type,category,columns)
+        transactions=TransactionService._rows(db.execute(query.offset(skip).limit(limit)), columns)
+
+        return transactions
+    
+    @staticmethod
+    def get_transactions_page(db: Session, user: User, transaction_type: Optional[TransactionType]=None,
+                              category: Optional[str]=None,
+                              after: Optional[Tuple[datetime, int]]=None,
+                              limit: int=100,
+                              columns: Optional[Sequence]=None) -> Tuple[List[Transaction], Optional[Tuple[datetime, int]]]:
+        """
+        Keyset paging: one page of transactions strictly after the (date, id) position `after`
+        Each page is a bounded range scan of ix_transactions_user_date_id, and
+        rows written mid-paging don't shift the window
+        columns: select just these (must include date and id) and return row tuples
+        Output: (transactions, (date, id) to continue after, or None on the last page)
+        """
+        query=TransactionService._user_transactions_query(db,user,transaction_type,category,columns)
+        transactions=TransactionService._rows(db.execute(TransactionService._page_statement(query, after, limit)), columns)
+        return TransactionService._split_page(transactions, limit)
+
+    @staticmethod
+    def _page_statement(query, after: Optional[Tuple[datetime, int]], limit: int):
+        """The listing query narrowed to one keyset page, plus one row to tell whether another page exists"""
+        if after:
+            after_date, after_id = after
+            query=query.filter(or_(
+                Transaction.date < after_date,
+                and_(Transaction.date == after_date, Transaction.id < after_id)
+            ))
+        return query.limit(limit + 1)
+
+    @staticmethod
+    def _split_page(transactions: List, limit: int):
+        """(page, (date, id) to continue after or None) from the rows of a _page_statement"""
+        if len(transactions) <= limit:
+            return transactions, None
+
+        transactions=transactions[:limit]
+        last=transactions[-1]
+        return transactions, (last.date, last.id)
+    
+    @staticmethod
+    def _user_transactions_query(db: Session, user: User, transaction_type: Optional[TransactionType],
+                                 category: Optional[str], columns: Optional[Sequence]=None):
+        """
+        Base listing query: the user's transactions, newest first, filtered by type/category
+        The category filter matches by id, so any case or alias of the name finds the same rows
+        """
+        category_id=CategoryService.resolve(db, category, user.id) if category else None
+        return TransactionService._listing_statement(user,transaction_type,category,category_id,columns)
+
+    @staticmethod
+    def _listing_statement(user: User, transaction_type: Optional[TransactionType], category: Optional[str],
+                           category_id: Optional[int], columns: Optional[Sequence]=None):
+        """
+        select() behind _user_transactions_query, shared with the async service
+        category_id: what category resolved to (None when it names no category)
+        """
+        query=select(*columns) if columns else select(Transaction)
+        query=query.where(Transaction.user_id==user.id)
+
         if transaction_type:
-            query=query.filter(Transaction.type==transaction_type)
+            query=query.where(Transaction.type==transaction_type)
 
         if category:
-            query=query.filter(Transaction.category==category)
+            query=query.where(Transaction.category_id==category_id if category_id is not None else false())
     
-        query=query.order_by(Transaction.date.desc())
-        transactions=query.offset(skip).limit(limit).all()
+        return query.order_by(Transaction.date.desc(), Transaction.id.desc())
 
-        return transactions
+    @staticmethod
+    def _rows(result, columns: Optional[Sequence]) -> List:
+        """Row tuples when columns were selected, ORM objects otherwise"""
+        return result.all() if columns else result.scalars().all()
+    
+    @staticmethod
+    def export_transactions(db: Session, user: User, batch_size: int = 1000) -> Iterator[Tuple]:
+        """
+        Yield every transaction of the user as a plain row tuple, oldest first
+        Rows come from a server-side cursor batch_size at a time, no ORM objects
+        are built, so memory stays flat however long the history is
+        Columns follow app.utils.exporters.EXPORT_COLUMNS
+        """
+        result = db.execute(TransactionService._export_statement(user, batch_size))
+        for partition in result.partitions():
+            yield from partition
+
+    @staticmethod
+    def _export_statement(user: User, batch_size: int):
+        return select(
+            Transaction.id,
+            Transaction.amount,
+            Transaction.type,
+            Transaction.category,
+            Transaction.description,
+            Transaction.date,
+            Transaction.created_at,
+            Transaction.updated_at
+        ).where(
+            Transaction.user_id == user.id
+        ).order_by(Transaction.date, Transaction.id).execution_options(stream_results=True, yield_per=batch_size)
     
     @staticmethod
     def get_transaction_by_id(db: Session, transaction_id: int, user: User) -> Transaction:
         """
         Get a specific transaction by ID
         """
-        transaction = db.query(Transaction).filter(
+        transaction = db.execute(TransactionService._by_id_statement(transaction_id, user)).scalars().first()
+        return TransactionService._found(transaction)
+
+    @staticmethod
+    def _by_id_statement(transaction_id: int, user: User):
+        return select(Transaction).where(
             Transaction.id == transaction_id,
             Transaction.user_id == user.id  # Security: Only user's own transactions
-        ).first()
-        
+        )
+
+    @staticmethod
+    def _found(transaction: Optional[Transaction]) -> Transaction:
+        """The transaction, or a 404 when the lookup found none"""
         if not transaction:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -76,14 +310,31 @@ class TransactionService:
         
         # Update only provided fields
         update_data = transaction_data.model_dump(exclude_unset=True)
+        removed = TransactionService._removed(transaction)
         
         for field, value in update_data.items():
             setattr(transaction, field, value)
+        if "category" in update_data:
+            transaction.category_id = CategoryService.get_or_create(db, transaction.category, user.id)
+        
+        TransactionService._apply_changes(db, user.id, TransactionService._update_changes(removed, transaction))
         
         db.commit()
         db.refresh(transaction)
         
         return transaction
+
+    @staticmethod
+    def _update_changes(removed: Tuple, transaction: Transaction) -> List[Tuple]:
+        """
+        Move the old values out of the aggregates and the new ones in
+        (respelling the category, e.g. "Dining" to "Food", leaves them as they are)
+        removed: _removed() of the transaction before the update
+        """
+        added = TransactionService._added(transaction)
+        if added[:3] == removed[:3] and added[3] == -removed[3]:
+            return []
+        return [removed, added]
     
     @staticmethod
     def delete_transaction(db: Session, transaction_id: int, user: User) -> None:
@@ -92,6 +343,7 @@ class TransactionService:
         """
         transaction = TransactionService.get_transaction_by_id(db, transaction_id, user)
         
+        TransactionService._apply_changes(db, user.id, [TransactionService._removed(transaction)])
         db.delete(transaction)
         db.commit()
     
@@ -99,27 +351,147 @@ class TransactionService:
     def get_summary(db: Session, user: User) -> TransactionSummary:
         """
         Get financial summary for user
+        Reads the maintained aggregates instead of scanning all transactions
         """
-        # Get total income
-        total_income = db.query(func.sum(Transaction.amount)).filter(
-            Transaction.user_id == user.id,
-            Transaction.type == TransactionType.INCOME
-        ).scalar() or 0.0
-        
-        # Get total expenses
-        total_expenses = db.query(func.sum(Transaction.amount)).filter(
-            Transaction.user_id == user.id,
-            Transaction.type == TransactionType.EXPENSE
-        ).scalar() or 0.0
-        
-        # Get transaction count
-        transaction_count = db.query(Transaction).filter(
-            Transaction.user_id == user.id
-        ).count()
-        
+        return TransactionService._summary(*BalanceService.get_balance(db, user.id))
+
+    @staticmethod
+    def _summary(total_income: float, total_expenses: float, transaction_count: int) -> TransactionSummary:
         return TransactionSummary(
             total_income=total_income,
             total_expenses=total_expenses,
             net_savings=total_income - total_expenses,
             transaction_count=transaction_count
-        )
\ No newline at end of file
+        )
+
+class AsyncTransactionService:
+    """
+    Async version of TransactionService for the async routes
+    Builds the same statements as the sync service (and the same aggregate
+    changes through AsyncBalanceService / AsyncRollupService) and awaits them
+    on the AsyncSession
+    """
+    @staticmethod
+    async def create_transaction(db: AsyncSession, transaction_data: TransactionCreate, user: User) -> Transaction:
+        """Same contract as TransactionService.create_transaction"""
+        new_transaction = TransactionService._new_transaction(
+            transaction_data, user, await AsyncCategoryService.get_or_create(db, transaction_data.category, user.id)
+        )
+
+        db.add(new_transaction)
+        await AsyncTransactionService._apply_changes(db, user.id, [TransactionService._added(new_transaction)])
+        await db.commit()
+        await db.refresh(new_transaction)
+        return new_transaction
+
+    @staticmethod
+    async def bulk_create_transactions(db: AsyncSession, records: List[Tuple[int, Any]],
+                                       user: User) -> Tuple[int, List[Dict]]:
+        """
+        Same contract as TransactionService.bulk_create_transactions
+        Validation is CPU work, so it runs in the threadpool instead of on the event loop
+        """
+        rows, row_indexes, errors = await run_in_threadpool(
+            TransactionService._validate_bulk_records, records, user.id
+        )
+        if not rows:
+            return (0, errors)
+
+        try:
+            category_ids = {
+                name: await AsyncCategoryService.get_or_create(db, name, user.id)
+                for name in {row["category"] for row in rows}
+            }
+            for row in rows:
+                row["category_id"] = category_ids[row["category"]]
+            await db.execute(insert(Transaction), rows)
+            await AsyncTransactionService._apply_changes(db, user.id, TransactionService._bulk_changes(rows))
+            await db.commit()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            return (0, TransactionService._bulk_failed(e, row_indexes, errors))
+
+        return (len(rows), errors)
+
+    @staticmethod
+    async def _apply_changes(db: AsyncSession, user_id: int,
+                             changes: List[Tuple[TransactionType, int, datetime, float, int]]) -> None:
+        """Same contract as TransactionService._apply_changes"""
+        balance_deltas, rollup_deltas = TransactionService._merge_changes(changes)
+        for (t_type, category_id), (amount, count) in balance_deltas.items():
+            await AsyncBalanceService.apply(db, user_id, t_type, category_id, amount, count=count)
+        await AsyncRollupService.apply(db, user_id, rollup_deltas)
+        await AsyncBalanceService.bump_version(db, user_id)
+
+    @staticmethod
+    async def _user_transactions_query(db: AsyncSession, user: User, transaction_type: Optional[TransactionType],
+                                       category: Optional[str], columns: Optional[Sequence]=None):
+        category_id = await AsyncCategoryService.resolve(db, category, user.id) if category else None
+        return TransactionService._listing_statement(user, transaction_type, category, category_id, columns)
+
+    @staticmethod
+    async def get_user_transactions(db: AsyncSession, user: User, transaction_type: Optional[TransactionType]=None,
+                                    category: Optional[str]=None, skip: int=0, limit: int=100,
+                                    columns: Optional[Sequence]=None) -> List[Transaction]:
+        """Same contract as TransactionService.get_user_transactions"""
+        query = await AsyncTransactionService._user_transactions_query(db, user, transaction_type, category, columns)
+        return TransactionService._rows(await db.execute(query.offset(skip).limit(limit)), columns)
+
+    @staticmethod
+    async def get_transactions_page(db: AsyncSession, user: User, transaction_type: Optional[TransactionType]=None,
+                                    category: Optional[str]=None, after: Optional[Tuple[datetime, int]]=None,
+                                    limit: int=100, columns: Optional[Sequence]=None):
+        """Same contract as TransactionService.get_transactions_page"""
+        query = await AsyncTransactionService._user_transactions_query(db, user, transaction_type, category, columns)
+        result = await db.execute(TransactionService._page_statement(query, after, limit))
+        return TransactionService._split_page(TransactionService._rows(result, columns), limit)
+
+    @staticmethod
+    async def export_transactions(db: AsyncSession, user: User, batch_size: int = 1000) -> AsyncIterator[List[Tuple]]:
+        """
+        Same rows as TransactionService.export_transactions, a list of up to
+        batch_size at a time, read from a server-side cursor
+        """
+        result = await db.stream(TransactionService._export_statement(user, batch_size))
+        async for partition in result.partitions():
+            yield partition
+
+    @staticmethod
+    async def get_transaction_by_id(db: AsyncSession, transaction_id: int, user: User) -> Transaction:
+        result = await db.execute(TransactionService._by_id_statement(transaction_id, user))
+        return TransactionService._found(result.scalars().first())
+
+    @staticmethod
+    async def update_transaction(db: AsyncSession, transaction_id: int,
+                                 transaction_data: TransactionUpdate, user: User) -> Transaction:
+        """Same contract as TransactionService.update_transaction"""
+        transaction = await AsyncTransactionService.get_transaction_by_id(db, transaction_id, user)
+
+        update_data = transaction_data.model_dump(exclude_unset=True)
+        removed = TransactionService._removed(transaction)
+
+        for field, value in update_data.items():
+            setattr(transaction, field, value)
+        if "category" in update_data:
+            transaction.category_id = await AsyncCategoryService.get_or_create(db, transaction.category, user.id)
+
+        changes = TransactionService._update_changes(removed, transaction)
+        await AsyncTransactionService._apply_changes(db, user.id, changes)
+
+        await db.commit()
+        await db.refresh(transaction)
+        return transaction
+
+    @staticmethod
+    async def delete_transaction(db: AsyncSession, transaction_id: int, user: User) -> None:
+        """Same contract as TransactionService.delete_transaction"""
+        transaction = await AsyncTransactionService.get_transaction_by_id(db, transaction_id, user)
+
+        await AsyncTransactionService._apply_changes(db, user.id, [TransactionService._removed(transaction)])
+        await db.delete(transaction)
+        await db.commit()
+
+    @staticmethod
+    async def get_summary(db: AsyncSession, user: User) -> TransactionSummary:
+        result = await db.execute(BalanceService.balance_statement(user.id))
+        return TransactionService._summary(*(result.first() or (0.0, 0.0, 0)))
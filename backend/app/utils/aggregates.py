@@ -0,0 +1,47 @@
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+
+def increment_row(db: Session, model, keys: dict, deltas: dict) -> None:
+    """
+    Add deltas to the counter columns of one aggregate row, creating it if needed
+
+    Args:
+        db: Session of the caller (nothing is committed here)
+        model: Aggregate model class
+        keys: Primary key columns identifying the row, e.g. {"user_id": 1}
+        deltas: Column name -> amount to add (negative to subtract)
+
+    The update is done as `col = col + delta` in SQL so concurrent writers
+    never overwrite each other's totals.
+    """
+    statement = _increment_statement(model, keys, deltas)
+    if db.execute(statement).rowcount:
+        return
+
+    # First write for this key - insert inside a savepoint so a concurrent
+    # insert of the same row only rolls back this step, then retry the update
+    try:
+        with db.begin_nested():
+            db.add(model(**keys, **deltas))
+    except IntegrityError:
+        db.execute(statement)
+
+async def increment_row_async(db: AsyncSession, model, keys: dict, deltas: dict) -> None:
+    """increment_row for an AsyncSession, the same statements awaited"""
+    statement = _increment_statement(model, keys, deltas)
+    if (await db.execute(statement)).rowcount:
+        return
+
+    try:
+        async with db.begin_nested():
+            db.add(model(**keys, **deltas))
+    except IntegrityError:
+        await db.execute(statement)
+
+def _increment_statement(model, keys: dict, deltas: dict):
+    """UPDATE model SET col = col + delta ... WHERE keys"""
+    return update(model).filter_by(**keys).values(
+        {getattr(model, name): getattr(model, name) + delta for name, delta in deltas.items()}
+    ).execution_options(synchronize_session=False)
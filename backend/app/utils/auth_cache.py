@@ -0,0 +1,115 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+from sqlalchemy import event
+from app.config import get_settings
+from app.models.user import User
+
+settings = get_settings()
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries also expire
+    Least recently used entries are evicted once maxsize is reached
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Any, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, ttl: Optional[float] = None) -> None:
+        """Store value; ttl overrides the default lifetime (never longer than it)"""
+        lifetime = self.ttl if ttl is None else min(ttl, self.ttl)
+        if lifetime <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + lifetime, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    The authenticated user as seen by protected routes
+    A plain snapshot of the user row - safe to share across requests and
+    threads, unlike an ORM object bound to one session
+    """
+    id: int
+    email: str
+    full_name: str
+    is_active: bool
+    created_at: Optional[datetime]
+
+    @staticmethod
+    def from_user(user: User) -> "Principal":
+        return Principal(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            is_active=user.is_active,
+            created_at=user.created_at
+        )
+
+# user id -> Principal
+principal_cache = TTLCache(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL_SECONDS)
+# sha256(token) -> verified payload, kept no longer than the token's exp
+token_cache = TTLCache(settings.TOKEN_CACHE_SIZE, settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+def token_key(token: str) -> str:
+    """Cache key for a token - the raw token is never kept in memory longer than needed"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+def cache_token(token: str, payload: dict) -> None:
+    """Remember a verified payload until the token expires"""
+    exp = payload.get("exp")
+    if exp is None:
+        return
+    token_cache.set(token_key(token), payload, ttl=exp - time.time())
+
+def invalidate_user(user_id: int) -> None:
+    """Drop the cached principal so the next request reloads the user"""
+    principal_cache.invalidate(user_id)
+
+def auth_cache_stats() -> dict:
+    return {"principals": principal_cache.stats(), "tokens": token_cache.stats()}
+
+# Any change to a user row through the ORM (deactivation, profile or password
+# change, deletion) evicts it. Other processes catch up within the TTL
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _evict_changed_user(mapper, connection, target):
+    invalidate_user(target.id)
@@ -1,20 +1,19 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, WebSocket, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.utils.security import verify_token
-from app.services.auth_service import AuthService
+from app.utils.auth_cache import Principal, principal_cache, token_cache, token_key, cache_token
+from app.services.auth_service import AuthService, AsyncAuthService
 
 # Security scheme - auto_error=False allows it to be optional
 security = HTTPBearer(auto_error=False)
 
-def get_current_user(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db)
-):
+def _user_id_from_credentials(credentials: Optional[HTTPAuthorizationCredentials]) -> int:
     """
-    Dependency to get current authenticated user from JWT token
+    Verify the bearer token and return the user id it was issued for
     
     Raises 401 if no token or invalid token
     """
@@ -30,8 +29,12 @@ def get_current_user(
     # Extract token from Authorization header
     token = credentials.credentials
     
-    # Verify token
-    payload = verify_token(token)
+    # Verify token - verified payloads are cached until the token's exp
+    payload = token_cache.get(token_key(token))
+    if payload is None:
+        payload = verify_token(token)
+        if payload is not None:
+            cache_token(token, payload)
     
     if payload is None:
         raise HTTPException(
@@ -48,7 +51,55 @@ def get_current_user(
             detail="Invalid token payload"
         )
     
-    # Get user from database
-    user = AuthService.get_current_user(db, int(user_id))
+    return int(user_id)
+
+def websocket_credentials(websocket: WebSocket) -> Optional[HTTPAuthorizationCredentials]:
+    """
+    Bearer token of a WebSocket handshake
+    From the Authorization header, or the ?token= query parameter for
+    browsers, which can't set headers on a WebSocket
+    """
+    scheme, _, token = websocket.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        token = websocket.query_params.get("token")
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token) if token else None
+
+def get_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    db: Session = Depends(get_db)
+):
+    """
+    Dependency to get current authenticated user from JWT token
+    Returns a cached Principal, so steady-state requests cost no auth queries
+    
+    Raises 401 if no token or invalid token
+    """
+    user_id = _user_id_from_credentials(credentials)
+    
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        # Get user from database
+        principal = Principal.from_user(AuthService.get_current_user(db, user_id))
+        principal_cache.set(user_id, principal)
+        # Return the connection now: a route on get_read_db checks out a second one,
+        # and a burst of cold requests each holding one would starve the pool
+        db.rollback()
+    
+    return principal
+
+async def get_current_user_async(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Async version of get_current_user for the async routes
+    """
+    user_id = _user_id_from_credentials(credentials)
+    
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        principal = Principal.from_user(await AsyncAuthService.get_current_user(db, user_id))
+        principal_cache.set(user_id, principal)
+        await db.rollback()
     
-    return user
\ No newline at end of file
+    return principal
@@ -0,0 +1,65 @@
+import csv
+import io
+import json
+import enum
+from datetime import datetime
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, Sequence
+
+# Column order of every export format
+EXPORT_COLUMNS = ["id", "amount", "type", "category", "description", "date", "created_at", "updated_at"]
+
+def _plain(value):
+    """Turn enum/datetime cells into plain text-friendly values"""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def csv_chunks(rows: Iterable[Sequence], batch_size: int = 1000, header: bool = True) -> Iterator[str]:
+    """
+    Encode row tuples as CSV, yielding one chunk of text per batch_size rows
+    Only the current batch is ever held in memory
+    header: start with the column names - off for every batch of a stream but the first
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+
+    for count, row in enumerate(rows, 1):
+        writer.writerow([_plain(value) for value in row])
+        if count % batch_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+
+    yield buffer.getvalue()
+
+def ndjson_chunks(rows: Iterable[Sequence], batch_size: int = 1000, header: bool = True) -> Iterator[str]:
+    """
+    Encode row tuples as newline-delimited JSON objects, one chunk per batch_size rows
+    header is accepted for the same signature as csv_chunks - every line names its columns
+    """
+    lines = []
+    for row in rows:
+        lines.append(json.dumps({column: _plain(value) for column, value in zip(EXPORT_COLUMNS, row)},
+                                separators=(",", ":")))
+        if len(lines) >= batch_size:
+            yield "\n".join(lines) + "\n"
+            lines = []
+
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+async def encode_batches(encode, batches: AsyncIterable[Sequence[Sequence]]) -> AsyncIterator[str]:
+    """Run csv_chunks/ndjson_chunks over rows that arrive in batches from an async cursor"""
+    header = True
+    async for rows in batches:
+        for chunk in encode(rows, batch_size=len(rows), header=header):
+            yield chunk
+        header = False
+    if header:
+        # No rows at all - still a valid (header-only) file
+        for chunk in encode([]):
+            yield chunk
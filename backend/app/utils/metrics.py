@@ -0,0 +1,248 @@
+import bisect
+import contextvars
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+slow_query_logger = logging.getLogger("app.slow_query")
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name, self.help_text, self.kind = name, help_text, "counter"
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, key, value) for key, value in self._values.items()]
+
+class Gauge(Counter):
+    def __init__(self, name: str, help_text: str):
+        super().__init__(name, help_text)
+        self.kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets=LATENCY_BUCKETS):
+        self.name, self.help_text, self.kind = name, help_text, "histogram"
+        self.buckets = tuple(buckets)
+        # labels -> (per-bucket counts with a final +Inf slot, sum)
+        self._values: Dict[Labels, Tuple[List[int], float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    def samples(self):
+        with self._lock:
+            values = [(key, list(counts), total) for key, (counts, total) in self._values.items()]
+        samples = []
+        for key, counts, total in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                samples.append((f"{self.name}_bucket", key + (("le", le),), cumulative))
+            samples.append((f"{self.name}_sum", key, total))
+            samples.append((f"{self.name}_count", key, cumulative))
+        return samples
+
+class Registry:
+    """Metrics plus callbacks that report gauges computed at scrape time"""
+
+    def __init__(self):
+        self.metrics = []
+        self.collectors: List[Callable[[], List[Tuple[str, str, Dict[str, str], float]]]] = []
+
+    def add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        for collect in self.collectors:
+            seen = set()
+            for name, help_text, labels, value in collect():
+                if name not in seen:
+                    lines.append(f"# HELP {name} {help_text}")
+                    lines.append(f"# TYPE {name} gauge")
+                    seen.add(name)
+                lines.append(f"{name}{_format_labels(tuple(sorted(labels.items())))} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+registry = Registry()
+
+http_requests = registry.add(Counter("http_requests_total", "HTTP requests by route, method and status"))
+http_latency = registry.add(Histogram("http_request_duration_seconds", "HTTP request latency by route"))
+http_in_flight = registry.add(Gauge("http_requests_in_flight", "HTTP requests currently being served"))
+db_queries = registry.add(Counter("db_queries_total", "SQL statements executed, by route"))
+db_query_latency = registry.add(Histogram("db_query_duration_seconds", "SQL statement latency, by route"))
+db_request_queries = registry.add(Histogram(
+    "db_queries_per_request", "SQL statements per HTTP request, by route", QUERY_COUNT_BUCKETS
+))
+db_pool_wait = registry.add(Histogram("db_pool_checkout_seconds", "Time to get a connection from the pool"))
+
+class RequestStats:
+    """SQL activity of the request in flight"""
+    __slots__ = ("scope", "queries", "query_seconds")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.queries = 0
+        self.query_seconds = 0.0
+
+    @property
+    def route(self) -> str:
+        return route_name(self.scope)
+
+# Set by the middleware; sync routes see it too because the threadpool copies the context
+current_request: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar("current_request", default=None)
+
+def route_name(scope) -> str:
+    """Path template of the matched route (/transactions/{transaction_id}), or "unmatched" """
+    app = scope.get("app")
+    endpoint = scope.get("endpoint")
+    if app is None or endpoint is None:
+        return "unmatched"
+    names = getattr(app.state, "route_names", None)
+    if names is None:
+        names = app.state.route_names = {
+            getattr(route, "endpoint", None): route.path for route in app.routes if hasattr(route, "path")
+        }
+    return names.get(endpoint, "unmatched")
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware: per-route latency, status counts, in-flight requests
+    and SQL statements per request
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = current_request.set(stats)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_in_flight.dec()
+            current_request.reset(token)
+            route, method = stats.route, scope["method"]
+            http_requests.inc(route=route, method=method, status=str(status_code))
+            http_latency.observe(elapsed, route=route, method=method)
+            db_request_queries.observe(stats.queries, route=route, method=method)
+
+def instrument_engine(engine: Engine, slow_query_ms: float) -> None:
+    """Time every statement and pool checkout of a sync engine (or an async engine's sync_engine)"""
+
+    # The start time lives on the statement's execution context, so a statement
+    # that raises (and never reaches after_cursor_execute) leaves nothing behind
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context.metrics_query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context.metrics_query_start
+        stats = current_request.get()
+        route = stats.route if stats else "background"
+        if stats:
+            stats.queries += 1
+            stats.query_seconds += elapsed
+        db_queries.inc(route=route)
+        db_query_latency.observe(elapsed, route=route)
+        if slow_query_ms and elapsed * 1000 >= slow_query_ms:
+            slow_query_logger.warning("Slow query (%.1f ms) on %s: %s", elapsed * 1000, route, " ".join(statement.split()))
+
+    # The pool has no "before checkout" event, so its connect() is wrapped instead
+    pool = engine.pool
+    pool_connect = pool.connect
+
+    def timed_connect():
+        start = time.perf_counter()
+        try:
+            return pool_connect()
+        finally:
+            db_pool_wait.observe(time.perf_counter() - start)
+
+    pool.connect = timed_connect
+
+    def collect_pool():
+        status = {"checked_out": pool.checkedout()} if hasattr(pool, "checkedout") else {}
+        return [
+            ("db_pool_connections_checked_out", "Connections currently checked out of the pool",
+             {"engine": engine.url.render_as_string(hide_password=True)}, value)
+            for value in status.values()
+        ]
+
+    registry.collectors.append(collect_pool)
+
+def stats_collector(prefix: str, help_text: str, source: Callable[[], Dict]) -> None:
+    """Expose the numeric fields of a stats() dict (nested dicts become a label) as gauges"""
+
+    def collect():
+        samples = []
+        for key, value in source().items():
+            if isinstance(value, dict):
+                for field, number in value.items():
+                    if isinstance(number, (int, float)):
+                        samples.append((f"{prefix}_{field}", help_text, {"cache": key}, number))
+            elif isinstance(value, (int, float)):
+                samples.append((f"{prefix}_{key}", help_text, {}, value))
+        return samples
+
+    registry.collectors.append(collect)
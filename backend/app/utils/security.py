@@ -1,33 +1,78 @@
+import asyncio
+import threading
 import bcrypt
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
+from fastapi import HTTPException, status
 from jose import JWTError, jwt
 from app.config import get_settings
 
 settings = get_settings()
 
-def hash_password(password: str) -> str:
+# Bcrypt gets its own small pool so a login burst can't tie up every request worker.
+# bcrypt releases the GIL while hashing, so threads run in parallel.
+# The semaphore bounds running + waiting jobs; past that we answer 503 instead of queueing forever
+_hash_pool = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+_hash_slots = threading.BoundedSemaphore(settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_SIZE)
+
+def _submit(fn, *args) -> Future:
     """
-    Hash a plain text password using bcrypt
+    Queue a bcrypt job on the hashing pool
     
-    Args:
-        password: Plain text password from user
-        
-    Returns:
-        Hashed password (irreversible)
+    Raises:
+        HTTPException 503 with Retry-After when the pool's queue is full
     """
+    if not _hash_slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-in requests right now, please retry shortly",
+            headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+        )
+    try:
+        future = _hash_pool.submit(fn, *args)
+    except BaseException:
+        _hash_slots.release()
+        raise
+    future.add_done_callback(lambda _: _hash_slots.release())
+    return future
+
+def _hash(password: str) -> str:
     # Convert string to bytes
     password_bytes = password.encode('utf-8')
     
     # Generate salt and hash
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password_bytes, salt)
     
     # Return as string
     return hashed.decode('utf-8')
 
+def _check(plain_password: str, hashed_password: str) -> bool:
+    # Convert to bytes
+    password_bytes = plain_password.encode('utf-8')
+    hashed_bytes = hashed_password.encode('utf-8')
+    
+    # Verify
+    return bcrypt.checkpw(password_bytes, hashed_bytes)
+
+def hash_password(password: str) -> str:
+    """
+    Hash a plain text password using bcrypt (runs on the hashing pool)
+    Blocks the calling thread until the hash is done - for scripts such as
+    generate_data; request handlers await hash_password_async
+    
+    Args:
+        password: Plain text password from user
+        
+    Returns:
+        Hashed password (irreversible)
+    """
+    return _submit(_hash, password).result()
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
-    Verify a password against its hash
+    Verify a password against its hash (runs on the hashing pool)
+    Blocking like hash_password - request handlers await verify_password_async
     
     Args:
         plain_password: Password user entered
@@ -36,12 +81,25 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True if password matches, False otherwise
     """
-    # Convert to bytes
-    password_bytes = plain_password.encode('utf-8')
-    hashed_bytes = hashed_password.encode('utf-8')
-    
-    # Verify
-    return bcrypt.checkpw(password_bytes, hashed_bytes)
+    return _submit(_check, plain_password, hashed_password).result()
+
+async def hash_password_async(password: str) -> str:
+    """hash_password for async code - awaits the pool without blocking the event loop"""
+    return await asyncio.wrap_future(_submit(_hash, password))
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password for async code"""
+    return await asyncio.wrap_future(_submit(_check, plain_password, hashed_password))
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    True when a stored hash was made with a different cost than BCRYPT_ROUNDS
+    Hash format: $2b$<cost>$<salt+hash>
+    """
+    try:
+        return int(hashed_password.split("$")[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
 
 def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
     """
@@ -0,0 +1,37 @@
+import enum
+from typing import Dict, Iterable, Optional, Sequence
+import msgpack
+import orjson
+from fastapi import Response
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+# OpenAPI note for list routes that can answer in MessagePack
+MSGPACK_RESPONSES = {200: {"content": {"application/msgpack": {}}}}
+
+def wants_msgpack(accept: Optional[str]) -> bool:
+    """Whether the Accept header asks for MessagePack"""
+    if not accept:
+        return False
+    return any(media_type.split(";")[0].strip() in MSGPACK_MEDIA_TYPES for media_type in accept.split(","))
+
+def _msgpack_default(value):
+    # Enums as their value and datetimes as ISO 8601 strings, same as the JSON body
+    if isinstance(value, enum.Enum):
+        return value.value
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Cannot encode {type(value).__name__} as MessagePack")
+
+def rows_response(rows: Iterable[Sequence], fields: Sequence[str], accept: Optional[str] = None,
+                  headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Encode projected row tuples as a JSON (orjson) or MessagePack list of objects
+    Skips building ORM objects and validating every row through the response
+    schema - fields must be that schema's field names, in any order
+    """
+    records = [dict(zip(fields, row)) for row in rows]
+    if wants_msgpack(accept):
+        return Response(msgpack.packb(records, default=_msgpack_default), media_type="application/msgpack",
+                        headers=headers)
+    return Response(orjson.dumps(records, option=orjson.OPT_UTC_Z), media_type="application/json", headers=headers)
@@ -0,0 +1,96 @@
+"""
+NumPy analytics engine vs the equivalent SQL aggregations
+Seeds one user, then times category breakdown + rolling 30/90-day spend +
+monthly savings series computed by GROUP BY queries and by the engine
+(cold load, warm cache, and after a few new transactions).
+Usage: python -m benchmarks.analytics_engine [--transactions 100000]
+"""
+import argparse
+from datetime import datetime, timedelta
+from benchmarks.common import configure, create_schema, create_user, seed_transactions, timed
+
+def sql_trends(db, user_id):
+    """The same numbers computed with plain SQL aggregations"""
+    from sqlalchemy import func, extract
+    from app.models.category import Category
+    from app.models.transaction import Transaction, TransactionType
+
+    base = db.query(Transaction).filter(Transaction.user_id == user_id)
+    categories = db.query(
+        Category.name, func.sum(Transaction.amount), func.count(Transaction.id)
+    ).join(Category, Category.id == Transaction.category_id).filter(
+        Transaction.user_id == user_id, Transaction.type == TransactionType.EXPENSE
+    ).group_by(Category.id, Category.name).all()
+
+    rolling = {}
+    for days in (30, 90):
+        since = datetime.now() - timedelta(days=days)
+        rolling[days] = base.with_entities(func.sum(Transaction.amount)).filter(
+            Transaction.type == TransactionType.EXPENSE, Transaction.date >= since
+        ).scalar()
+
+    months = db.query(
+        extract("year", Transaction.date), extract("month", Transaction.date),
+        Transaction.type, func.sum(Transaction.amount)
+    ).filter(Transaction.user_id == user_id).group_by(
+        extract("year", Transaction.date), extract("month", Transaction.date), Transaction.type
+    ).all()
+    return categories, rolling, months
+
+def engine_trends(db, engine, user_id):
+    from app.services.analytics_engine import AnalyticsEngine
+
+    cols = engine.columns(db, user_id)
+    return (
+        AnalyticsEngine.category_breakdown(cols),
+        {days: AnalyticsEngine.rolling_spend(cols, days) for days in (30, 90)},
+        AnalyticsEngine.monthly_series(cols),
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--transactions", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    configure()
+    create_schema()
+
+    from app.database import SessionLocal
+    from app.models.transaction import TransactionType
+    from app.schemas.transaction import TransactionCreate
+    from app.services.analytics_engine import AnalyticsEngine
+    from app.services.transaction_service import TransactionService
+
+    db = SessionLocal()
+    user = create_user(db)
+    seed_transactions(db, user.id, args.transactions)
+    db.refresh(user)
+
+    engine = AnalyticsEngine(max_users=8)
+    _, sql_seconds = timed(lambda: sql_trends(db, user.id), args.repeat)
+    _, cold_seconds = timed(lambda: engine_trends(db, engine, user.id))
+    _, warm_seconds = timed(lambda: engine_trends(db, engine, user.id), args.repeat)
+
+    for i in range(10):
+        TransactionService.create_transaction(db, TransactionCreate(
+            amount=20.0 + i, type=TransactionType.EXPENSE, category="Food", description="new", date=datetime.now()
+        ), user)
+    _, append_seconds = timed(lambda: engine_trends(db, engine, user.id))
+
+    # Sanity check: the engine agrees with SQL on the category totals
+    sql_categories, _, _ = sql_trends(db, user.id)
+    engine_categories = {c["category"]: c["total"] for c in engine_trends(db, engine, user.id)[0]}
+    for category, total, _ in sql_categories:
+        assert abs(engine_categories[category] - total) < 0.01, category
+    db.close()
+
+    print(f"{args.transactions} transactions")
+    print(f"{'path':<28}{'ms':>10}")
+    print(f"{'SQL aggregations':<28}{sql_seconds * 1000:>10.1f}")
+    print(f"{'engine cold load':<28}{cold_seconds * 1000:>10.1f}")
+    print(f"{'engine warm':<28}{warm_seconds * 1000:>10.1f}")
+    print(f"{'engine after 10 inserts':<28}{append_seconds * 1000:>10.1f}")
+
+if __name__ == "__main__":
+    main()
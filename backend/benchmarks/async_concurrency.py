@@ -0,0 +1,119 @@
+"""
+Throughput and latency of DB_MODE=sync vs DB_MODE=async under concurrent clients
+Each mode runs in its own subprocess (the mode is fixed at import time) and
+drives the app in-process through an ASGI client against aiosqlite / pysqlite.
+Requests that fail (e.g. no pool connection within --pool-timeout) or take
+longer than --request-timeout are counted, not raised, so both tables always
+print; latencies are over the requests that succeeded.
+Usage: python -m benchmarks.async_concurrency [--clients 50 200 1000] [--requests 5]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import time
+from benchmarks.common import configure, create_schema, create_user, seed_transactions
+
+async def drive(app, token: str, clients: int, requests_per_client: int, request_timeout: float) -> dict:
+    """Fire clients x requests GET /transactions/summary calls concurrently"""
+    import httpx
+
+    latencies = []
+    errors = 0
+    timeouts = 0
+    headers = {"Authorization": f"Bearer {token}"}
+    # Unhandled app errors come back as 500s instead of being raised into the client
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def one_client():
+            nonlocal errors, timeouts
+            for _ in range(requests_per_client):
+                start = time.perf_counter()
+                try:
+                    response = await asyncio.wait_for(
+                        client.get("/transactions/summary", headers=headers), request_timeout
+                    )
+                except asyncio.TimeoutError:
+                    timeouts += 1
+                    continue
+                if response.is_success:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one_client() for _ in range(clients)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    total = clients * requests_per_client
+    return {
+        "clients": clients,
+        "requests": total,
+        "errors": errors,
+        "timeouts": timeouts,
+        "error_rate": (errors + timeouts) / total,
+        "throughput_rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else None,
+        "p99_ms": latencies[max(int(len(latencies) * 0.99) - 1, 0)] * 1000 if latencies else None,
+    }
+
+def worker(mode: str, clients: list, requests_per_client: int, pool_timeout: float, request_timeout: float):
+    """Runs inside the subprocess for one DB_MODE"""
+    configure(DB_MODE=mode, DB_POOL_TIMEOUT_SECONDS=pool_timeout)
+    create_schema()
+
+    from app.database import SessionLocal
+    from app.main import app
+    from app.utils.security import create_access_token
+
+    db = SessionLocal()
+    user = create_user(db)
+    seed_transactions(db, user.id, 1000)
+    token = create_access_token({"sub": str(user.id), "email": user.email})
+    db.close()
+
+    results = [asyncio.run(drive(app, token, n, requests_per_client, request_timeout)) for n in clients]
+    print(json.dumps(results))
+
+def _ms(value) -> str:
+    return f"{value:>10.1f}" if value is not None else f"{'-':>10}"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--requests", type=int, default=5, help="Requests per client")
+    parser.add_argument("--pool-timeout", type=float, default=2.0,
+                        help="DB_POOL_TIMEOUT_SECONDS - how long a request waits for a connection before failing")
+    parser.add_argument("--request-timeout", type=float, default=30.0,
+                        help="Seconds before the client gives up on one request")
+    parser.add_argument("--worker", choices=["sync", "async"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.clients, args.requests, args.pool_timeout, args.request_timeout)
+        return
+
+    print(f"{'mode':<7}{'clients':>8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}{'timeouts':>10}{'error %':>9}")
+    for mode in ("sync", "async"):
+        process = subprocess.run(
+            [sys.executable, "-m", "benchmarks.async_concurrency", "--worker", mode,
+             "--requests", str(args.requests), "--pool-timeout", str(args.pool_timeout),
+             "--request-timeout", str(args.request_timeout), "--clients", *map(str, args.clients)],
+            capture_output=True, text=True
+        )
+        lines = process.stdout.strip().splitlines()
+        if process.returncode != 0 or not lines:
+            # Report the crash and still run the other mode
+            last_error = (process.stderr.strip().splitlines() or ["no output"])[-1]
+            print(f"{mode:<7}worker exited with {process.returncode}: {last_error}")
+            continue
+        for row in json.loads(lines[-1]):
+            print(f"{mode:<7}{row['clients']:>8}{row['throughput_rps']:>10.0f}{_ms(row['p50_ms'])}{_ms(row['p99_ms'])}"
+                  f"{row['errors']:>8}{row['timeouts']:>10}{row['error_rate'] * 100:>8.1f}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+DB_MODE=async route check against aiosqlite
+Writes transactions (single, bulk, update, delete) and talks to the chatbot
+through the API, then checks the replies, that the balance aggregates and
+rollups the async writes maintained match the raw transactions, and that no
+request fell back to AsyncSession.run_sync. Exits non-zero on a failed check.
+Usage: python -m benchmarks.async_routes [--write-behind]
+"""
+import argparse
+from datetime import datetime, timedelta
+from benchmarks.common import configure, create_schema
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--write-behind", action="store_true", help="Log chat messages through the write-behind writer")
+    args = parser.parse_args()
+
+    configure(DB_MODE="async", BCRYPT_ROUNDS=4, CHAT_WRITE_BEHIND=args.write_behind)
+    create_schema()
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import func, select
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from app.database import SessionLocal, async_engine
+    from app.main import app
+    from app.models.rollup import RollupPeriod, TransactionRollup
+    from app.models.transaction import Transaction
+    from app.services.balance_service import BalanceService
+    from app.services.category_service import CategoryService
+
+    db = SessionLocal()
+    CategoryService.seed_defaults(db)
+    db.commit()
+
+    # Counts every fallback to the sync implementations
+    run_sync_calls = []
+    run_sync = AsyncSession.run_sync
+
+    async def counted_run_sync(self, fn, *fn_args, **fn_kwargs):
+        run_sync_calls.append(getattr(fn, "__qualname__", repr(fn)))
+        return await run_sync(self, fn, *fn_args, **fn_kwargs)
+
+    AsyncSession.run_sync = counted_run_sync
+
+    today = datetime.now().replace(microsecond=0)
+    checks = [("driver is aiosqlite", async_engine.dialect.driver == "aiosqlite")]
+    with TestClient(app) as client:
+        client.post("/auth/register", json={"email": "async@example.com", "password": "password1", "full_name": "Async"})
+        token = client.post("/auth/login", json={"email": "async@example.com", "password": "password1"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        def add(amount, category, t_type="expense", days_ago=0):
+            return client.post("/transactions/", headers=headers, json={
+                "amount": amount, "type": t_type, "category": category, "description": "check",
+                "date": (today - timedelta(days=days_ago)).isoformat()
+            })
+
+        created = [add(40.0, "Food"), add(25.0, "dining", days_ago=40), add(60.0, "Gym"), add(1000.0, "Salary", "income")]
+        checks.append(("POST /transactions", all(r.status_code == 201 for r in created)))
+
+        bulk = client.post("/transactions/bulk", headers=headers, json=[
+            {"amount": 5.0 + i, "type": "expense", "category": "groceries" if i % 2 else "Transport",
+             "description": "bulk", "date": (today - timedelta(days=i * 20)).isoformat()}
+            for i in range(30)
+        ] + [{"amount": -1, "type": "expense", "category": "Food", "date": today.isoformat()}]).json()
+        checks.append(("POST /transactions/bulk", bulk["inserted"] == 30 and bulk["failed"] == 1))
+
+        gym_id, dining_id = created[2].json()["id"], created[1].json()["id"]
+        updated = client.put(f"/transactions/{gym_id}", headers=headers, json={"category": "restaurants", "amount": 70.0})
+        checks.append(("PUT /transactions/{id}", updated.status_code == 200 and updated.json()["amount"] == 70.0))
+        checks.append(("DELETE /transactions/{id}", client.delete(f"/transactions/{dining_id}", headers=headers).status_code == 204))
+
+        summary = client.get("/transactions/summary", headers=headers).json()
+        listed = client.get("/transactions/?limit=100", headers=headers).json()
+        checks.append(("GET /transactions/summary", summary["transaction_count"] == len(listed) == 33))
+
+        food = sum(t["amount"] for t in listed if t["category"].lower() in ("food", "groceries", "restaurants"))
+        reply = client.post("/chat/", headers=headers, json={"message": "How much did I spend on food?"}).json()
+        checks.append(("POST /chat (spending)", f"${food:,.2f}" in reply["bot_response"]))
+
+        batch = client.post("/chat/batch", headers=headers, json={"messages": [
+            "What's my balance?", "What was my biggest expense?", "Show my recent transactions"
+        ]}).json()
+        checks.append(("POST /chat/batch", [r["intent"] for r in batch] == [
+            "balance_query", "biggest_expense", "recent_transactions"
+        ] and "$70.00" in batch[1]["bot_response"]))
+
+        history = client.get("/chat/history", headers=headers).json()
+        checks.append(("GET /chat/history", len(history) == 4 and all(isinstance(m["id"], int) for m in history)))
+        checks.append(("GET /chat/history/archived", client.get("/chat/history/archived", headers=headers).status_code == 200))
+
+    AsyncSession.run_sync = run_sync
+    checks.append(("aggregates match the transactions", BalanceService.rebuild(db, verify_only=True) == []))
+    expected = db.execute(select(
+        Transaction.type, Transaction.category_id, func.round(func.sum(Transaction.amount), 2), func.count()
+    ).group_by(Transaction.type, Transaction.category_id)).all()
+    rolled = db.execute(select(
+        TransactionRollup.type, TransactionRollup.category_id,
+        func.round(func.sum(TransactionRollup.total), 2), func.sum(TransactionRollup.count)
+    ).where(TransactionRollup.period == RollupPeriod.MONTH).group_by(
+        TransactionRollup.type, TransactionRollup.category_id
+    ).having(func.sum(TransactionRollup.count) > 0)).all()
+    db.close()
+    checks.append(("rollups match the transactions", sorted(expected) == sorted(rolled)))
+    checks.append(("no run_sync fallback", not run_sync_calls))
+
+    failures = []
+    for name, ok in checks:
+        print(f"{'ok  ' if ok else 'FAIL'} {name}")
+        if not ok:
+            failures.append(name)
+    if run_sync_calls:
+        print(f"run_sync called for: {', '.join(sorted(set(run_sync_calls)))}")
+
+    if failures:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+GET /transactions?category= on the category_id index vs the old string filter
+Seeds a long history plus a rare category, times the first and a deep keyset
+page of the string match (category = 'X' walking ix_transactions_user_date_id)
+against the id match (ix_transactions_user_category_date_id), and times
+app/migrate_categories.py backfilling the same rows from scratch.
+Usage: python -m benchmarks.category_filters [--transactions 200000] [--rare 500]
+"""
+import argparse
+from datetime import datetime, timedelta
+from benchmarks.common import configure, create_schema, create_user, seed_transactions, timed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--transactions", type=int, default=200000)
+    parser.add_argument("--rare", type=int, default=500, help="Rows in the rare category")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    configure()
+    create_schema()
+
+    from sqlalchemy import and_, func, insert, or_, text, update
+    from app.database import SessionLocal
+    from app.models.transaction import Transaction, TransactionType
+    from app.services.category_service import CategoryService, category_cache
+    from app.services.transaction_service import TransactionService, RESPONSE_COLUMNS
+    from app.migrate_categories import migrate_categories
+
+    db = SessionLocal()
+    user = create_user(db)
+    seed_transactions(db, user.id, args.transactions)
+    gym = CategoryService.get_or_create(db, "Gym", user.id)
+    start = datetime.now() - timedelta(days=5 * 365)
+    db.execute(insert(Transaction), [
+        {"user_id": user.id, "amount": 30.0, "type": TransactionType.EXPENSE, "category": "gym" if i % 2 else "Gym",
+         "category_id": gym, "description": "rare", "date": start + timedelta(hours=i * 87)}
+        for i in range(args.rare)
+    ])
+    db.commit()
+    db.execute(text("ANALYZE"))
+
+    def string_page(category, after=None):
+        # The filter as it was: exact, case-sensitive text match
+        query = TransactionService._user_transactions_query(db, user, None, None, RESPONSE_COLUMNS)
+        query = query.filter(Transaction.category == category)
+        if after:
+            query = query.filter(or_(
+                Transaction.date < after[0], and_(Transaction.date == after[0], Transaction.id < after[1])
+            ))
+        return db.execute(query.limit(51)).all()
+
+    def id_page(category, after=None):
+        return TransactionService.get_transactions_page(
+            db, user, category=category, after=after, limit=50, columns=RESPONSE_COLUMNS
+        )
+
+    print(f"{'page':<28}{'string ms':>11}{'id ms':>9}{'string rows':>13}{'id rows':>9}")
+    for category in ("Food", "Gym"):
+        deep_key = id_page(category, after=(datetime.now() - timedelta(days=3 * 365), 0))[0]
+        for label, after in ((f"{category}: first page", None), (f"{category}: 3 years back", deep_key)):
+            cursor = (after[0].date, after[0].id) if after else None
+            string_rows, string_s = timed(lambda: string_page(category, cursor), args.repeat)
+            id_rows, id_s = timed(lambda: id_page(category, cursor)[0], args.repeat)
+            print(f"{label:<28}{string_s * 1000:>11.2f}{id_s * 1000:>9.2f}{len(string_rows):>13}{len(id_rows):>9}")
+
+    # The id filter also finds the other spellings the string match missed
+    string_count = db.query(func.count()).filter(Transaction.user_id == user.id, Transaction.category == "gym").scalar()
+    id_count = db.query(func.count()).filter(
+        Transaction.user_id == user.id, Transaction.category_id == CategoryService.resolve(db, "GYM", user.id)
+    ).scalar()
+    print(f"?category=gym matches: string {string_count}, id {id_count} of {args.rare} gym rows")
+
+    db.execute(update(Transaction).values(category_id=None))
+    db.commit()
+    db.close()
+    category_cache.clear()
+    _, seconds = timed(lambda: migrate_categories(batch_size=50000))
+    print(f"backfill of {args.transactions + args.rare:,} rows: {seconds:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Home-screen load: one POST /chat/ per question vs a single POST /chat/batch
+Counts SQL statements and time per screen with a cold reply cache, checks
+both ways give the same replies, and that history lists the batch in order.
+Usage: python -m benchmarks.chat_batch [--transactions 20000] [--repeat 50] [--mode sync|async]
+"""
+import argparse
+import time
+from benchmarks.common import configure, create_schema, create_user, seed_transactions, count_queries
+
+HOME_SCREEN = [
+    "What's my balance?",
+    "How much have I spent this month?",
+    "Show my recent transactions",
+    "Give me savings tips",
+]
+
+def screen(client, headers, batched):
+    """Replies for the home screen, one request per question or one batch"""
+    if batched:
+        response = client.post("/chat/batch", headers=headers, json={"messages": HOME_SCREEN})
+        assert response.status_code == 200, response.text
+        return [reply["bot_response"] for reply in response.json()]
+    replies = []
+    for message in HOME_SCREEN:
+        response = client.post("/chat/", headers=headers, json={"message": message})
+        assert response.status_code == 200, response.text
+        replies.append(response.json()["bot_response"])
+    return replies
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--transactions", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=50, help="Home screens per measurement")
+    parser.add_argument("--mode", choices=["sync", "async"], default="sync")
+    args = parser.parse_args()
+
+    configure(DB_MODE=args.mode)
+    engine = create_schema()
+
+    from fastapi.testclient import TestClient
+    from app.database import SessionLocal
+    from app.main import app
+    from app.models.user import User
+    from app.services.chatbot_service import ChatbotService
+    from app.services.response_cache import chat_response_cache
+    from app.utils.security import create_access_token
+
+    db = SessionLocal()
+    user = create_user(db)
+    seed_transactions(db, user.id, args.transactions)
+    user_id = user.id
+    db.close()
+
+    if args.mode == "async":
+        from app.database import async_engine
+        engine = async_engine.sync_engine
+
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+    screen(client, headers, batched=False)  # warms the auth caches
+
+    print(f"{'':<22}{'requests':>10}{'statements':>12}{'ms/screen':>11}")
+    results = {}
+    for batched in (False, True):
+        chat_response_cache.clear()
+        with count_queries(engine) as statements:
+            results[batched] = screen(client, headers, batched)
+        elapsed = 0.0
+        for _ in range(args.repeat):
+            chat_response_cache.clear()
+            start = time.perf_counter()
+            screen(client, headers, batched)
+            elapsed += time.perf_counter() - start
+        name = "POST /chat/batch" if batched else "POST /chat/ x 4"
+        requests = 1 if batched else len(HOME_SCREEN)
+        print(f"{name:<22}{requests:>10}{len(statements):>12}{elapsed / args.repeat * 1000:>11.2f}")
+
+    assert results[True] == results[False], "batch replies differ from one-by-one replies"
+    db = SessionLocal()
+    latest = [m.user_message for m in ChatbotService.get_chat_history(db, db.get(User, user_id), len(HOME_SCREEN))]
+    db.close()
+    assert latest == HOME_SCREEN[::-1], f"history out of order: {latest}"
+    print("replies match and history keeps the batch order")
+
+if __name__ == "__main__":
+    main()
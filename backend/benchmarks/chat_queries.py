@@ -0,0 +1,64 @@
+"""
+Count the SQL round trips each chatbot intent costs
+Usage: python -m benchmarks.chat_queries [--transactions 20000]
+"""
+import argparse
+from benchmarks.common import configure, create_schema, create_user, seed_transactions, count_queries, timed
+
+# SELECTs per message before the handlers shared a FinancialSnapshot
+# (one SUM/COUNT/GROUP BY per number needed in the reply)
+BASELINE_SELECTS = {
+    "balance_query": 2,
+    "category_spending": 2,
+    "total_spending": 2,
+    "income_query": 2,
+    "recent_transactions": 1,
+    "savings_advice": 3,
+    "biggest_expense": 1,
+    "unknown": 0,
+}
+
+MESSAGES = [
+    "What's my balance?",
+    "How much did I spend on food?",
+    "How much have I spent?",
+    "Show my income",
+    "Show my recent transactions",
+    "Give me savings tips",
+    "What was my biggest expense?",
+    "Hello there",
+]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--transactions", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    configure()
+    engine = create_schema()
+
+    from app.database import SessionLocal
+    from app.services.chatbot_service import ChatbotService
+
+    db = SessionLocal()
+    user = create_user(db)
+    seed_transactions(db, user.id, args.transactions)
+    # Detach the user so commits inside process_message don't trigger reloads we'd count
+    db.refresh(user)
+    db.expunge(user)
+
+    print(f"{'intent':<22}{'selects before':>16}{'selects now':>13}{'ms/message':>12}")
+    for message in MESSAGES:
+        with count_queries(engine) as statements:
+            result = ChatbotService.process_message(db, user, message)
+        selects = sum(1 for s in statements if s.lstrip().upper().startswith("SELECT"))
+
+        _, seconds = timed(lambda: ChatbotService.process_message(db, user, message), args.repeat)
+        intent = result["intent"]
+        print(f"{intent:<22}{BASELINE_SELECTS[intent]:>16}{selects:>13}{seconds * 1000:>12.2f}")
+
+    db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Hot chat table size and history latency before and after archiving
+Seeds a year of chat history for several users, times GET /chat/history's
+query, runs the retention job and times it again, plus archived pages.
+Usage: python -m benchmarks.chat_retention [--users 20] [--messages-per-user 100000] [--days 90]
+"""
+import argparse
+from datetime import timedelta
+from benchmarks.common import configure, create_schema, create_user, seed_chat_messages, timed
+
+def history_latencies(db, user, repeat):
+    from app.services.chatbot_service import ChatbotService
+
+    return {limit: timed(lambda: ChatbotService.get_chat_history(db, user, limit), repeat)[1] * 1000
+            for limit in (20, 100)}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--messages-per-user", type=int, default=100000)
+    parser.add_argument("--days", type=int, default=90, help="Retention period")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    configure()
+    engine = create_schema()
+
+    from sqlalchemy import func
+    from app.database import SessionLocal
+    from app.models.chat import ChatMessage, ChatArchive
+    from app.services.chat_archive_service import ChatArchiveService, retention_cutoff
+
+    db = SessionLocal()
+    interval = timedelta(days=365) / args.messages_per_user
+    users = [create_user(db, f"chat{i}@example.com") for i in range(args.users)]
+    for user in users:
+        seed_chat_messages(db, user.id, args.messages_per_user, interval=interval)
+    user = users[0]
+
+    def table_size():
+        rows = db.query(func.count(ChatMessage.id)).scalar()
+        text_bytes = db.query(func.sum(func.length(ChatMessage.user_message) + func.length(ChatMessage.bot_response))).scalar()
+        return rows, text_bytes or 0
+
+    with engine.connect() as conn:
+        conn.exec_driver_sql("ANALYZE")
+    rows_before, bytes_before = table_size()
+    before = history_latencies(db, user, args.repeat)
+
+    _, archive_seconds = timed(lambda: ChatArchiveService.archive(db, retention_cutoff(args.days)))
+
+    with engine.connect() as conn:
+        conn.exec_driver_sql("ANALYZE")
+    rows_after, bytes_after = table_size()
+    after = history_latencies(db, user, args.repeat)
+    blobs, blob_bytes = db.query(func.count(ChatArchive.id), func.sum(func.length(ChatArchive.payload))).one()
+
+    (_, next_key), first_page = timed(lambda: ChatArchiveService.get_archived_history(db, user, limit=100), args.repeat)
+    deep_key = next_key
+    for _ in range(50):
+        _, deep_key = ChatArchiveService.get_archived_history(db, user, before=deep_key, limit=100)
+    _, deep_page = timed(lambda: ChatArchiveService.get_archived_history(db, user, before=deep_key, limit=100), args.repeat)
+    db.close()
+
+    print(f"{'':<24}{'before':>14}{'after':>14}")
+    print(f"{'hot rows':<24}{rows_before:>14}{rows_after:>14}")
+    print(f"{'hot message bytes':<24}{bytes_before:>14}{bytes_after:>14}")
+    for limit in (20, 100):
+        print(f"{f'history limit={limit} ms':<24}{before[limit]:>14.3f}{after[limit]:>14.3f}")
+    print(f"archived {rows_before - rows_after} messages into {blobs} blobs ({blob_bytes} bytes) in {archive_seconds:.1f}s")
+    print(f"archived page ms: first {first_page * 1000:.3f}, 5000 messages deep {deep_page * 1000:.3f}")
+
+if __name__ == "__main__":
+    main()
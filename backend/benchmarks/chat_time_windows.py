@@ -0,0 +1,88 @@
+"""
+Chat questions about a period on a long-history user
+Times the windowed handlers ("last week", "this month", "last 90 days", ...)
+with and without ix_transactions_user_type_date, next to a GROUP BY over the
+whole history, and prints the plan SQLite picks for each windowed query.
+Replies are built with _dispatch directly, so the reply cache isn't measured.
+Usage: python -m benchmarks.chat_time_windows [--transactions 500000] [--repeat 20]
+"""
+import argparse
+from benchmarks.common import configure, create_schema, create_user, seed_transactions, capture_queries, timed
+
+QUESTIONS = [
+    "how much did i spend yesterday?",
+    "how much did i spend last week?",
+    "what's my balance this month?",
+    "what was my biggest expense last month?",
+    "show my income in the last 90 days",
+    "give me savings tips for last year",
+]
+
+def run(db, user, repeat):
+    """(question, rows in window, ms per reply) for every question"""
+    from app.models.transaction import Transaction
+    from app.services.chatbot_service import ChatbotService
+    from app.services.intent_matcher import default_matcher
+    from app.services.time_window import parse_time_window
+
+    results = []
+    for question in QUESTIONS:
+        window, rest = parse_time_window(question)
+        match = default_matcher.match(rest)
+        rows = db.query(Transaction).filter(
+            Transaction.user_id == user.id, Transaction.date >= window.start, Transaction.date < window.end
+        ).count()
+        _, seconds = timed(lambda: ChatbotService._dispatch(db, user, match, window), repeat)
+        results.append((question, rows, seconds * 1000))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--transactions", type=int, default=500000, help="History of the user, spread over 5 years")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    configure()
+    engine = create_schema()
+
+    from sqlalchemy import func, text
+    from app.database import SessionLocal
+    from app.models.transaction import Transaction
+    from app.services.chatbot_service import ChatbotService
+    from app.services.intent_matcher import default_matcher
+    from app.services.time_window import parse_time_window
+
+    db = SessionLocal()
+    user = create_user(db)
+    seed_transactions(db, user.id, args.transactions)
+    db.execute(text("ANALYZE"))
+    db.refresh(user)
+    db.expunge(user)
+
+    _, full_scan = timed(lambda: db.query(
+        Transaction.type, Transaction.category, func.sum(Transaction.amount), func.count(Transaction.id)
+    ).filter(Transaction.user_id == user.id).group_by(Transaction.type, Transaction.category).all(), args.repeat)
+    print(f"whole-history GROUP BY over {args.transactions:,} rows: {full_scan * 1000:.1f} ms\n")
+
+    print("plans with ix_transactions_user_type_date:")
+    for question in QUESTIONS:
+        window, rest = parse_time_window(question)
+        with capture_queries(engine) as captured:
+            ChatbotService._dispatch(db, user, default_matcher.match(rest), window)
+        for statement, parameters in captured:
+            plan = db.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+            print(f"  {question:<42} {' / '.join(row[-1] for row in plan)}")
+    print()
+
+    indexed = run(db, user, args.repeat)
+    db.execute(text("DROP INDEX ix_transactions_user_type_date"))
+    db.commit()
+    unindexed = run(db, user, args.repeat)
+
+    print(f"{'question':<42}{'rows in window':>16}{'ms indexed':>12}{'ms without':>12}")
+    for (question, rows, ms), (_, _, ms_without) in zip(indexed, unindexed):
+        print(f"{question:<42}{rows:>16,}{ms:>12.2f}{ms_without:>12.2f}")
+    db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Messages per second on one connection: POST /chat/ vs the /chat/ws WebSocket
+Sends the same messages over HTTP (one request each), over the socket one
+at a time, and pipelined on the socket (all sent, then all read back).
+Also checks the per-user connection cap, invalid frames and the idle timeout.
+Usage: python -m benchmarks.chat_websocket [--messages 500] [--mode sync|async]
+"""
+import argparse
+import time
+from benchmarks.common import configure, create_schema, create_user, seed_transactions
+
+MESSAGES = ["what's my balance?", "how much did i spend on food?", "show my income",
+            "show my recent transactions", "give me savings tips", "how much did i spend last month?"]
+IDLE_TIMEOUT = 1.0
+
+def http(client, headers, count):
+    for i in range(count):
+        response = client.post("/chat/", headers=headers, json={"message": MESSAGES[i % len(MESSAGES)]})
+        assert response.status_code == 200, response.text
+
+def socket_sequential(client, token, count):
+    with client.websocket_connect(f"/chat/ws?token={token}") as ws:
+        for i in range(count):
+            ws.send_json({"message": MESSAGES[i % len(MESSAGES)]})
+            assert "bot_response" in ws.receive_json()
+
+def socket_pipelined(client, token, count):
+    with client.websocket_connect(f"/chat/ws?token={token}") as ws:
+        for i in range(count):
+            ws.send_json({"message": MESSAGES[i % len(MESSAGES)]})
+        replies = [ws.receive_json() for _ in range(count)]
+    assert [r["user_message"] for r in replies] == [MESSAGES[i % len(MESSAGES)] for i in range(count)]
+
+def check_limits(client, token, max_connections):
+    from starlette.websockets import WebSocketDisconnect
+
+    with client.websocket_connect("/chat/ws?token=not-a-token") as ws:
+        try:
+            ws.receive_json()
+            raise AssertionError("a bad token was accepted")
+        except WebSocketDisconnect as exc:
+            assert exc.code == 1008, exc.code
+
+    sockets = [client.websocket_connect(f"/chat/ws?token={token}") for _ in range(max_connections + 1)]
+    opened = [s.__enter__() for s in sockets]
+    try:
+        try:
+            opened[-1].receive_json()
+            raise AssertionError("connection over the cap was kept open")
+        except WebSocketDisconnect as exc:
+            assert exc.code == 1013, exc.code
+        opened[0].send_text("not json")
+        assert opened[0].receive_json()["error"] == "Invalid message"
+    finally:
+        for s in sockets[:-1]:
+            s.__exit__(None, None, None)
+
+    with client.websocket_connect(f"/chat/ws?token={token}") as ws:
+        start = time.perf_counter()
+        try:
+            ws.receive_json()
+        except WebSocketDisconnect as exc:
+            assert exc.code == 1000, exc.code
+        waited = time.perf_counter() - start
+        assert waited >= IDLE_TIMEOUT * 0.9, waited
+    print(f"checks: bad token -> 1008, connection #{max_connections + 1} -> 1013, "
+          f"invalid frame -> error reply, idle -> closed after {waited:.1f}s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=500, help="Messages per measurement")
+    parser.add_argument("--transactions", type=int, default=5000)
+    parser.add_argument("--mode", choices=["sync", "async"], default="sync")
+    args = parser.parse_args()
+
+    configure(DB_MODE=args.mode, CHAT_WS_IDLE_TIMEOUT_SECONDS=IDLE_TIMEOUT)
+    create_schema()
+
+    from fastapi.testclient import TestClient
+    from app.config import get_settings
+    from app.database import SessionLocal
+    from app.main import app
+    from app.utils.security import create_access_token
+
+    db = SessionLocal()
+    user = create_user(db)
+    seed_transactions(db, user.id, args.transactions)
+    user_id = user.id
+    db.close()
+
+    token = create_access_token({"sub": str(user_id)})
+    headers = {"Authorization": f"Bearer {token}"}
+    client = TestClient(app)
+    http(client, headers, len(MESSAGES))  # warms the auth and reply caches for every path
+
+    print(f"{'path':<26}{'msgs/s':>10}{'ms/msg':>10}")
+    for name, run in [
+        ("POST /chat/", lambda: http(client, headers, args.messages)),
+        ("/chat/ws one at a time", lambda: socket_sequential(client, token, args.messages)),
+        ("/chat/ws pipelined", lambda: socket_pipelined(client, token, args.messages)),
+    ]:
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        print(f"{name:<26}{args.messages / elapsed:>10,.0f}{elapsed / args.messages * 1000:>10.2f}")
+
+    check_limits(client, token, get_settings().CHAT_WS_MAX_CONNECTIONS_PER_USER)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Chat reply latency with inline commits vs the write-behind chat log
+Sends the same messages through ChatbotService.process_message with
+CHAT_WRITE_BEHIND off and on, then checks every message reached the table.
+Usage: python -m benchmarks.chat_write_behind [--messages 2000]
+"""
+import argparse
+import statistics
+import time
+from benchmarks.common import configure, create_schema, create_user, seed_transactions
+
+MESSAGES = ["what's my balance?", "how much did i spend on food?", "show my income", "give me savings tips"]
+
+def run(db, user, count):
+    from app.services.chatbot_service import ChatbotService
+
+    latencies = []
+    for i in range(count):
+        start = time.perf_counter()
+        ChatbotService.process_message(db, user, MESSAGES[i % len(MESSAGES)])
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return statistics.median(latencies) * 1000, latencies[int(len(latencies) * 0.99) - 1] * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=2000)
+    args = parser.parse_args()
+
+    configure()
+    create_schema()
+
+    from app.config import get_settings
+    from app.database import SessionLocal
+    from app.models.chat import ChatMessage
+    from app.services.chat_log_writer import chat_log_writer
+
+    settings = get_settings()
+    db = SessionLocal()
+    user = create_user(db)
+    seed_transactions(db, user.id, 1000)
+    db.refresh(user)
+
+    print(f"{'mode':<14}{'p50 ms':>10}{'p99 ms':>10}")
+    settings.CHAT_WRITE_BEHIND = False
+    p50, p99 = run(db, user, args.messages)
+    print(f"{'inline commit':<14}{p50:>10.3f}{p99:>10.3f}")
+
+    settings.CHAT_WRITE_BEHIND = True
+    chat_log_writer.start()
+    p50, p99 = run(db, user, args.messages)
+    chat_log_writer.stop()
+    print(f"{'write-behind':<14}{p50:>10.3f}{p99:>10.3f}")
+
+    stored = db.query(ChatMessage).filter(ChatMessage.user_id == user.id).count()
+    print(f"writer: {chat_log_writer.stats()}")
+    print(f"rows stored: {stored} of {2 * args.messages}")
+    db.close()
+
+if __name__ == "__main__":
+    main()
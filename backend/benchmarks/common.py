@@ -0,0 +1,152 @@
+"""
+Shared setup for the benchmark scripts
+Run them from the backend folder: python -m benchmarks.<name>
+
+configure() must be called before anything from app is imported,
+because app.config reads the settings once at import time.
+"""
+import os
+import random
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+def configure(db_path: str = None, database_url: str = None, **overrides) -> str:
+    """Point the app at a throwaway SQLite file (or database_url) and return its URL"""
+    if database_url:
+        url = database_url
+    else:
+        if db_path is None:
+            db_path = os.path.join(tempfile.mkdtemp(prefix="finbot-bench-"), "bench.db")
+        url = f"sqlite:///{db_path}"
+    os.environ["DATABASE_URL"] = url
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+    for key, value in overrides.items():
+        os.environ[key] = str(value)
+    return url
+
+def create_schema():
+    """Create all tables on the configured database"""
+    from app.database import engine, Base
+    from app.services.search_service import SearchService
+    import app.models  # noqa: F401 - registers every model on Base
+
+    Base.metadata.create_all(bind=engine)
+    SearchService.create_index(engine)
+    return engine
+
+def create_user(db, email: str = "bench@example.com"):
+    """Insert a user directly (skips bcrypt, which is not what we measure)"""
+    from app.models.user import User
+
+    user = User(email=email, hashed_password="not-a-real-hash", full_name="Bench User")
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+def seed_transactions(db, user_id: int, count: int, seed: int = 0, batch_size: int = 5000, describe=None):
+    """
+    Bulk insert random transactions for one user, then rebuild the aggregates and rollups
+    Uses executemany so seeding 100k+ rows takes seconds
+    describe(rng, category, i) -> description, instead of "bench row {i}"
+    """
+    from sqlalchemy import insert
+    from app.models.transaction import Transaction, TransactionType
+    from app.services.balance_service import BalanceService
+    from app.services.category_service import CategoryService
+    from app.services.rollup_service import RollupService
+
+    rng = random.Random(seed)
+    expense_categories = ["Food", "Rent", "Transport", "Entertainment", "Utilities", "Shopping", "Healthcare"]
+    income_categories = ["Salary", "Freelance", "Investment", "Bonus"]
+    category_ids = {name: CategoryService.get_or_create(db, name, user_id) for name in expense_categories + income_categories}
+    db.commit()
+    start = datetime.now() - timedelta(days=5 * 365)
+
+    batch = []
+    for i in range(count):
+        is_income = rng.random() < 0.15
+        category = rng.choice(income_categories if is_income else expense_categories)
+        batch.append({
+            "user_id": user_id,
+            "amount": round(rng.uniform(5, 3000 if is_income else 800), 2),
+            "type": TransactionType.INCOME if is_income else TransactionType.EXPENSE,
+            "category": category,
+            "category_id": category_ids[category],
+            "description": describe(rng, category, i) if describe else f"bench row {i}",
+            "date": start + timedelta(minutes=rng.randint(0, 5 * 365 * 24 * 60)),
+        })
+        if len(batch) >= batch_size:
+            db.execute(insert(Transaction), batch)
+            batch = []
+    if batch:
+        db.execute(insert(Transaction), batch)
+    db.commit()
+
+    BalanceService.rebuild(db, user_id=user_id)
+    RollupService.backfill(db, user_id=user_id)
+
+@contextmanager
+def count_queries(engine):
+    """Collect every SQL statement the engine executes inside the block"""
+    from sqlalchemy import event
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+@contextmanager
+def capture_queries(engine):
+    """Collect (statement, parameters) for every SQL statement executed inside the block"""
+    from sqlalchemy import event
+
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+def seed_chat_messages(db, user_id: int, count: int, batch_size: int = 5000, interval: timedelta = timedelta(minutes=1)):
+    """Bulk insert chat history for one user, one message per interval going back from now"""
+    from sqlalchemy import insert
+    from app.models.chat import ChatMessage
+
+    now = datetime.now()
+    batch = []
+    for i in range(count):
+        batch.append({
+            "user_id": user_id,
+            "user_message": "What's my balance?",
+            "bot_response": f"Financial Summary #{i}",
+            "intent": "balance_query",
+            "created_at": now - interval * i,
+        })
+        if len(batch) >= batch_size:
+            db.execute(insert(ChatMessage), batch)
+            batch = []
+    if batch:
+        db.execute(insert(ChatMessage), batch)
+    db.commit()
+
+def timed(fn, repeat: int = 1):
+    """Run fn repeat times and return (last result, seconds per call)"""
+    result = None
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat
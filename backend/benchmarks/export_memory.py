@@ -0,0 +1,56 @@
+"""
+Peak memory of the streaming export at growing history sizes
+Exits non-zero if the peak grows with the row count instead of staying flat
+Usage: python -m benchmarks.export_memory [--rows 1000 100000 1000000]
+"""
+import argparse
+import time
+import tracemalloc
+from benchmarks.common import configure, create_schema, create_user, seed_transactions
+
+# Allowed growth of the peak between the smallest and largest export
+MAX_GROWTH = 2.0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--format", choices=["csv", "ndjson"], default="csv")
+    args = parser.parse_args()
+
+    configure()
+    create_schema()
+
+    from app.database import SessionLocal
+    from app.services.transaction_service import TransactionService
+    from app.utils.exporters import csv_chunks, ndjson_chunks
+
+    encode = csv_chunks if args.format == "csv" else ndjson_chunks
+    peaks = []
+
+    print(f"{'rows':>10}{'peak KiB':>12}{'MiB out':>10}{'rows/s':>12}")
+    for i, rows in enumerate(args.rows):
+        db = SessionLocal()
+        user = create_user(db, email=f"export{i}@example.com")
+        seed_transactions(db, user.id, rows, seed=i)
+        db.refresh(user)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        written = 0
+        for chunk in encode(TransactionService.export_transactions(db, user)):
+            written += len(chunk)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        db.close()
+
+        peaks.append(peak)
+        print(f"{rows:>10}{peak / 1024:>12.0f}{written / 2**20:>10.1f}{rows / elapsed:>12,.0f}")
+
+    growth = peaks[-1] / peaks[0]
+    print(f"peak growth {args.rows[0]} -> {args.rows[-1]} rows: {growth:.2f}x (limit {MAX_GROWTH}x)")
+    if growth > MAX_GROWTH:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
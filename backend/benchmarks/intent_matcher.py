@@ -0,0 +1,69 @@
+"""
+Messages per second of the compiled intent matcher vs the old substring chain
+at 1x, 10x and 100x the current keyword count
+Usage: python -m benchmarks.intent_matcher [--messages 20000]
+"""
+import argparse
+import random
+import string
+import time
+from benchmarks.common import configure
+
+MESSAGES = [
+    "what's my balance?",
+    "how much did i spend on food last month?",
+    "show my income",
+    "give me some savings tips",
+    "what was my most expensive purchase",
+    "planning a trip to atlas mountains",
+    "i spent $1,250.00 on rent",
+    "hello there, how are you doing today?",
+]
+
+def grow_keywords(intents, categories, factor, rng):
+    """Pad every intent and the category list with synthetic words up to factor x their size"""
+    def fake_words(count):
+        return ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 10))) for _ in range(count)]
+
+    grown_intents = {name: words + fake_words(len(words) * (factor - 1)) for name, words in intents.items()}
+    grown_categories = {**categories, **{word: word.capitalize() for word in fake_words(len(categories) * (factor - 1))}}
+    return grown_intents, grown_categories
+
+def legacy_match(intents, categories, message):
+    """The old if-chain: first intent with any substring hit wins, then first category substring"""
+    for name, words in intents.items():
+        if any(word in message for word in words):
+            category = next((c for c in categories if c in message), None)
+            return name, category
+    return None, None
+
+def rate(fn, messages, total):
+    start = time.perf_counter()
+    for i in range(total):
+        fn(messages[i % len(messages)])
+    return total / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=20000)
+    args = parser.parse_args()
+
+    configure()
+    from app.services.intent_matcher import IntentMatcher, INTENT_KEYWORDS, CATEGORY_KEYWORDS
+
+    rng = random.Random(0)
+    print(f"{'keywords':>10}{'compile ms':>12}{'matcher msg/s':>16}{'legacy msg/s':>15}")
+    for factor in (1, 10, 100):
+        intents, categories = grow_keywords(INTENT_KEYWORDS, CATEGORY_KEYWORDS, factor, rng)
+        keyword_count = sum(len(words) for words in intents.values()) + len(categories)
+
+        start = time.perf_counter()
+        matcher = IntentMatcher(intents, categories)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        matcher_rate = rate(matcher.match, MESSAGES, args.messages)
+        legacy_rate = rate(lambda m: legacy_match(intents, categories, m), MESSAGES, args.messages)
+        print(f"{keyword_count:>10}{compile_ms:>12.1f}{matcher_rate:>16,.0f}{legacy_rate:>15,.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Rows per second of GET /transactions and GET /chat/history: the previous
+ORM + response_model path vs the column projection encoded with orjson,
+and vs the same projection as MessagePack (Accept: application/msgpack)
+The previous handlers are mounted under /legacy for the comparison, and
+every fast-path body is checked to decode to the same records.
+Usage: python -m benchmarks.list_serialization [--rows 20000] [--repeat 50] [--mode sync|async]
+"""
+import argparse
+import time
+from typing import List
+from benchmarks.common import configure, create_schema, create_user, seed_transactions, seed_chat_messages
+
+def legacy_router():
+    """The list handlers as they were before the fast path"""
+    from fastapi import APIRouter, Depends
+    from app.database import get_read_db, get_db
+    from app.schemas.chat import ChatHistoryResponse
+    from app.schemas.transaction import TransactionResponse
+    from app.services.chatbot_service import ChatbotService
+    from app.services.transaction_service import TransactionService
+    from app.utils.dependencies import get_current_user
+
+    router = APIRouter(prefix="/legacy")
+
+    @router.get("/transactions", response_model=List[TransactionResponse])
+    def transactions(limit: int = 100, current_user=Depends(get_current_user), db=Depends(get_read_db)):
+        return TransactionService.get_transactions_page(db, current_user, limit=limit)[0]
+
+    @router.get("/history", response_model=List[ChatHistoryResponse])
+    def history(limit: int = 100, current_user=Depends(get_current_user), db=Depends(get_db)):
+        return ChatbotService.get_chat_history(db, current_user, limit)
+
+    return router
+
+def rate(client, url, headers, rows, repeat):
+    """Rows per second over repeat calls, and the last response"""
+    response = client.get(url, headers=headers)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        response = client.get(url, headers=headers)
+    elapsed = time.perf_counter() - start
+    assert response.status_code == 200, response.text
+    return rows * repeat / elapsed, response
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20000, help="Seeded transactions and chat messages")
+    parser.add_argument("--repeat", type=int, default=50, help="Requests per measurement")
+    parser.add_argument("--mode", choices=["sync", "async"], default="sync")
+    args = parser.parse_args()
+
+    configure(DB_MODE=args.mode)
+    create_schema()
+
+    import msgpack
+    from fastapi.testclient import TestClient
+    from app.config import get_settings
+    from app.database import SessionLocal
+    from app.main import app
+    from app.utils.security import create_access_token
+
+    db = SessionLocal()
+    user = create_user(db)
+    seed_transactions(db, user.id, args.rows)
+    seed_chat_messages(db, user.id, args.rows)
+    user_id = user.id
+    db.close()
+
+    app.include_router(legacy_router())
+    client = TestClient(app)
+    auth = {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+    as_msgpack = {**auth, "Accept": "application/msgpack"}
+    history_limit = get_settings().CHAT_HISTORY_MAX_LIMIT
+
+    endpoints = [
+        ("GET /transactions", "/legacy/transactions?limit=100", "/transactions/?limit=100", 100),
+        ("GET /chat/history", f"/legacy/history?limit={history_limit}", f"/chat/history?limit={history_limit}",
+         history_limit),
+    ]
+    print(f"{'endpoint':<20}{'ORM rows/s':>12}{'orjson rows/s':>15}{'msgpack rows/s':>16}{'speedup':>9}")
+    for name, legacy_url, fast_url, rows in endpoints:
+        legacy, legacy_response = rate(client, legacy_url, auth, rows, args.repeat)
+        fast, fast_response = rate(client, fast_url, auth, rows, args.repeat)
+        packed, packed_response = rate(client, fast_url, as_msgpack, rows, args.repeat)
+
+        expected = legacy_response.json()
+        assert fast_response.json() == expected, f"{name}: JSON body differs from the ORM path"
+        assert msgpack.unpackb(packed_response.content) == expected, f"{name}: MessagePack body differs"
+        print(f"{name:<20}{legacy:>12,.0f}{fast:>15,.0f}{packed:>16,.0f}{fast / legacy:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+In-process load test of every main endpoint
+Seeds users and transactions into a throwaway SQLite database, then runs
+app.main:app through an ASGI client with N concurrent virtual users. Each
+one logs in and loops over list, summary, transaction CRUD and chat calls.
+Reports p50/p95/p99 latency, throughput and SQL queries per request for
+every endpoint, writes them as JSON and, given a baseline JSON, flags
+endpoints whose p95 or query count regressed (exit code 1).
+Usage: python -m benchmarks.load_test [--concurrency 50] [--iterations 20] [--users 10]
+           [--transactions 5000] [--mode sync|async] [--output load.json] [--baseline old.json]
+"""
+import argparse
+import asyncio
+import contextvars
+import json
+import random
+import time
+from collections import defaultdict
+from datetime import datetime
+from benchmarks.common import configure, create_schema, seed_transactions
+
+PASSWORD = "loadtest-pw1"
+CHAT_MESSAGES = [
+    "what's my balance?", "how much did i spend on food?", "how much have i spent?", "show my income",
+    "show my recent transactions", "give me savings tips", "what was my biggest expense?",
+]
+
+# Query counter of the request in flight - the ASGI transport runs the app in
+# the client's task and the threadpool copies the context, so each request
+# gets its own counter even under concurrency
+_request_queries = contextvars.ContextVar("request_queries", default=None)
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a sorted list"""
+    return values[max(0, int(round(len(values) * fraction)) - 1)]
+
+class Recorder:
+    """Latency, status and query count samples per endpoint"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    async def call(self, client, name, method, url, **kwargs):
+        counter = [0]
+        token = _request_queries.set(counter)
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            _request_queries.reset(token)
+        self.samples[name].append((elapsed, counter[0]))
+        if response.status_code >= 400:
+            self.errors[name] += 1
+        return response
+
+    def report(self, elapsed):
+        endpoints = {}
+        for name, samples in sorted(self.samples.items()):
+            latencies = sorted(s[0] for s in samples)
+            endpoints[name] = {
+                "requests": len(samples),
+                "errors": self.errors[name],
+                "p50_ms": percentile(latencies, 0.50) * 1000,
+                "p95_ms": percentile(latencies, 0.95) * 1000,
+                "p99_ms": percentile(latencies, 0.99) * 1000,
+                "throughput_rps": len(samples) / elapsed,
+                "queries_per_request": sum(s[1] for s in samples) / len(samples),
+            }
+        total = sum(len(s) for s in self.samples.values())
+        return {"elapsed_s": elapsed, "requests": total, "throughput_rps": total / elapsed, "endpoints": endpoints}
+
+async def virtual_user(client, recorder, email, iterations, rng):
+    response = await recorder.call(client, "POST /auth/login", "POST", "/auth/login",
+                                   json={"email": email, "password": PASSWORD})
+    if response.status_code != 200:
+        return
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    for _ in range(iterations):
+        await recorder.call(client, "GET /transactions", "GET", "/transactions/?limit=50", headers=headers)
+        await recorder.call(client, "GET /transactions/summary", "GET", "/transactions/summary", headers=headers)
+
+        created = await recorder.call(client, "POST /transactions", "POST", "/transactions/", headers=headers, json={
+            "amount": round(rng.uniform(5, 300), 2), "type": "expense", "category": rng.choice(["Food", "Transport"]),
+            "description": "load test", "date": datetime.now().isoformat()
+        })
+        if created.status_code == 201:
+            path = f"/transactions/{created.json()['id']}"
+            await recorder.call(client, "GET /transactions/{id}", "GET", path, headers=headers)
+            await recorder.call(client, "PUT /transactions/{id}", "PUT", path, headers=headers,
+                                json={"amount": round(rng.uniform(5, 300), 2)})
+            await recorder.call(client, "DELETE /transactions/{id}", "DELETE", path, headers=headers)
+
+        await recorder.call(client, "POST /chat", "POST", "/chat/", headers=headers,
+                            json={"message": rng.choice(CHAT_MESSAGES)})
+        await recorder.call(client, "GET /chat/history", "GET", "/chat/history?limit=20", headers=headers)
+
+async def run(app, emails, args):
+    import httpx
+
+    recorder = Recorder()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://load", timeout=None) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            virtual_user(client, recorder, emails[i % len(emails)], args.iterations, random.Random(i))
+            for i in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - start
+    return recorder.report(elapsed)
+
+def compare(result, baseline, threshold):
+    """Endpoints whose p95 grew by more than threshold or that now issue more queries"""
+    regressions = []
+    for name, now in result["endpoints"].items():
+        old = baseline.get("endpoints", {}).get(name)
+        if old is None:
+            continue
+        if now["p95_ms"] > old["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {old['p95_ms']:.1f} -> {now['p95_ms']:.1f} ms")
+        if now["queries_per_request"] > old["queries_per_request"] + 0.01:
+            regressions.append(f"{name}: queries/request {old['queries_per_request']:.2f} -> {now['queries_per_request']:.2f}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent virtual users")
+    parser.add_argument("--iterations", type=int, default=20, help="Request loops per virtual user")
+    parser.add_argument("--users", type=int, default=10, help="Seeded accounts the virtual users share")
+    parser.add_argument("--transactions", type=int, default=5000, help="Seeded transactions per account")
+    parser.add_argument("--mode", choices=["sync", "async"], default="sync", help="DB_MODE to run the app in")
+    parser.add_argument("--bcrypt-rounds", type=int, default=None, help="Override BCRYPT_ROUNDS (default: app setting)")
+    parser.add_argument("--output", default=None, help="Write the results to this JSON file")
+    parser.add_argument("--baseline", default=None, help="Compare against a previous --output file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative p95 growth before flagging")
+    args = parser.parse_args()
+
+    overrides = {"DB_MODE": args.mode}
+    if args.bcrypt_rounds:
+        overrides["BCRYPT_ROUNDS"] = args.bcrypt_rounds
+    configure(**overrides)
+    engine = create_schema()
+
+    from sqlalchemy import event
+    from app.database import SessionLocal
+    from app.main import app
+    from app.models.user import User
+    from app.utils.security import hash_password
+
+    db = SessionLocal()
+    hashed = hash_password(PASSWORD)
+    emails = []
+    for i in range(args.users):
+        user = User(email=f"load{i}@example.com", hashed_password=hashed, full_name=f"Load User {i}")
+        db.add(user)
+        db.commit()
+        seed_transactions(db, user.id, args.transactions, seed=i)
+        emails.append(user.email)
+    db.close()
+
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        counter = _request_queries.get()
+        if counter is not None:
+            counter[0] += 1
+
+    event.listen(engine, "before_cursor_execute", count_query)
+    if args.mode == "async":
+        from app.database import async_engine
+        event.listen(async_engine.sync_engine, "before_cursor_execute", count_query)
+
+    result = asyncio.run(run(app, emails, args))
+    result["config"] = {k: v for k, v in vars(args).items() if k not in ("output", "baseline")}
+
+    print(f"{'endpoint':<28}{'reqs':>7}{'errs':>6}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>9}{'queries':>9}")
+    for name, row in result["endpoints"].items():
+        print(f"{name:<28}{row['requests']:>7}{row['errors']:>6}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}"
+              f"{row['p99_ms']:>9.1f}{row['throughput_rps']:>9.0f}{row['queries_per_request']:>9.2f}")
+    print(f"total: {result['requests']} requests in {result['elapsed_s']:.1f}s ({result['throughput_rps']:.0f} req/s)")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(result, json.load(f), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Read latency during a login storm
+Measures GET /transactions/summary latency on its own, then again while many
+clients hammer POST /auth/login. With bcrypt on its own bounded pool the read
+p99 should stay flat and surplus logins get 503 + Retry-After.
+Usage: python -m benchmarks.login_storm [--logins 400] [--readers 20]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from benchmarks.common import configure, create_schema, seed_transactions
+
+PASSWORD = "storm-pass1"
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[max(0, int(len(values) * fraction) - 1)] * 1000
+
+async def run(app, token, email, args):
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        headers = {"Authorization": f"Bearer {token}"}
+
+        async def reader(latencies, stop):
+            while not stop.is_set():
+                start = time.perf_counter()
+                response = await client.get("/transactions/summary", headers=headers)
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+                await asyncio.sleep(0.005)
+
+        async def measure_reads(during=None):
+            latencies, stop = [], asyncio.Event()
+            readers = [asyncio.create_task(reader(latencies, stop)) for _ in range(args.readers)]
+            if during is None:
+                await asyncio.sleep(args.seconds)
+            else:
+                await during
+            stop.set()
+            await asyncio.gather(*readers)
+            return latencies
+
+        statuses = {}
+
+        async def login():
+            response = await client.post("/auth/login", json={"email": email, "password": PASSWORD})
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        async def storm():
+            await asyncio.gather(*(login() for _ in range(args.logins)))
+
+        quiet = await measure_reads()
+        stormy = await measure_reads(during=storm())
+
+    print(f"{'phase':<14}{'reads':>8}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, latencies in (("quiet", quiet), ("login storm", stormy)):
+        print(f"{name:<14}{len(latencies):>8}{statistics.median(latencies) * 1000:>10.1f}{percentile(latencies, 0.99):>10.1f}")
+    print(f"login responses by status: {dict(sorted(statuses.items()))}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=400, help="Concurrent login attempts in the storm")
+    parser.add_argument("--readers", type=int, default=20, help="Concurrent summary readers")
+    parser.add_argument("--seconds", type=float, default=3.0, help="Length of the quiet baseline")
+    args = parser.parse_args()
+
+    configure()
+    create_schema()
+
+    from app.database import SessionLocal
+    from app.main import app
+    from app.schemas.user import UserCreate
+    from app.services.auth_service import AuthService
+    from app.utils.security import create_access_token
+
+    db = SessionLocal()
+    user = asyncio.run(AuthService.register_user(
+        db, UserCreate(email="storm@example.com", password=PASSWORD, full_name="Storm")
+    ))
+    seed_transactions(db, user.id, 1000)
+    db.refresh(user)
+    token = create_access_token({"sub": str(user.id), "email": user.email})
+    email = user.email
+    db.close()
+
+    asyncio.run(run(app, token, email, args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Latency of listing page 1 vs a deep page, offset paging vs keyset cursors
+Usage: python -m benchmarks.pagination [--page 10000] [--limit 100]
+"""
+import argparse
+from benchmarks.common import configure, create_schema, create_user, seed_transactions, timed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page", type=int, default=10000, help="Deep page number to compare against page 1")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    configure()
+    create_schema()
+
+    from app.database import SessionLocal
+    from app.services.transaction_service import TransactionService
+
+    db = SessionLocal()
+    user = create_user(db)
+    rows = args.page * args.limit
+    print(f"seeding {rows:,} transactions...")
+    seed_transactions(db, user.id, rows)
+    db.refresh(user)
+    db.expunge(user)
+
+    deep_skip = (args.page - 1) * args.limit
+    # Position just before the deep page, as a client would hold it after paging there
+    boundary = TransactionService.get_user_transactions(db, user, skip=deep_skip - 1, limit=1)[0]
+    deep_after = (boundary.date, boundary.id)
+
+    cases = [
+        ("offset page 1", lambda: TransactionService.get_user_transactions(db, user, skip=0, limit=args.limit)),
+        (f"offset page {args.page}", lambda: TransactionService.get_user_transactions(db, user, skip=deep_skip, limit=args.limit)),
+        ("keyset page 1", lambda: TransactionService.get_transactions_page(db, user, limit=args.limit)),
+        (f"keyset page {args.page}", lambda: TransactionService.get_transactions_page(db, user, after=deep_after, limit=args.limit)),
+    ]
+
+    print(f"{'case':<22}{'ms/page':>10}")
+    for name, fn in cases:
+        _, seconds = timed(fn, args.repeat)
+        db.expunge_all()
+        print(f"{name:<22}{seconds * 1000:>10.2f}")
+
+    db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Query-plan regression check for every request-path service query
+Seeds a large dataset, runs each service call while capturing its SQL, EXPLAINs
+every captured statement and exits non-zero if any of them reads a table
+without going through an index. Runs on SQLite by default; pass --database-url
+to check an empty MySQL schema the same way.
+Usage: python -m benchmarks.query_plans [--transactions 50000] [--database-url mysql+pymysql://...]
+"""
+import argparse
+import asyncio
+from datetime import datetime
+from benchmarks.common import (
+    configure, create_schema, create_user, seed_transactions, seed_chat_messages, capture_queries
+)
+
+def service_calls(db, user, other_user):
+    """(name, callable) for every query the request path can issue"""
+    from fastapi import HTTPException
+    from app.models.transaction import TransactionType
+    from app.schemas.user import UserCreate
+    from app.schemas.transaction import TransactionCreate, TransactionUpdate
+    from app.services.auth_service import AuthService
+    from app.services.transaction_service import TransactionService
+    from app.services.chatbot_service import ChatbotService
+
+    def email_lookup():
+        # register_user and login_user share the same lookup by email
+        try:
+            asyncio.run(AuthService.register_user(
+                db, UserCreate(email=other_user.email, password="password1", full_name="Other")
+            ))
+        except HTTPException:
+            pass
+
+    def transaction_crud():
+        created = TransactionService.create_transaction(db, TransactionCreate(
+            amount=12.5, type=TransactionType.EXPENSE, category="Food", description="plan check", date=datetime.now()
+        ), user)
+        TransactionService.update_transaction(db, created.id, TransactionUpdate(amount=15.0, category="Transport"), user)
+        TransactionService.delete_transaction(db, created.id, user)
+
+    def deep_page():
+        _, next_key = TransactionService.get_transactions_page(db, user, limit=50)
+        TransactionService.get_transactions_page(db, user, after=next_key, limit=50)
+
+    def export_head():
+        rows = TransactionService.export_transactions(db, user, batch_size=100)
+        for _, _ in zip(range(100), rows):
+            pass
+
+    calls = [
+        ("auth: lookup by email", email_lookup),
+        ("auth: current user", lambda: AuthService.get_current_user(db, user.id)),
+        ("transactions: crud", transaction_crud),
+        ("transactions: summary", lambda: TransactionService.get_summary(db, user)),
+        ("transactions: list", lambda: TransactionService.get_user_transactions(db, user, limit=100)),
+        ("transactions: list by type", lambda: TransactionService.get_transactions_page(
+            db, user, transaction_type=TransactionType.INCOME, limit=100)),
+        ("transactions: list by category", lambda: TransactionService.get_transactions_page(
+            db, user, category="Food", limit=100)),
+        ("transactions: keyset page", deep_page),
+        ("transactions: export", export_head),
+        ("chat: history", lambda: ChatbotService.get_chat_history(db, user, 20)),
+    ]
+    for message in ["what's my balance?", "how much did i spend on food?", "how much have i spent?",
+                    "show my income", "show my recent transactions", "give me savings tips",
+                    "what was my biggest expense?", "how much did i spend on food last month?",
+                    "what's my balance this year?", "show my recent transactions in march",
+                    "what was my biggest expense in the last 90 days?"]:
+        calls.append((f"chat: {message}", lambda message=message: ChatbotService.process_message(db, user, message)))
+    return calls
+
+def sqlite_problems(conn, statement, parameters):
+    """
+    Table reads in a SQLite plan that use no index of ours: a SCAN of a table, or a
+    SEARCH through an AUTOMATIC index SQLite had to build for this one statement
+    SEARCH ... USING [COVERING] INDEX / PRIMARY KEY is what every read should be
+    """
+    rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+    details = [row[-1] for row in rows]
+    problems = [
+        d for d in details
+        if (d.startswith("SCAN ") and "CONSTANT ROW" not in d) or " AUTOMATIC " in d
+    ]
+    return details, problems
+
+def mysql_problems(conn, statement, parameters):
+    """Full scans in a MySQL plan: access type ALL"""
+    result = conn.exec_driver_sql("EXPLAIN " + statement, parameters)
+    columns = list(result.keys())
+    details, problems = [], []
+    for row in result.fetchall():
+        info = dict(zip(columns, row))
+        line = f"{info.get('table')}: type={info.get('type')} key={info.get('key')}"
+        details.append(line)
+        if info.get("type") == "ALL":
+            problems.append(line)
+    return details, problems
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--transactions", type=int, default=50000)
+    parser.add_argument("--chat-messages", type=int, default=20000)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--verbose", action="store_true", help="Print every plan, not just failures")
+    args = parser.parse_args()
+
+    configure(database_url=args.database_url)
+    engine = create_schema()
+
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    user = create_user(db, "plans@example.com")
+    other_user = create_user(db, "neighbour@example.com")
+    for u in (user, other_user):
+        seed_transactions(db, u.id, args.transactions, seed=u.id)
+        seed_chat_messages(db, u.id, args.chat_messages)
+    db.refresh(user)
+    db.refresh(other_user)
+    db.expunge(other_user)
+
+    explain = sqlite_problems if engine.dialect.name == "sqlite" else mysql_problems
+    with engine.connect() as conn:
+        conn.exec_driver_sql("ANALYZE" if engine.dialect.name == "sqlite" else "ANALYZE TABLE transactions, chat_messages, users")
+
+    failures = 0
+    for name, call in service_calls(db, user, other_user):
+        db.refresh(user)
+        with capture_queries(engine) as captured:
+            call()
+
+        with engine.connect() as conn:
+            for statement, parameters in captured:
+                if not statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+                    continue
+                details, problems = explain(conn, statement, parameters)
+                if problems:
+                    failures += 1
+                    print(f"FAIL {name}\n  {' '.join(statement.split())}")
+                    for line in details:
+                        print(f"    {line}")
+                elif args.verbose:
+                    print(f"ok   {name}: {' | '.join(details)}")
+
+    db.close()
+    print(f"----- {failures} statement(s) read a table without an index -----")
+    if failures:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Read-replica routing check with two SQLite files
+Seeds the primary, copies it to a "replica" file, then writes through the API.
+Read-only routes must answer from the replica (so they don't see the new write
+yet) and everything else from the primary. Exits non-zero on a misrouted route.
+Usage: python -m benchmarks.read_replica [--mode sync|async]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from benchmarks.common import configure, create_schema
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mode", choices=["sync", "async"], default="sync")
+    args = parser.parse_args()
+
+    folder = tempfile.mkdtemp(prefix="finbot-replica-")
+    primary, replica = os.path.join(folder, "primary.db"), os.path.join(folder, "replica.db")
+    configure(db_path=primary, READ_REPLICA_URL=f"sqlite:///{replica}", DB_MODE=args.mode, BCRYPT_ROUNDS=4)
+
+    engine = create_schema()
+
+    from fastapi.testclient import TestClient
+    from app.database import read_engine
+    from app.main import app
+    failures = []
+    with TestClient(app) as client:
+        client.post("/auth/register", json={"email": "replica@example.com", "password": "password1", "full_name": "Replica"})
+        token = client.post("/auth/login", json={"email": "replica@example.com", "password": "password1"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        # The replica is a snapshot of the primary taken before the write below
+        engine.dispose()
+        shutil.copyfile(primary, replica)
+        read_engine.dispose()
+
+        created = client.post("/transactions/", headers=headers, json={
+            "amount": 42.0, "type": "expense", "category": "Food", "description": "after snapshot",
+            "date": datetime.now().isoformat()
+        })
+        if created.status_code != 201:
+            raise SystemExit(f"create failed: {created.status_code} {created.text}")
+        transaction_id = created.json()["id"]
+
+        checks = [
+            ("GET /transactions/{id} (primary)", client.get(f"/transactions/{transaction_id}", headers=headers).status_code == 200),
+            ("GET /transactions (replica)", client.get("/transactions/", headers=headers).json() == []),
+            ("GET /transactions/summary (replica)", client.get("/transactions/summary", headers=headers).json()["transaction_count"] == 0),
+            ("GET /transactions/export (replica)", client.get("/transactions/export?format=ndjson", headers=headers).text.strip() == ""),
+            ("GET /analytics/month (replica)", client.get("/analytics/month", headers=headers).json() == []),
+        ]
+        for name, ok in checks:
+            print(f"{'ok  ' if ok else 'FAIL'} {name}")
+            if not ok:
+                failures.append(name)
+
+    if failures:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
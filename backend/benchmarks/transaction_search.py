@@ -0,0 +1,150 @@
+"""
+GET /transactions/search latency: the full-text index vs a LIKE '%q%' scan
+Fills the table to --transactions rows with merchant-style descriptions: one
+heavy user with --user-rows of them, the rest spread over --users others.
+Times rare, common, prefix, multi-word and filtered searches through
+SearchService on the database's index and on LikeSearchIndex, for the heavy
+user and a typical one. Also times a 10k-row executemany insert with and
+without the index's triggers (the write cost of the index).
+Usage: python -m benchmarks.transaction_search [--transactions 1000000] [--user-rows 100000]
+       python -m benchmarks.transaction_search --transactions 10000000 --repeat 3 --db /tmp/search10m.db
+--db keeps the database, and a later run with the same --db skips seeding
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from benchmarks.common import configure, create_schema, create_user, seed_transactions, timed
+
+MERCHANTS = {
+    "Food": ["Whole Foods", "Trader Joes", "Chipotle", "Starbucks", "Safeway", "Uber Eats", "Amazon Fresh"],
+    "Rent": ["Monthly rent", "Parking spot"],
+    "Transport": ["Uber trip", "Lyft ride", "Shell fuel", "Metro card", "Airport parking"],
+    "Entertainment": ["Netflix", "Spotify", "Cinema tickets", "Steam game", "Concert tickets"],
+    "Utilities": ["Electric bill", "Water bill", "Internet service", "Phone plan"],
+    "Shopping": ["Amazon order", "Target", "Ikea furniture", "Best Buy", "Zara clothes", "Etsy gift"],
+    "Healthcare": ["Pharmacy", "Dentist visit", "Gym membership", "Eye exam"],
+    "Salary": ["Payroll deposit"],
+    "Freelance": ["Client invoice", "Upwork payout"],
+    "Investment": ["Dividend payout", "Brokerage transfer"],
+    "Bonus": ["Annual bonus"],
+}
+INCOME_CATEGORIES = {"Salary", "Freelance", "Investment", "Bonus"}
+ITEMS = ["headphones", "groceries", "coffee", "books", "batteries", "charger", "shoes", "lamp", "desk", "snacks"]
+
+def describe(rng, category, i):
+    merchant = rng.choice(MERCHANTS[category])
+    # A rare word in about 1 row of 10,000
+    if rng.random() < 0.0001:
+        return f"{merchant} - refurbished turntable"
+    return f"{merchant} {rng.choice(ITEMS)} #{i}"
+
+def fill_other_users(db, count: int, users: int, batch_size: int = 10000):
+    """Bulk insert users and count transactions spread over them (no aggregates - search doesn't read them)"""
+    from sqlalchemy import insert, select
+    from app.models.transaction import Transaction, TransactionType
+    from app.models.user import User
+    from app.services.category_service import CategoryService
+
+    # Curated, so every other user shares them
+    category_ids = {name: CategoryService.get_or_create(db, name, None) for name in MERCHANTS}
+    db.execute(insert(User), [
+        {"email": f"other{i}@example.com", "hashed_password": "not-a-real-hash", "full_name": f"Other {i}"}
+        for i in range(users)
+    ])
+    user_ids = db.execute(select(User.id).where(User.email.like("other%"))).scalars().all()
+    rng = random.Random(1)
+    start = datetime.now() - timedelta(days=5 * 365)
+    categories = list(MERCHANTS)
+    for offset in range(0, count, batch_size):
+        batch = []
+        for i in range(offset, min(offset + batch_size, count)):
+            category = rng.choice(categories)
+            batch.append({
+                "user_id": rng.choice(user_ids), "amount": 10.0,
+                "type": TransactionType.INCOME if category in INCOME_CATEGORIES else TransactionType.EXPENSE,
+                "category": category, "category_id": category_ids[category], "description": describe(rng, category, i),
+                "date": start + timedelta(minutes=rng.randint(0, 5 * 365 * 24 * 60)),
+            })
+        db.execute(insert(Transaction), batch)
+        db.commit()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--transactions", type=int, default=1000000, help="Rows in the table")
+    parser.add_argument("--user-rows", type=int, default=100000, help="Rows of the heavy user")
+    parser.add_argument("--users", type=int, default=1000, help="Users sharing the other rows")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--db", help="SQLite file to seed, or reuse if it was seeded before")
+    args = parser.parse_args()
+
+    configure(db_path=args.db)
+    engine = create_schema()
+
+    from sqlalchemy import insert, select, text
+    from app.database import SessionLocal
+    from app.models.transaction import Transaction, TransactionType
+    from app.models.user import User
+    from app.services.search_service import SearchService, SqliteSearchIndex, LikeSearchIndex
+    from app.services.transaction_service import RESPONSE_COLUMNS
+
+    db = SessionLocal()
+    user = db.execute(select(User).where(User.email == "bench@example.com")).scalar_one_or_none()
+    if user is None:
+        user = create_user(db)
+        print(f"seeding {args.transactions:,} transactions ({args.user_rows:,} for the heavy user)...")
+        start = time.perf_counter()
+        seed_transactions(db, user.id, args.user_rows, describe=describe)
+        fill_other_users(db, args.transactions - args.user_rows, args.users)
+        print(f"seeded in {time.perf_counter() - start:.0f}s")
+        db.execute(text("ANALYZE"))
+        db.commit()
+    else:
+        print(f"reusing {args.db}: {db.query(Transaction).count():,} transactions")
+    typical = db.execute(select(User).where(User.id != user.id).limit(1)).scalar_one()
+    db.refresh(user)
+    db.expunge_all()
+
+    index = SearchService.index_for(engine)
+    cases = [
+        ("rare word", "turntable", {}),
+        ("common word", "amazon", {}),
+        ("prefix", "amaz", {}),
+        ("two words", "amazon headphones", {}),
+        ("word + prefix", "amazon head", {}),
+        ("common + category", "amazon", {"category": "Shopping"}),
+        ("common + type", "payout", {"transaction_type": TransactionType.INCOME}),
+    ]
+    for who, searcher in (("heavy user", user), ("typical user", typical)):
+        print(f"\n{who:<20}{'q':<20}{index.__name__ + ' ms':>22}{'LIKE ms':>10}{'rows':>6}")
+        for name, q, filters in cases:
+            search = lambda backend: SearchService.search(
+                db, searcher, q, limit=50, columns=RESPONSE_COLUMNS, index=backend, **filters
+            )
+            rows, index_s = timed(lambda: search(index), args.repeat)
+            _, like_s = timed(lambda: search(LikeSearchIndex), args.repeat)
+            print(f"{name:<20}{q:<20}{index_s * 1000:>22.1f}{like_s * 1000:>10.1f}{len(rows):>6}")
+
+    if index is SqliteSearchIndex:
+        batch = [{
+            "user_id": user.id, "amount": 1.0, "type": TransactionType.EXPENSE, "category": "Shopping",
+            "description": f"Amazon order batteries #{i}", "date": user.created_at,
+        } for i in range(10000)]
+
+        def insert_batch():
+            db.execute(insert(Transaction), batch)
+            db.rollback()
+
+        _, with_triggers = timed(insert_batch, args.repeat)
+        for suffix in ("insert", "update", "delete"):
+            db.execute(text(f"DROP TRIGGER {SqliteSearchIndex.TABLE}_{suffix}"))
+        db.commit()
+        _, without_triggers = timed(insert_batch, args.repeat)
+        SearchService.create_index(engine)
+        print(f"\n10k-row insert: {with_triggers * 1000:.0f} ms with the FTS triggers, "
+              f"{without_triggers * 1000:.0f} ms without")
+
+    db.close()
+
+if __name__ == "__main__":
+    main()
@@ -90,23 +90,26 @@ def login_user(email, password):
         print(f"Error logging in {email}: {e}")
         return None
 
-def create_transaction(token, transaction):
-    """Create a transaction for user"""
+def create_transactions(token, transactions):
+    """Create all transactions for a user with one bulk request"""
     try:
         headers = {"Authorization": f"Bearer {token}"}
         response = requests.post(
-            f"{BASE_URL}/transactions/",
-            json=transaction,
+            f"{BASE_URL}/transactions/bulk",
+            json=transactions,
             headers=headers
         )
-        if response.status_code == 201:
-            return True
+        if response.status_code == 200:
+            result = response.json()
+            for error in result["errors"]:
+                print(f"Failed to create transaction {error['index']}: {error['error']}")
+            return result["inserted"]
         else:
-            print(f"Failed to create transaction: {response.text}")
-            return False
+            print(f"Failed to create transactions: {response.text}")
+            return 0
     except Exception as e:
-        print(f"Error creating transaction: {e}")
-        return False
+        print(f"Error creating transactions: {e}")
+        return 0
 
 def generate_transactions(num_transactions=10):
     """Generate random transactions for the last 30 days"""
@@ -177,11 +180,7 @@ def seed_database():
         
         # Generate and create transactions
         transactions = generate_transactions()
-        success_count = 0
-        
-        for transaction in transactions:
-            if create_transaction(token, transaction):
-                success_count += 1
+        success_count = create_transactions(token, transactions)
         
         print(f"Created {success_count}/{len(transactions)} transactions")
     